@@ -1,21 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import logging
 import platform
+import time
 from pathlib import Path
 from typing import Optional
 
+from agent.decision.decision_cache import DecisionCache, intent_to_payload
 from agent.decision.decision_engine import DecisionEngine
+from agent.decision.llm_client import PooledLLMClient
 from agent.decision.llm_interface import LLMInterface
+from agent.decision.micropolicy import MicropolicyTable
+from agent.decision.speculation import SpeculativeProposer
+from agent.executor.accelerators import AcceleratorStrategy
+from agent.executor.container_search import ContainerSearch
+from agent.executor.handle_resolver import UIAHandleResolver
 from agent.executor.mouse_keyboard import MouseKeyboardExecutor
+from agent.executor.plan import PlanStep, coalesce
+from agent.executor.retry import RetryPolicy
+from agent.executor.text_entry import TextEntry
 from agent.executor.uia_executor import UIAExecutor
+from agent.grounding.anchors import AnchorStore
 from agent.grounding.grounder import Grounder
 from agent.logging.json_logger import JsonLogger
+from agent.logging.recording import CONFIG_EVENT, DECISION_EVENT, OBSERVATION_EVENT, observation_to_dict
 from agent.observer.observer import Observer
 from agent.perception.compression import UICompressor
 from agent.skills.skill_library import SkillLibrary
-from agent.state.models import EpisodicStep, ExecutionResult, ExecutionStatus, IntentAction, SafetyLevel, VerificationStatus, WorkingMemory
+from agent.state.models import ActionVerb, EpisodicStep, ExecutionMethod, ExecutionResult, ExecutionStatus, GroundedTarget, IntentAction, IntentTarget, SafetyLevel, UIElement, UIState, VerificationStatus, WorkingMemory
+from agent.verifier.expectations import Expectation, UIAProbe, expectations_for, with_baseline
 from agent.verifier.verifier import VerificationContext, Verifier
 
 
@@ -31,6 +45,24 @@ class AgentConfig:
     ocr_binary: Optional[str] = None
     llm_endpoint: Optional[str] = None
     llm_api_key: Optional[str] = None
+    llm_timeout: float = 10.0
+    llm_hedge: bool = False
+    llm_step_deadline: Optional[float] = 20.0
+    enable_decision_cache: bool = True
+    decision_cache_ttl: float = 24 * 3600.0
+    speculative_llm: bool = False
+    micropolicy_path: Optional[Path] = None
+    max_alternative_attempts: int = 2
+    enable_anchors: bool = True
+    plan_focus_checks: bool = False
+    execution_budget_seconds: float = 2.0
+    keyboard_accelerators: bool = True
+    probe_verification: bool = True
+    max_cycle_length: int = 4
+    log_fsync: str = "close"
+    log_segment_mb: int = 64
+    log_compress: bool = False
+    record: bool = False
 
 
 class AutomationAgent:
@@ -55,15 +87,44 @@ class AutomationAgent:
             ocr_reader=self._default_ocr_reader(),
         )
         self.compressor = compressor or UICompressor()
-        self.grounder = grounder or Grounder()
-        self.verifier = verifier or Verifier()
-        self.uia_executor = uia_executor or UIAExecutor()
-        self.mouse_executor = mouse_executor or MouseKeyboardExecutor()
+        self.anchors = AnchorStore(path=config.log_dir / "anchors.json") if config.enable_anchors else None
+        self.grounder = grounder or Grounder(anchors=self.anchors, expander=self._expand_group)
+        self.verifier = verifier or Verifier(max_cycle=config.max_cycle_length)
+        # One policy for both executors so a UIA dead end and the mouse fallback share the step's budget.
+        self.retry_policy = RetryPolicy(budget_seconds=config.execution_budget_seconds)
+        self.text_entry = TextEntry()
+        self.uia_executor = uia_executor or UIAExecutor(
+            resolver=UIAHandleResolver(anchors=self.anchors), retry_policy=self.retry_policy, text_entry=self.text_entry
+        )
+        self.mouse_executor = mouse_executor or MouseKeyboardExecutor(retry_policy=self.retry_policy, text_entry=self.text_entry)
+        self.accelerators = AcceleratorStrategy() if config.keyboard_accelerators else None
+        resolver = getattr(self.uia_executor, "resolver", None)
+        self.probe = UIAProbe(resolver) if config.probe_verification and isinstance(resolver, UIAHandleResolver) else None
         self.skills = SkillLibrary(state_path=config.log_dir / "skills_state.json")
-        selector_logger = logger or JsonLogger(config.log_dir, host_platform=platform.system().lower())
+        selector_logger = logger or JsonLogger(
+            config.log_dir,
+            host_platform=platform.system().lower(),
+            fsync=config.log_fsync,
+            max_segment_bytes=config.log_segment_mb * 1024 * 1024,
+            compress=config.log_compress,
+        )
         self.logger = selector_logger
-        llm = LLMInterface(client=self._default_llm_client)
-        self.decision_engine = decision_engine or DecisionEngine(skills=self.skills, selector=self._selector_proxy, llm=llm)
+        self._owns_logger = logger is None
+        self.llm_client = self._default_llm_client
+        llm = LLMInterface(client=self.llm_client, step_deadline_seconds=config.llm_step_deadline)
+        cache = DecisionCache(path=config.log_dir / "decision_cache.json", ttl_seconds=config.decision_cache_ttl) if config.enable_decision_cache else None
+        self.speculative_llm_client = None
+        speculator = SpeculativeProposer(self._speculative_llm(llm)) if config.speculative_llm else None
+        micropolicy = MicropolicyTable.from_file(config.micropolicy_path) if config.micropolicy_path else None
+        self.decision_engine = decision_engine or DecisionEngine(
+            skills=self.skills,
+            selector=self._selector_proxy,
+            llm=llm,
+            cache=cache,
+            speculator=speculator,
+            micropolicy=micropolicy,
+            grounder=self.grounder,
+        )
         self.memory = WorkingMemory(step_budget=config.step_budget, risk_mode=config.safety_level.value)
         self.trace: list[EpisodicStep] = []
         self._step_index = 0
@@ -77,42 +138,213 @@ class AutomationAgent:
         return Selector(safety_level=self.config.safety_level)
 
     def run(self):
+        probed_step: Optional[tuple] = None
+        if self.config.record:
+            self.logger.log(self._step_index, CONFIG_EVENT, self._recorded_inputs())
         for _ in range(self.config.step_budget):
             observation = self.observer.observe()
             self.logger.log(self._step_index, "observe", {"window": observation.window.fingerprint, "warnings": observation.warnings})
+            if self.config.record:
+                self.logger.log(self._step_index, OBSERVATION_EVENT, {"phase": "before", "observation": observation_to_dict(observation)})
             ui_state = self.compressor.compress(observation)
             self.logger.log(self._step_index, "state", {"elements": len(ui_state.elements)})
+            if probed_step is not None:
+                # A probe-verified step was not re-observed; this observation is its outcome.
+                previous_state, previous_intent = probed_step
+                probed_step = None
+                if self.decision_engine.speculator:
+                    self.decision_engine.speculator.record_transition(previous_state, previous_intent, ui_state)
+                stuck = self.verifier.track(ui_state, previous_intent)
+                if stuck is not None:
+                    self.logger.log(
+                        self._step_index, "verify", {"status": stuck.status.value, "mode": "deferred", "reason": stuck.failure_reason, "guidance": stuck.guidance_delta}
+                    )
+                    self._update_memory(stuck)
+                    break
             decision = self.decision_engine.decide(ui_state, self.memory)
-            self.logger.log(self._step_index, "decide", {"rationale": decision.rationale, "used_llm": decision.used_llm})
-            grounded = self.grounder.ground(decision.intent, ui_state)
-            self.logger.log(self._step_index, "ground", {"confidence": grounded.confidence})
-            execution = self._execute(decision.intent, grounded)
-            self.logger.log(self._step_index, "execute", {"status": execution.status.value, "method": execution.method.value})
-            new_observation = self.observer.observe()
-            new_state = self.compressor.compress(new_observation)
-            verification = self.verifier.verify(
-                VerificationContext(previous_state=ui_state, current_state=new_state, observation=new_observation)
+            speculator = self.decision_engine.speculator
+            decide_payload = {"rationale": decision.rationale, "used_llm": decision.used_llm}
+            if speculator:
+                decide_payload["speculation"] = speculator.last_outcome
+            if decision.used_llm:
+                decide_payload["llm_breaker"] = self.decision_engine.llm.breaker.state
+            self.logger.log(self._step_index, "decide", decide_payload)
+            intent = decision.intent
+            grounded = decision.grounded or self.grounder.ground(intent, ui_state)
+            # Procedure, micropolicy and cached intents were gated before their target was known.
+            self.decision_engine.selector.gate_element(grounded.element)
+            recorded_decision = {
+                "goal": self.memory.goal,
+                "rationale": decision.rationale,
+                "intent": intent_to_payload(intent),
+                "element_id": grounded.element.element_id if grounded.element else None,
+            }
+            self.logger.log(
+                self._step_index,
+                "ground",
+                {"confidence": grounded.confidence, "alternatives": len(decision.alternatives), "cache": self.grounder.last_cache_outcome},
             )
-            self.logger.log(self._step_index, "verify", {"status": verification.status.value})
+            if speculator:
+                speculator.prefetch(ui_state, intent, self.memory.goal)
+            self.retry_policy.start_step()
+            self.text_entry.last = None
+            expected = self._expectations(intent, grounded, ui_state)
+            execution = self._execute(intent, grounded, ui_state)
+            execute_payload = {"status": execution.status.value, "method": execution.method.value}
+            if self.text_entry.last:
+                execute_payload["text_entry"] = self.text_entry.last.as_dict()
+            self.logger.log(self._step_index, "execute", execute_payload)
+            plan_ran = bool(decision.plan) and execution.status == ExecutionStatus.OK
+            if plan_ran:
+                # The plan belongs to the primary proposal, so a failed plan does not fall back to alternatives.
+                execution = self._run_plan(decision.plan, grounded, ui_state)
+            primary_ok = execution.status == ExecutionStatus.OK
+            alternatives = decision.alternatives
+            if not primary_ok and decision.late_alternatives is not None:
+                alternatives = decision.late_alternatives()
+            for alt_intent, alt_grounded in alternatives[: self.config.max_alternative_attempts]:
+                if execution.status == ExecutionStatus.OK or plan_ran:
+                    break
+                # Fall back to the next grounded proposal against the same state without re-observing.
+                intent, grounded = self.decision_engine.selector.gate(alt_intent, self.memory, alt_grounded.element), alt_grounded
+                expected = self._expectations(intent, grounded, ui_state)
+                execution = self._execute(intent, grounded, ui_state)
+                self.logger.log(
+                    self._step_index, "execute", {"status": execution.status.value, "method": execution.method.value, "alternative": True}
+                )
+            verification = None
+            if self.probe is not None and execution.status == ExecutionStatus.OK and not plan_ran:
+                verification = self.verifier.verify_expected(expected, self.probe, ui_state)
+            probed = verification is not None
+            if probed:
+                probed_step = (ui_state, intent)
+            new_signature = None
+            if verification is None:
+                new_observation = self.observer.observe()
+                new_state = self.compressor.compress(new_observation)
+                new_signature = new_state.screen_signature
+                if self.config.record:
+                    self.logger.log(self._step_index, OBSERVATION_EVENT, {"phase": "after", "observation": observation_to_dict(new_observation)})
+                if speculator:
+                    speculator.record_transition(ui_state, intent, new_state)
+                verification = self.verifier.verify(
+                    VerificationContext(previous_state=ui_state, current_state=new_state, observation=new_observation, intent=intent)
+                )
+            verify_payload = {"status": verification.status.value, "mode": "probe" if probed else "snapshot"}
+            if verification.status == VerificationStatus.STUCK:
+                verify_payload.update(reason=verification.failure_reason, guidance=verification.guidance_delta)
+            self.logger.log(self._step_index, "verify", verify_payload)
+            if self.config.record:
+                self.logger.log(self._step_index, DECISION_EVENT, {**recorded_decision, "verification": verification.status.value, "verify_mode": verify_payload["mode"]})
+            # The cached decision is the primary; an alternative succeeding does not vouch for it.
+            self.decision_engine.record_outcome(decision, primary_ok and verification.status == VerificationStatus.SUCCESS)
+            self.grounder.record_outcome(intent, ui_state, grounded, verification.status == VerificationStatus.SUCCESS)
             self._update_memory(verification)
             self.trace.append(
                 EpisodicStep(
-                    intent=decision.intent,
+                    intent=intent,
                     grounded=grounded,
                     execution=execution,
                     verification=verification,
-                    observation_signature=new_state.screen_signature,
+                    observation_signature=new_signature,
                 )
             )
             self._step_index += 1
             if verification.status in {VerificationStatus.STUCK, VerificationStatus.FAIL}:
                 break
+        if self.decision_engine.cache:
+            self.decision_engine.cache.flush()
+            self.logger.log(self._step_index, "decision_cache", self.decision_engine.cache.stats())
+        if self.decision_engine.speculator:
+            self.logger.log(self._step_index, "speculation", self.decision_engine.speculator.stats())
+        if self.grounder.temporal_cache is not None:
+            self.logger.log(self._step_index, "grounding_cache", self.grounder.temporal_cache.stats())
+        if self.anchors is not None:
+            self.anchors.flush()
+            self.logger.log(self._step_index, "anchors", self.anchors.stats())
+        self.logger.log(self._step_index, "retry", self.retry_policy.stats())
+        self.logger.log(self._step_index, "text_entry", self.text_entry.stats())
+        if self.accelerators is not None:
+            self.logger.log(self._step_index, "accelerators", self.accelerators.stats())
+        resolver = getattr(self.uia_executor, "resolver", None)
+        if isinstance(resolver, UIAHandleResolver):
+            self.logger.log(self._step_index, "uia_resolver", resolver.stats())
+        container_search = getattr(self.uia_executor, "container_search", None)
+        if isinstance(container_search, ContainerSearch):
+            self.logger.log(self._step_index, "container_search", container_search.stats())
+        if self.probe is not None:
+            self.logger.log(self._step_index, "probe_verification", self.verifier.stats()["probe"])
+        self.logger.log(self._step_index, "group_expansions", {"count": getattr(self.grounder, "expansions", 0)})
+        self.logger.log(self._step_index, "micropolicy", self.decision_engine.micropolicy.stats())
+        self.logger.log(self._step_index, "llm", self.decision_engine.llm.stats())
+        if isinstance(self.llm_client, PooledLLMClient):
+            self.logger.log(self._step_index, "llm_client", self.llm_client.stats())
+        flush = getattr(self.logger, "flush", None)
+        if callable(flush):
+            flush()
+
+    def close(self) -> None:
+        """Release background workers, LLM connections and exit hooks; ``run`` may be called any number of times before this."""
+        self.skills.close()
+        if self.decision_engine.cache:
+            self.decision_engine.cache.close()
+        if self.anchors is not None:
+            self.anchors.close()
+        if self.decision_engine.speculator:
+            self.decision_engine.speculator.shutdown()
+        if self.speculative_llm_client is not None:
+            self.speculative_llm_client.close()
+        if isinstance(self.llm_client, PooledLLMClient):
+            self.llm_client.close()
+        if self._owns_logger:
+            self.logger.close()
+
+    def _run_plan(self, plan: list[PlanStep], previous: GroundedTarget, ui_state: UIState) -> ExecutionResult:
+        """Run the rest of a multi-action plan back to back; the step is verified once afterwards."""
+        start = time.time()
+        steps = coalesce(plan)
+        result = ExecutionResult(status=ExecutionStatus.OK, method=ExecutionMethod.NOOP, duration=0.0)
+        sent = 0
+        has_focus = getattr(self.uia_executor, "has_focus", None)
+        for intent, grounded in steps:
+            if self.config.plan_focus_checks and not intent.target and intent.verb in {ActionVerb.TYPE, ActionVerb.KEYPRESS} and callable(has_focus):
+                if has_focus(previous) is False:
+                    # Untargeted input would land in the wrong control; stop and let verification catch up.
+                    result = ExecutionResult(status=ExecutionStatus.FAIL, method=ExecutionMethod.KEYBOARD, duration=0.0, error="plan-focus-lost")
+                    break
+            result = self._execute(self.decision_engine.selector.gate(intent, self.memory, grounded.element), grounded, ui_state)
+            sent += 1
+            if result.status != ExecutionStatus.OK:
+                break
+            if grounded.element:
+                previous = grounded
+        self.logger.log(
+            self._step_index,
+            "plan",
+            {"steps": len(plan), "sends": sent, "coalesced": len(plan) - len(steps), "status": result.status.value, "seconds": round(time.time() - start, 4)},
+        )
+        return result
 
-    def _execute(self, intent: IntentAction, grounded: any) -> ExecutionResult:
+    def _execute(self, intent: IntentAction, grounded: any, ui_state: UIState) -> ExecutionResult:
+        keypress = None
+        if self.accelerators:
+            parent_id = grounded.element.parent_element_ids[-1] if grounded.element and grounded.element.parent_element_ids else None
+            parent = next((element for element in ui_state.elements if element.element_id == parent_id), None) if parent_id else None
+            keypress = self.accelerators.keypress_for(intent, grounded, ui_state.window, parent)
+        if keypress:
+            # One keystroke to the focused window; no wrapper resolution or pointer movement.
+            result = self.mouse_executor.execute(keypress, GroundedTarget(element=None, confidence=grounded.confidence, alternatives=[]))
+            self.accelerators.record(result.status == ExecutionStatus.OK)
+            if result.status == ExecutionStatus.OK:
+                return replace(result, method=ExecutionMethod.KEYBOARD)
         if grounded.element:
+            self.uia_executor.window = ui_state.window
             result = self.uia_executor.execute(intent, grounded)
             if result.status == ExecutionStatus.OK:
                 return result
+            if self.text_entry.last is not None and self.text_entry.last.verified is False:
+                # The text was written but did not read back; typing it again would duplicate it.
+                return result
         return self.mouse_executor.execute(intent, grounded)
 
     def _update_memory(self, verification):
@@ -141,22 +373,22 @@ class AutomationAgent:
         if self.config.llm_endpoint and not self.config.llm_api_key:
             logger.warning("LLM endpoint configured without API key; falling back to heuristic proposer.")
 
+    def _speculative_llm(self, llm: LLMInterface) -> LLMInterface:
+        """Prefetches get their own connection and delta session; a mispredicted one must not delay the real proposal."""
+        if not isinstance(self.llm_client, PooledLLMClient):
+            return llm
+        self.speculative_llm_client = self.llm_client.fork()
+        return LLMInterface(client=self.speculative_llm_client, step_deadline_seconds=llm.step_deadline_seconds, breaker=llm.breaker)
+
     @property
     def _default_llm_client(self):
         if self.config.llm_endpoint and self.config.llm_api_key:
-            def client(ui_state, goal, candidate_actions=None):
-                import requests
-                payload = {
-                    "goal": goal,
-                    "candidate_actions": [a.verb.value for a in candidate_actions] if candidate_actions else [],
-                    "salient": ui_state.salient_text,
-                }
-                headers = {"Authorization": f"Bearer {self.config.llm_api_key}"}
-                resp = requests.post(self.config.llm_endpoint, json=payload, timeout=10, headers=headers)
-                resp.raise_for_status()
-                data = resp.json()
-                return data.get("actions", [])
-            return client
+            return PooledLLMClient(
+                self.config.llm_endpoint,
+                api_key=self.config.llm_api_key,
+                timeout=self.config.llm_timeout,
+                hedge=self.config.llm_hedge,
+            )
         # Heuristic fallback
         def client(ui_state, goal, candidate_actions=None):
             _ = goal, candidate_actions
@@ -168,8 +400,32 @@ class AutomationAgent:
                     return [Intent(verb=ActionVerb.CLICK, target=IntentTarget(element_id=element.element_id))]
             return []
 
+        # Tells LLMInterface these proposals are not model output (never cached, logged used_llm=False).
+        client.heuristic = True
         return client
 
+    def _recorded_inputs(self) -> dict:
+        """Stateful decision and grounding inputs a replay needs to reproduce this run."""
+        anchors = getattr(self.grounder, "anchors", None)
+        return {
+            "micropolicy": self.decision_engine.micropolicy.to_dicts(),
+            "skills": self.decision_engine.skills.snapshot(),
+            "anchors": anchors.snapshot() if anchors is not None else None,
+        }
+
+    def _expectations(self, intent: IntentAction, grounded: GroundedTarget, ui_state: UIState) -> list[Expectation]:
+        """Expected effects of ``intent`` with their pre-action baselines; empty without a probe."""
+        if self.probe is None:
+            return []
+        return with_baseline(expectations_for(intent, grounded), self.probe, ui_state.window)
+
+    def _expand_group(self, group: UIElement, target: IntentTarget, ui_state: UIState) -> list[UIElement]:
+        expand = getattr(self.observer, "expand_group", None)
+        if not callable(expand) or not group.backend_ref:
+            return []
+        nodes = expand(group.backend_ref, automation_id=target.automation_id, name=target.name_equals or target.name_contains)
+        return self.compressor.elements_from_nodes(nodes, ui_state.window, group.parent_element_ids)
+
     def _default_ocr_reader(self):
         try:
             import pytesseract
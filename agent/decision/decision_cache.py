@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from agent.state.models import ActionVerb, IntentAction, IntentTarget, UIState
+
+
+@dataclass
+class CachedDecision:
+    intent: IntentAction
+    verified: Optional[bool]
+    stored_at: float
+    hits: int = 0
+
+
+class DecisionCache:
+    """
+    LRU/TTL cache of LLM decisions keyed by screen signature, goal and window.
+
+    Only decisions whose outcome was verified successful are served; a failed
+    outcome evicts the entry. The cache is merged into a JSON file on flush so
+    repeated batch runs can share it.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = 2048, ttl_seconds: float = 24 * 3600.0, clock: Optional[callable] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock or time.time
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CachedDecision]" = OrderedDict()
+        self._invalidated: Set[str] = set()
+        self._dirty = False
+        self._load()
+        if self.path:
+            atexit.register(self.flush)
+
+    def key_for(self, ui_state: UIState, goal: Optional[str]) -> Optional[str]:
+        if not ui_state.screen_signature:
+            return None
+        normalized_goal = " ".join((goal or "").lower().split())
+        raw = f"{ui_state.screen_signature.strip().lower()}|{normalized_goal}|{ui_state.window.fingerprint}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def get(self, key: Optional[str]) -> Optional[IntentAction]:
+        entry = self._entries.get(key) if key else None
+        if entry and self._expired(entry):
+            self._drop(key)
+            entry = None
+        if not entry or not entry.verified:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.hits += 1
+        return entry.intent
+
+    def put(self, key: Optional[str], intent: IntentAction) -> None:
+        if not key:
+            return
+        existing = self._entries.get(key)
+        if existing and existing.intent == intent and not self._expired(existing):
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = CachedDecision(intent=intent, verified=None, stored_at=self.clock())
+        self._entries.move_to_end(key)
+        self._invalidated.discard(key)
+        self._evict()
+
+    def record_outcome(self, key: Optional[str], success: bool) -> None:
+        entry = self._entries.get(key) if key else None
+        if not entry:
+            return
+        if not success:
+            self.logger.debug("Invalidating cached decision %s after failed outcome", key)
+            self._drop(key)
+            return
+        if not entry.verified:
+            entry.verified = True
+            entry.stored_at = self.clock()
+            self._dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0, "entries": len(self._entries)}
+
+    def close(self) -> None:
+        """Flush and drop the exit hook, which would otherwise keep this instance alive until exit."""
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def flush(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        merged = self._read_disk()
+        for key in self._invalidated:
+            merged.pop(key, None)
+        for key, entry in self._entries.items():
+            if not entry.verified:
+                continue
+            on_disk = merged.get(key)
+            if not on_disk or on_disk.get("stored_at", 0.0) <= entry.stored_at:
+                merged[key] = {"intent": intent_to_payload(entry.intent), "verified": True, "stored_at": entry.stored_at}
+        now = self.clock()
+        live = sorted(
+            ((k, v) for k, v in merged.items() if now - v.get("stored_at", 0.0) <= self.ttl_seconds),
+            key=lambda kv: kv[1].get("stored_at", 0.0),
+        )[-self.max_entries :]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(dict(live)), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._invalidated.clear()
+        self._dirty = False
+
+    def _expired(self, entry: CachedDecision) -> bool:
+        return self.clock() - entry.stored_at > self.ttl_seconds
+
+    def _drop(self, key: str) -> None:
+        self._entries.pop(key, None)
+        self._invalidated.add(key)
+        self._dirty = True
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self) -> None:
+        data = self._read_disk()
+        for key, meta in sorted(data.items(), key=lambda kv: kv[1].get("stored_at", 0.0)):
+            intent = intent_from_payload(meta.get("intent"))
+            if not intent:
+                continue
+            entry = CachedDecision(intent=intent, verified=meta.get("verified"), stored_at=meta.get("stored_at", 0.0))
+            if not self._expired(entry):
+                self._entries[key] = entry
+        self._evict()
+
+    def _read_disk(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            self.logger.warning("Decision cache unreadable, starting empty: %s", exc)
+            return {}
+
+
+def intent_to_payload(intent: IntentAction) -> Dict[str, Any]:
+    target = intent.target
+    return {
+        "verb": intent.verb.value,
+        "target": asdict(target) if target else None,
+        "text": intent.text,
+        "key": intent.key,
+        "amount": intent.amount,
+        "wait_seconds": intent.wait_seconds,
+        "then": [intent_to_payload(step) for step in intent.then],
+        "expect": intent.expect,
+    }
+
+
+def intent_from_payload(payload: Any) -> Optional[IntentAction]:
+    if not isinstance(payload, dict):
+        return None
+    try:
+        verb = ActionVerb(payload.get("verb"))
+    except Exception:
+        return None
+    target = payload.get("target")
+    try:
+        intent_target = IntentTarget(**target) if isinstance(target, dict) else None
+    except TypeError:
+        return None
+    then = [intent_from_payload(step) for step in payload.get("then") or []]
+    if any(step is None for step in then):
+        return None
+    return IntentAction(
+        verb=verb,
+        target=intent_target,
+        text=payload.get("text"),
+        key=payload.get("key"),
+        amount=payload.get("amount"),
+        wait_seconds=payload.get("wait_seconds"),
+        then=tuple(then),
+        expect=payload.get("expect"),
+    )
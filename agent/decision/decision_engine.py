@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, List, Optional, Tuple
 
+from agent.decision.decision_cache import DecisionCache
 from agent.decision.llm_interface import LLMInterface
+from agent.decision.micropolicy import MicropolicyTable
+from agent.decision.speculation import SpeculativeProposer
+from agent.grounding.grounder import Grounder
 from agent.selector.selector import Selector
 from agent.skills.skill_library import SkillLibrary
-from agent.state.models import ElementState, IntentAction, UIState, WorkingMemory
+from agent.state.models import GroundedTarget, IntentAction, UIState, WorkingMemory
 
 
 @dataclass
@@ -14,15 +19,43 @@ class DecisionOutcome:
     intent: IntentAction
     rationale: str
     used_llm: bool
+    cache_key: Optional[str] = None
+    grounded: Optional[GroundedTarget] = None
+    alternatives: List[Tuple[IntentAction, GroundedTarget]] = field(default_factory=list)
+    plan: List[Tuple[IntentAction, GroundedTarget]] = field(default_factory=list)
+    # Set instead of ``alternatives`` when a streamed action was accepted early; waits for the rest of the stream.
+    late_alternatives: Optional[Callable[[], List[Tuple[IntentAction, GroundedTarget]]]] = None
 
 
 class DecisionEngine:
-    def __init__(self, skills: SkillLibrary, selector: Selector, llm: Optional[LLMInterface] = None):
+    def __init__(
+        self,
+        skills: SkillLibrary,
+        selector: Selector,
+        llm: Optional[LLMInterface] = None,
+        cache: Optional[DecisionCache] = None,
+        speculator: Optional[SpeculativeProposer] = None,
+        micropolicy: Optional[MicropolicyTable] = None,
+        grounder: Optional[Grounder] = None,
+        stream_min_confidence: float = 3.0,
+        max_plan_steps: int = 8,
+        stream_rest_timeout: float = 1.0,
+    ):
         self.skills = skills
         self.selector = selector
         self.llm = llm or LLMInterface()
+        self.cache = cache
+        self.speculator = speculator
+        self.micropolicy = micropolicy or MicropolicyTable.default()
+        self.grounder = grounder
+        self.stream_min_confidence = stream_min_confidence
+        self.max_plan_steps = max_plan_steps
+        self.stream_rest_timeout = stream_rest_timeout
+        self._stream_grounding: Dict[IntentAction, GroundedTarget] = {}
 
     def decide(self, ui_state: UIState, memory: WorkingMemory) -> DecisionOutcome:
+        if self.speculator:
+            self.speculator.begin_step()
         procedure_intent = self._run_procedure(ui_state, memory)
         if procedure_intent:
             safe_intent = self.selector.gate(procedure_intent, memory)
@@ -33,32 +66,132 @@ class DecisionEngine:
             safe_intent = self.selector.gate(micropolicy_intent, memory)
             return DecisionOutcome(intent=safe_intent, rationale="micropolicy", used_llm=False)
 
-        proposed = self._llm_propose(ui_state, memory)
-        safe = self.selector.gate(proposed, memory)
-        return DecisionOutcome(intent=safe, rationale="llm", used_llm=True)
+        cache_key = self.cache.key_for(ui_state, memory.goal) if self.cache else None
+        cached = self.cache.get(cache_key) if self.cache else None
+        if cached:
+            safe = self.selector.gate(cached, memory)
+            return DecisionOutcome(intent=replace(safe, then=()), rationale="cache", used_llm=False, cache_key=cache_key, plan=self._plan(safe, ui_state, memory))
+
+        ranked, from_model, late_alternatives = self._llm_ranked(ui_state, memory)
+        proposed, grounded = ranked[0]
+        safe = self.selector.gate(proposed, memory, grounded.element if grounded else None)
+        # Fallback and placeholder answers are recomputed each time rather than replayed as model output.
+        if self.cache and from_model:
+            self.cache.put(cache_key, safe)
+        return DecisionOutcome(
+            intent=replace(safe, then=()),
+            rationale="llm",
+            used_llm=from_model,
+            cache_key=cache_key,
+            grounded=grounded,
+            alternatives=self._alternatives(ranked[1:], memory),
+            plan=self._plan(safe, ui_state, memory),
+            late_alternatives=late_alternatives,
+        )
+
+    def record_outcome(self, decision: DecisionOutcome, success: bool) -> None:
+        if self.cache and decision.cache_key:
+            self.cache.record_outcome(decision.cache_key, success)
 
     def _run_procedure(self, ui_state: UIState, memory: WorkingMemory) -> Optional[IntentAction]:
         return self.skills.match_procedure(ui_state, memory)
 
     def _micropolicy(self, ui_state: UIState) -> Optional[IntentAction]:
-        for element in ui_state.elements:
-            if element.name and element.name.lower() in {"ok", "next"} and ElementState.DISABLED not in element.states:
-                # role check optional; deterministic micro policy
-                from agent.state.models import ActionVerb, IntentTarget
-
-                return IntentAction(
-                    verb=ActionVerb.CLICK,
-                    target=IntentTarget(element_id=element.element_id, name_equals=element.name, role=element.role),
-                )
-        return None
-
-    def _llm_propose(self, ui_state: UIState, memory: WorkingMemory) -> IntentAction:
+        hit = self.micropolicy.match(ui_state)
+        return hit[1] if hit else None
+
+    def _llm_ranked(
+        self, ui_state: UIState, memory: WorkingMemory
+    ) -> Tuple[List[Tuple[IntentAction, Optional[GroundedTarget]]], bool, Optional[Callable[[], List[Tuple[IntentAction, GroundedTarget]]]]]:
+        """Ranked proposals, whether a model (not a fallback) produced them, and late alternatives for an early streamed accept."""
         candidates: List[IntentAction] = []
-        proposals = self.llm.propose(ui_state, memory.goal, candidate_actions=candidates)
+        self._stream_grounding.clear()
+        proposals = self.speculator.take(ui_state, memory.goal) if self.speculator else None
+        from_model = bool(self.speculator and self.speculator.last_from_model) if proposals is not None else False
+        if proposals is None and self.llm.supports_streaming:
+            accepted, proposals = self.llm.propose_first(
+                ui_state, memory.goal, accept=lambda intent: self._acceptable(intent, ui_state, memory), candidate_actions=candidates
+            )
+            from_model = self.llm.last_from_model
+            if accepted:
+                others = [intent for intent in proposals if intent != accepted]
+                late = self._late_alternatives(accepted, others, self.llm.last_rest, ui_state, memory)
+                return [(accepted, self._stream_grounding.get(accepted))], from_model, late
+        if proposals is None:
+            proposals = self.llm.propose(ui_state, memory.goal, candidate_actions=candidates)
+            from_model = self.llm.last_from_model
         ranked = self.llm.rank(ui_state, proposals)
         if ranked:
-            return ranked[0]
+            return self._joint_rank(ranked, ui_state, memory), from_model, None
         # Fallback no-op
         from agent.state.models import ActionVerb, IntentAction as Intent
 
-        return Intent(verb=ActionVerb.WAIT, wait_seconds=1.0)
+        return [(Intent(verb=ActionVerb.WAIT, wait_seconds=1.0), None)], False, None
+
+    def _late_alternatives(
+        self, accepted: IntentAction, others: List[IntentAction], rest: Optional[Future], ui_state: UIState, memory: WorkingMemory
+    ) -> Callable[[], List[Tuple[IntentAction, GroundedTarget]]]:
+        """Rank the other streamed proposals jointly with the accepted one, once the caller needs them."""
+
+        def alternatives() -> List[Tuple[IntentAction, GroundedTarget]]:
+            proposals = list(others)
+            if rest is not None:
+                try:
+                    proposals += rest.result(timeout=self.stream_rest_timeout)
+                except TimeoutError:
+                    pass
+            if not proposals:
+                return []
+            ranked = self._joint_rank(self.llm.rank(ui_state, [accepted] + proposals), ui_state, memory)
+            return self._alternatives([(intent, target) for intent, target in ranked if intent != accepted], memory)
+
+        return alternatives
+
+    def _alternatives(self, ranked: List[Tuple[IntentAction, Optional[GroundedTarget]]], memory: WorkingMemory) -> List[Tuple[IntentAction, GroundedTarget]]:
+        return [
+            (replace(intent, then=()), target)
+            for intent, target in ranked
+            if target and target.element and self.selector.admissible(intent, memory, target.element)
+        ]
+
+    def _plan(self, intent: IntentAction, ui_state: UIState, memory: WorkingMemory) -> List[Tuple[IntentAction, GroundedTarget]]:
+        """Ground ``intent.then`` against the same state; the plan stops at the first inadmissible or ungroundable step."""
+        steps = list(intent.then[: self.max_plan_steps])
+        if not steps:
+            return []
+        if self.grounder:
+            grounded = self.grounder.ground_batch(steps, ui_state)
+        else:
+            grounded = [GroundedTarget(element=None, confidence=0.0, alternatives=[]) for _ in steps]
+        plan: List[Tuple[IntentAction, GroundedTarget]] = []
+        for step, target in zip(steps, grounded):
+            if not self.selector.admissible(step, memory, target.element) or (step.target and not target.element):
+                break
+            plan.append((replace(step, then=()), target))
+        return plan
+
+    def _joint_rank(self, proposals: List[IntentAction], ui_state: UIState, memory: WorkingMemory) -> List[Tuple[IntentAction, Optional[GroundedTarget]]]:
+        """Order proposals by admissibility, then grounding confidence, then the LLM's own rank."""
+        if not self.grounder or len(proposals) < 2:
+            return [(intent, None) for intent in proposals]
+        grounded = self.grounder.ground_batch(proposals, ui_state)
+
+        def sort_key(slot: int) -> Tuple[int, float, int]:
+            intent, target = proposals[slot], grounded[slot]
+            if not intent.target:
+                score = self.stream_min_confidence
+            else:
+                score = target.confidence if target.element else float("-inf")
+            return (0 if self.selector.admissible(intent, memory, target.element) else 1, -score, slot)
+
+        order = sorted(range(len(proposals)), key=sort_key)
+        return [(proposals[slot], grounded[slot]) for slot in order]
+
+    def _acceptable(self, intent: IntentAction, ui_state: UIState, memory: WorkingMemory) -> bool:
+        if not self.selector.admissible(intent, memory):
+            return False
+        if not intent.target or not self.grounder:
+            return True
+        grounded = self.grounder.ground(intent, ui_state)
+        self._stream_grounding[intent] = grounded
+        return grounded.confidence >= self.stream_min_confidence and self.selector.admissible(intent, memory, grounded.element)
@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import http.client
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from agent.decision.state_encoder import StateEncoder
+from agent.state.models import IntentAction, UIState
+
+
+class LLMHTTPError(RuntimeError):
+    pass
+
+
+class PooledLLMClient:
+    """
+    Keep-alive HTTP client for the LLM proposer endpoint.
+
+    Connections are pooled and reused across proposals. Every request carries a
+    deadline; with ``hedge=True`` a duplicate request is sent on a second
+    connection once the primary has been outstanding longer than the observed
+    p95 latency, and whichever answers first wins. State is sent through a
+    ``StateEncoder`` (budgeted rows, deltas after the first call) and bodies
+    above ``gzip_min_bytes`` are gzip-encoded. Callable with the same signature
+    ``LLMInterface`` expects from a client.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: Optional[str] = None,
+        pool_size: int = 4,
+        timeout: float = 10.0,
+        hedge: bool = False,
+        hedge_min_samples: int = 8,
+        hedge_floor_seconds: float = 0.05,
+        encoder: Optional[StateEncoder] = None,
+        gzip_min_bytes: int = 1024,
+    ):
+        parts = urlsplit(endpoint)
+        if parts.scheme not in {"http", "https"} or not parts.hostname:
+            raise ValueError(f"Unsupported LLM endpoint: {endpoint}")
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_floor_seconds = hedge_floor_seconds
+        self.encoder = encoder or StateEncoder()
+        self.gzip_min_bytes = gzip_min_bytes
+        self.logger = logging.getLogger(__name__)
+        self.connections_opened = 0
+        self.requests_sent = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+        self._scheme = parts.scheme
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._latencies: deque = deque(maxlen=128)
+        self._lock = threading.Lock()
+        # Held from encoding a payload until it is sent, so deltas reach the server in ``seq`` order.
+        self._exchange_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=pool_size * 2, thread_name_prefix="llm-http")
+
+    def __call__(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]] = None, deadline: Optional[float] = None) -> List[Any]:
+        with self._exchange_lock:
+            payload = self.build_payload(ui_state, goal, candidate_actions)
+            try:
+                data = self.post_json(payload, deadline=deadline)
+            except Exception:
+                # The server may not have applied this delta; resynchronize with a full snapshot next time.
+                self.encoder.reset()
+                raise
+        return self.encoder.resolve_actions(data.get("actions", []))
+
+    async def acall(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]] = None, deadline: Optional[float] = None) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        # Not ``self._pool``: callers queued on the exchange lock must not starve the hedged sends it runs.
+        return await loop.run_in_executor(None, lambda: self(ui_state, goal, candidate_actions, deadline))
+
+    def stream(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]] = None, deadline: Optional[float] = None) -> Iterator[Any]:
+        """
+        Yield actions as the endpoint produces them.
+
+        NDJSON responses (one action, or an ``{"actions": [...]}`` batch, per
+        line) are parsed line by line; plain JSON responses are yielded once
+        complete. With ``hedge=True`` the request is hedged like ``post_json``
+        up to the response headers; the losing connection is closed. Closing
+        the generator early drains the rest of the response in the background
+        so the connection can return to the pool.
+        """
+        deadline = deadline if deadline is not None else time.monotonic() + self.timeout
+        with self._exchange_lock:
+            body, compressed = self._encode_body(self.build_payload(ui_state, goal, candidate_actions))
+            headers = self._headers(compressed)
+            headers["Accept"] = "application/x-ndjson, application/json"
+            del headers["Accept-Encoding"]
+            try:
+                conn, response = self._open_stream(body, headers, deadline)
+            except Exception:
+                self.encoder.reset()
+                raise
+        finished = False
+        try:
+            if response.status >= 400:
+                response.read()
+                self._release(conn, response)
+                finished = True
+                raise LLMHTTPError(f"LLM endpoint returned HTTP {response.status}")
+            content_type = (response.getheader("Content-Type") or "").lower()
+            if "ndjson" not in content_type and "jsonl" not in content_type:
+                raw = response.read()
+                self._release(conn, response)
+                finished = True
+                data = json.loads(raw.decode("utf-8")) if raw else {}
+                yield from self.encoder.resolve_actions(data.get("actions", []))
+                return
+            while True:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("LLM stream exceeded its deadline")
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line.decode("utf-8"))
+                batch = item.get("actions", []) if isinstance(item, dict) and "actions" in item else [item]
+                yield from self.encoder.resolve_actions(batch)
+            self._release(conn, response)
+            finished = True
+        except GeneratorExit:
+            if not finished:
+                self._pool.submit(self._drain, conn, response)
+                finished = True
+            raise
+        except Exception:
+            self.encoder.reset()
+            raise
+        finally:
+            if not finished:
+                conn.close()
+
+    def build_payload(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]] = None) -> Dict[str, Any]:
+        return self.encoder.encode(ui_state, goal, candidate_actions)
+
+    def post_json(self, payload: Dict[str, Any], deadline: Optional[float] = None) -> Dict[str, Any]:
+        """POST ``payload``; ``deadline`` is an absolute ``time.monotonic()`` value."""
+        deadline = deadline if deadline is not None else time.monotonic() + self.timeout
+        body, compressed = self._encode_body(payload)
+        hedge_after = self.hedge_delay()
+        if hedge_after is None:
+            return self._send(body, deadline, compressed)
+        primary = self._pool.submit(self._send, body, deadline, compressed)
+        done, _ = wait([primary], timeout=min(hedge_after, max(deadline - time.monotonic(), 0.0)))
+        if done:
+            return primary.result()
+        with self._lock:
+            self.hedges_sent += 1
+        secondary = self._pool.submit(self._send, body, deadline, compressed)
+        pending = {primary, secondary}
+        last_error: Optional[BaseException] = None
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is secondary:
+                        with self._lock:
+                            self.hedges_won += 1
+                    return future.result()
+                last_error = future.exception()
+        raise last_error or TimeoutError("LLM request exceeded its deadline")
+
+    def _open_stream(self, body: bytes, headers: Dict[str, str], deadline: float) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        hedge_after = self.hedge_delay()
+        if hedge_after is None:
+            return self._start_stream(body, headers, deadline)
+        primary = self._pool.submit(self._start_stream, body, headers, deadline)
+        done, _ = wait([primary], timeout=min(hedge_after, max(deadline - time.monotonic(), 0.0)))
+        if done:
+            return primary.result()
+        with self._lock:
+            self.hedges_sent += 1
+        secondary = self._pool.submit(self._start_stream, body, headers, deadline)
+        pending = {primary, secondary}
+        last_error: Optional[BaseException] = None
+        winner = None
+        while pending and winner is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    last_error = future.exception()
+                elif winner is None:
+                    winner = future
+                else:
+                    _close_stream(future)
+        for future in pending:
+            future.add_done_callback(_close_stream)
+        if winner is None:
+            raise last_error or TimeoutError("LLM stream exceeded its deadline")
+        if winner is secondary:
+            with self._lock:
+                self.hedges_won += 1
+        return winner.result()
+
+    def _start_stream(self, body: bytes, headers: Dict[str, str], deadline: float) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a streaming request and wait for the response headers; time to headers feeds the hedge delay."""
+        start = time.monotonic()
+        conn, _ = self._acquire(max(deadline - start, 0.001))
+        try:
+            response, _ = self._roundtrip(conn, body, headers, read=False)
+        except Exception:
+            conn.close()
+            raise
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        return conn, response
+
+    def hedge_delay(self) -> Optional[float]:
+        if not self.hedge:
+            return None
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.hedge_min_samples:
+            return None
+        p95 = samples[min(int(len(samples) * 0.95), len(samples) - 1)]
+        return max(p95, self.hedge_floor_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests_sent,
+            "connections_opened": self.connections_opened,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "p95_seconds": self.hedge_delay() if self.hedge else None,
+            "bytes_raw": self.bytes_raw,
+            "bytes_sent": self.bytes_sent,
+        }
+
+    def fork(self) -> "PooledLLMClient":
+        """
+        A client for the same endpoint with its own connections, exchange lock
+        and encoder session, so its requests never queue behind this one's.
+        """
+        encoder = StateEncoder(
+            max_bytes=self.encoder.max_bytes,
+            max_text_chars=self.encoder.max_text_chars,
+            resync_every=self.encoder.resync_every,
+            max_refs=self.encoder.max_refs,
+        )
+        return PooledLLMClient(
+            self.endpoint,
+            api_key=self.api_key,
+            pool_size=self.pool_size,
+            timeout=self.timeout,
+            hedge=self.hedge,
+            hedge_min_samples=self.hedge_min_samples,
+            hedge_floor_seconds=self.hedge_floor_seconds,
+            encoder=encoder,
+            gzip_min_bytes=self.gzip_min_bytes,
+        )
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _send(self, body: bytes, deadline: float, compressed: bool = False) -> Dict[str, Any]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("LLM request deadline already passed")
+        headers = self._headers(compressed)
+        start = time.monotonic()
+        conn, reused = self._acquire(remaining)
+        try:
+            response, raw = self._roundtrip(conn, body, headers)
+        except (http.client.RemoteDisconnected, ConnectionError) as exc:
+            conn.close()
+            if not reused:
+                raise
+            # The server dropped an idle keep-alive connection; retry once on a fresh one.
+            self.logger.debug("Pooled LLM connection went stale: %s", exc)
+            conn, _ = self._acquire(max(deadline - time.monotonic(), 0.001), fresh=True)
+            try:
+                response, raw = self._roundtrip(conn, body, headers)
+            except Exception:
+                conn.close()
+                raise
+        except Exception:
+            conn.close()
+            raise
+        self._release(conn, response)
+        if response.status >= 400:
+            raise LLMHTTPError(f"LLM endpoint returned HTTP {response.status}")
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+        if raw and (response.getheader("Content-Encoding") or "").lower() == "gzip":
+            raw = gzip.decompress(raw)
+        return json.loads(raw.decode("utf-8")) if raw else {}
+
+    def _encode_body(self, payload: Dict[str, Any]) -> Tuple[bytes, bool]:
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        compressed = len(raw) >= self.gzip_min_bytes
+        body = gzip.compress(raw, compresslevel=5) if compressed else raw
+        with self._lock:
+            self.bytes_raw += len(raw)
+            self.bytes_sent += len(body)
+        return body, compressed
+
+    def _headers(self, compressed: bool) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive", "Accept-Encoding": "gzip"}
+        if compressed:
+            headers["Content-Encoding"] = "gzip"
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _roundtrip(self, conn: http.client.HTTPConnection, body: bytes, headers: Dict[str, str], read: bool = True) -> Tuple[http.client.HTTPResponse, bytes]:
+        with self._lock:
+            self.requests_sent += 1
+        conn.request("POST", self._path, body=body, headers=headers)
+        response = conn.getresponse()
+        return response, response.read() if read else b""
+
+    def _drain(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        try:
+            response.read()
+        except Exception:
+            conn.close()
+            return
+        self._release(conn, response)
+
+    def _acquire(self, timeout: float, fresh: bool = False) -> Tuple[http.client.HTTPConnection, bool]:
+        if not fresh:
+            try:
+                conn = self._idle.get_nowait()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            except queue.Empty:
+                pass
+        with self._lock:
+            self.connections_opened += 1
+        factory = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+        return factory(self._host, self._port, timeout=timeout), False
+
+    def _release(self, conn: http.client.HTTPConnection, response: http.client.HTTPResponse) -> None:
+        if response.will_close or self._idle.qsize() >= self.pool_size:
+            conn.close()
+            return
+        self._idle.put(conn)
+
+
+def _close_stream(future: Future) -> None:
+    """Close the connection of a hedged stream that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result()[0].close()
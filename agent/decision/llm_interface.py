@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
+import threading
 import time
-from typing import List, Optional, Sequence
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
+from agent.decision.circuit_breaker import CircuitBreaker
 from agent.state.models import ActionVerb, IntentAction, IntentTarget, UIState
 
 
@@ -13,27 +18,177 @@ class LLMInterface:
     The controller remains deterministic; this module is a stochastic lens.
     """
 
-    def __init__(self, client: Optional[callable] = None, max_retries: int = 2, backoff_seconds: float = 0.5, validator: Optional[callable] = None):
+    def __init__(
+        self,
+        client: Optional[callable] = None,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.5,
+        validator: Optional[callable] = None,
+        step_deadline_seconds: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         self.client = client
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
         self.validator = validator
+        self.step_deadline_seconds = step_deadline_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self.short_circuits = 0
+        self.saved_seconds = 0.0
+        self.last_first_action_seconds: Optional[float] = None
+        self.last_from_model = False
+        self.last_rest: Optional[Future] = None
+        self._failed_call_seconds = 0.0
+        self._client_takes_deadline = _accepts_kwarg(client, "deadline")
         self.logger = logging.getLogger(__name__)
 
-    def propose(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]] = None) -> List[IntentAction]:
+    def propose(
+        self,
+        ui_state: UIState,
+        goal: Optional[str],
+        candidate_actions: Optional[Sequence[IntentAction]] = None,
+        deadline: Optional[float] = None,
+    ) -> List[IntentAction]:
+        """``deadline`` is an absolute ``time.monotonic()`` value bounding all attempts and backoff."""
+        proposals, self.last_from_model = self.propose_sourced(ui_state, goal, candidate_actions, deadline)
+        return proposals
+
+    def propose_sourced(
+        self,
+        ui_state: UIState,
+        goal: Optional[str],
+        candidate_actions: Optional[Sequence[IntentAction]] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[List[IntentAction], bool]:
+        """
+        ``propose`` plus whether a model produced the actions.
+
+        Deterministic fallbacks, heuristic clients and the WAIT placeholder for
+        an unparseable answer report False. Safe to call from other threads; it
+        does not touch ``last_from_model``.
+        """
         if not self.client:
-            return self._deterministic_fallback(ui_state)
+            return self._deterministic_fallback(ui_state), False
+        if not self.breaker.allow():
+            self.short_circuits += 1
+            self.saved_seconds += self._failed_call_seconds
+            self.logger.debug("LLM circuit open; using deterministic fallback")
+            return self._deterministic_fallback(ui_state), False
+        start = time.monotonic()
+        if deadline is None and self.step_deadline_seconds is not None:
+            deadline = start + self.step_deadline_seconds
         last_error: Optional[Exception] = None
         for attempt in range(self.max_retries + 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
             try:
-                response = self.client(ui_state=ui_state, goal=goal, candidate_actions=candidate_actions)
-                return self._validate_actions(response)
+                response = self._call_client(ui_state, goal, candidate_actions, deadline)
+                self.breaker.record_success()
+                parsed = [action for action in (self._coerce_action(raw) for raw in response or ()) if action]
+                return self._validate_actions(parsed or response), bool(parsed) and self._client_is_model
             except Exception as exc:
                 last_error = exc
                 self.logger.debug("LLM propose attempt %s failed: %s", attempt + 1, exc, exc_info=exc)
-                time.sleep(self.backoff_seconds * (2 ** attempt))
-        self.logger.warning("LLM propose failed after retries: %s", last_error)
-        return []
+            if not self._backoff(attempt, deadline):
+                break
+        self.breaker.record_failure()
+        self._failed_call_seconds = time.monotonic() - start
+        self.logger.warning("LLM propose failed after retries: %s", last_error or "step deadline exceeded")
+        return [], False
+
+    @property
+    def _client_is_model(self) -> bool:
+        return not getattr(self.client, "heuristic", False)
+
+    @property
+    def supports_streaming(self) -> bool:
+        return callable(getattr(self.client, "stream", None))
+
+    def propose_first(
+        self,
+        ui_state: UIState,
+        goal: Optional[str],
+        accept: Callable[[IntentAction], bool],
+        candidate_actions: Optional[Sequence[IntentAction]] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[Optional[IntentAction], List[IntentAction]]:
+        """
+        Return the first streamed action ``accept`` admits, plus every action seen.
+
+        The call returns as soon as an action is accepted; the rest of the
+        stream is read in the background into ``last_rest``, a future of the
+        remaining actions. A stream that fails before yielding any action is
+        retried like ``propose``; once actions have arrived a failure ends the
+        call with what was seen. Clients without a ``stream`` method go through
+        ``propose`` and are screened afterwards. ``last_from_model`` tells
+        whether a model produced the actions.
+        """
+        start = time.monotonic()
+        self.last_from_model = False
+        self.last_rest = None
+        if not self.supports_streaming:
+            seen = self.propose(ui_state, goal, candidate_actions=candidate_actions, deadline=deadline)
+            return next((a for a in seen if accept(a)), None), seen
+        if not self.breaker.allow():
+            self.short_circuits += 1
+            self.saved_seconds += self._failed_call_seconds
+            self.logger.debug("LLM circuit open; using deterministic fallback")
+            seen = self._deterministic_fallback(ui_state)
+            return next((a for a in seen if accept(a)), None), seen
+        if deadline is None and self.step_deadline_seconds is not None:
+            deadline = start + self.step_deadline_seconds
+        seen: List[IntentAction] = []
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            stream = self.client.stream(ui_state=ui_state, goal=goal, candidate_actions=candidate_actions, deadline=deadline)
+            handed_off = False
+            try:
+                for raw in stream:
+                    action = self._coerce_action(raw)
+                    if not action:
+                        continue
+                    seen.append(action)
+                    self.last_from_model = self._client_is_model
+                    if accept(action):
+                        self.last_first_action_seconds = time.monotonic() - start
+                        self.breaker.record_success()
+                        self.last_rest = self._read_rest(stream)
+                        handed_off = True
+                        return action, seen
+                self.breaker.record_success()
+                return None, seen
+            except Exception as exc:
+                last_error = exc
+                self.logger.debug("LLM stream attempt %s failed: %s", attempt + 1, exc, exc_info=exc)
+            finally:
+                if not handed_off:
+                    stream.close()
+            # Actions already seen would be proposed again by a retry.
+            if seen or not self._backoff(attempt, deadline):
+                break
+        self.breaker.record_failure()
+        self._failed_call_seconds = time.monotonic() - start
+        self.logger.warning("LLM stream failed after retries: %s", last_error or "step deadline exceeded")
+        return None, seen
+
+    async def apropose(
+        self,
+        ui_state: UIState,
+        goal: Optional[str],
+        candidate_actions: Optional[Sequence[IntentAction]] = None,
+        deadline: Optional[float] = None,
+    ) -> List[IntentAction]:
+        return await asyncio.to_thread(self.propose, ui_state, goal, candidate_actions, deadline)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.breaker.stats(),
+            "short_circuits": self.short_circuits,
+            "saved_seconds": round(self.saved_seconds, 4),
+            "first_action_seconds": self.last_first_action_seconds,
+        }
 
     def rank(self, ui_state: UIState, candidates: Sequence[IntentAction]) -> List[IntentAction]:
         validated = self._validate_actions(candidates)
@@ -43,6 +198,40 @@ class LLMInterface:
             validated = self.validator(validated, ui_state)
         return list(validated)
 
+    def _backoff(self, attempt: int, deadline: Optional[float]) -> bool:
+        """Sleep before retry ``attempt + 1``; False when no retry is left or it would start past ``deadline``."""
+        if attempt == self.max_retries:
+            return False
+        delay = self.backoff_seconds * (2 ** attempt)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return False
+        time.sleep(delay)
+        return True
+
+    def _read_rest(self, stream: Any) -> Future:
+        rest: Future = Future()
+
+        def read() -> None:
+            actions: List[IntentAction] = []
+            try:
+                for raw in stream:
+                    action = self._coerce_action(raw)
+                    if action:
+                        actions.append(action)
+            except Exception as exc:
+                self.logger.debug("Reading the rest of the LLM stream failed: %s", exc)
+            finally:
+                stream.close()
+                rest.set_result(actions)
+
+        threading.Thread(target=read, name="llm-stream-rest", daemon=True).start()
+        return rest
+
+    def _call_client(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]], deadline: Optional[float]) -> Any:
+        if self._client_takes_deadline:
+            return self.client(ui_state=ui_state, goal=goal, candidate_actions=candidate_actions, deadline=deadline)
+        return self.client(ui_state=ui_state, goal=goal, candidate_actions=candidate_actions)
+
     def _validate_actions(self, actions: Optional[Sequence[IntentAction]]) -> List[IntentAction]:
         valid: List[IntentAction] = []
         if not actions:
@@ -77,6 +266,8 @@ class LLMInterface:
                     name_equals=target.get("name_equals"),
                     role=target.get("role"),
                 )
+            follow_ups = action.get("then") if isinstance(action.get("then"), list) else []
+            then = tuple(step for step in (self._coerce_action(raw) for raw in follow_ups) if step)
             return IntentAction(
                 verb=verb,
                 target=intent_target,
@@ -84,6 +275,8 @@ class LLMInterface:
                 key=action.get("key"),
                 amount=action.get("amount"),
                 wait_seconds=action.get("wait_seconds"),
+                then=then,
+                expect=action.get("expect") if isinstance(action.get("expect"), str) else None,
             )
         return None
 
@@ -99,3 +292,13 @@ class LLMInterface:
                     )
                 ]
         return []
+
+
+def _accepts_kwarg(func: Optional[callable], name: str) -> bool:
+    if func is None:
+        return False
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == name or p.kind == inspect.Parameter.VAR_KEYWORD for p in parameters)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agent.state.models import ActionVerb, ElementState, IntentAction, IntentTarget, UIElement, UIState
+
+
+@dataclass(frozen=True)
+class MicropolicyRule:
+    name: str
+    verb: ActionVerb = ActionVerb.CLICK
+    priority: int = 0
+    element_name: Optional[str] = None
+    role: Optional[str] = None
+    automation_id: Optional[str] = None
+    app: Optional[str] = None
+    require_enabled: bool = True
+    key: Optional[str] = None
+    text: Optional[str] = None
+
+    def matches(self, element: UIElement) -> bool:
+        if self.element_name is not None and (element.name or "").strip().lower() != self.element_name:
+            return False
+        if self.role is not None and (element.role or "").lower() != self.role:
+            return False
+        if self.automation_id is not None and element.automation_id != self.automation_id:
+            return False
+        if self.require_enabled and ElementState.DISABLED in element.states:
+            return False
+        return True
+
+    def intent_for(self, element: UIElement) -> IntentAction:
+        return IntentAction(
+            verb=self.verb,
+            target=IntentTarget(element_id=element.element_id, name_equals=element.name, role=element.role),
+            key=self.key,
+            text=self.text,
+        )
+
+
+DEFAULT_RULES: Tuple[Dict[str, Any], ...] = (
+    {"name": "accept-ok", "element_name": "ok"},
+    {"name": "advance-next", "element_name": "next"},
+)
+
+
+class _RuleIndex:
+    def __init__(self) -> None:
+        self.by_automation_id: Dict[str, List[MicropolicyRule]] = {}
+        self.by_name: Dict[str, List[MicropolicyRule]] = {}
+        self.by_role: Dict[str, List[MicropolicyRule]] = {}
+
+    def add(self, rule: MicropolicyRule) -> None:
+        # Index on the most selective field; the remaining fields are checked on lookup.
+        if rule.automation_id is not None:
+            self.by_automation_id.setdefault(rule.automation_id, []).append(rule)
+        elif rule.element_name is not None:
+            self.by_name.setdefault(rule.element_name, []).append(rule)
+        elif rule.role is not None:
+            self.by_role.setdefault(rule.role, []).append(rule)
+
+    def candidates(self, element: UIElement) -> Iterable[MicropolicyRule]:
+        if element.automation_id:
+            yield from self.by_automation_id.get(element.automation_id, ())
+        if element.name:
+            yield from self.by_name.get(element.name.strip().lower(), ())
+        if element.role:
+            yield from self.by_role.get(element.role.lower(), ())
+
+
+class MicropolicyTable:
+    """
+    Deterministic rules compiled into hash lookups keyed by automation id,
+    name and role. ``match`` makes one pass over the state and returns the
+    highest-priority hit (earlier elements win ties).
+    """
+
+    def __init__(self, rules: Iterable[MicropolicyRule]):
+        self.rules = sorted(rules, key=lambda r: -r.priority)
+        self.hit_counts: Counter = Counter()
+        self._global = _RuleIndex()
+        self._per_app: Dict[str, _RuleIndex] = {}
+        for rule in self.rules:
+            index = self._per_app.setdefault(rule.app, _RuleIndex()) if rule.app else self._global
+            index.add(rule)
+        self._max_priority = self.rules[0].priority if self.rules else 0
+
+    @classmethod
+    def default(cls) -> "MicropolicyTable":
+        return cls.from_dicts(DEFAULT_RULES)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "MicropolicyTable":
+        """
+        File rules are layered over ``DEFAULT_RULES``: a row replaces the
+        default with the same name, and ``{"name": ..., "enabled": false}``
+        drops it.
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        rules = data.get("rules", []) if isinstance(data, dict) else data
+        return cls.from_dicts(_merge_rows(DEFAULT_RULES, rules))
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]]) -> "MicropolicyTable":
+        return cls(_parse_rule(row) for row in rows)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Rows that ``from_dicts`` turns back into an equivalent table."""
+        return [asdict(rule) for rule in self.rules]
+
+    def match(self, ui_state: UIState) -> Optional[Tuple[MicropolicyRule, IntentAction]]:
+        if not self.rules:
+            return None
+        indices = [self._global]
+        app_index = self._per_app.get((ui_state.window.exe_name or "").lower())
+        if app_index:
+            indices.append(app_index)
+        best: Optional[Tuple[MicropolicyRule, UIElement]] = None
+        for element in ui_state.elements:
+            for index in indices:
+                for rule in index.candidates(element):
+                    if best and rule.priority <= best[0].priority:
+                        continue
+                    if rule.matches(element):
+                        best = (rule, element)
+            if best and best[0].priority >= self._max_priority:
+                break
+        if not best:
+            return None
+        rule, element = best
+        self.hit_counts[rule.name] += 1
+        return rule, rule.intent_for(element)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": dict(self.hit_counts), "llm_calls_avoided": sum(self.hit_counts.values())}
+
+
+def _parse_rule(row: Dict[str, Any]) -> MicropolicyRule:
+    if not isinstance(row, dict) or not row.get("name"):
+        raise ValueError(f"Micropolicy rule requires a name: {row!r}")
+    if not any(row.get(field) for field in ("element_name", "role", "automation_id")):
+        raise ValueError(f"Micropolicy rule {row['name']} needs element_name, role or automation_id")
+    try:
+        verb = ActionVerb(row.get("verb", ActionVerb.CLICK.value))
+    except ValueError as exc:
+        raise ValueError(f"Micropolicy rule {row['name']} has unknown verb {row.get('verb')!r}") from exc
+    return MicropolicyRule(
+        name=row["name"],
+        verb=verb,
+        priority=int(row.get("priority", 0)),
+        element_name=_lower(row.get("element_name")),
+        role=_lower(row.get("role")),
+        automation_id=row.get("automation_id"),
+        app=_lower(row.get("app")),
+        require_enabled=bool(row.get("require_enabled", True)),
+        key=row.get("key"),
+        text=row.get("text"),
+    )
+
+
+def _merge_rows(base: Iterable[Dict[str, Any]], overrides: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    merged: Dict[Any, Dict[str, Any]] = {row["name"]: row for row in base}
+    unnamed: List[Dict[str, Any]] = []
+    for row in overrides:
+        name = row.get("name") if isinstance(row, dict) else None
+        if not name:
+            unnamed.append(row)  # rejected by _parse_rule
+        elif row.get("enabled", True) is False:
+            merged.pop(name, None)
+        else:
+            merged[name] = row
+    return list(merged.values()) + unnamed
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.strip().lower() if value else None
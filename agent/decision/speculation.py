@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from agent.decision.llm_interface import LLMInterface
+from agent.state.models import IntentAction, UIState
+
+
+@dataclass
+class _Prefetch:
+    predicted_signature: str
+    goal: Optional[str]
+    future: Future
+    submitted_at: float
+
+
+class SpeculativeProposer:
+    """
+    Prefetches LLM proposals for the state an action is expected to produce.
+
+    Predictions come from previously observed transitions
+    ``(screen_signature, intent) -> next UIState``. The prefetched proposals are
+    only used when the state handed to the decision stage carries the predicted
+    signature; otherwise they are discarded.
+    """
+
+    def __init__(self, llm: LLMInterface, max_transitions: int = 512):
+        self.llm = llm
+        self.max_transitions = max_transitions
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self.last_outcome: Optional[str] = None
+        self.last_from_model = False
+        self._transitions: "OrderedDict[Tuple[str, IntentAction], UIState]" = OrderedDict()
+        self._pending: Optional[_Prefetch] = None
+        self._closed = False
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-prefetch")
+
+    def record_transition(self, previous: Optional[UIState], intent: IntentAction, current: UIState) -> None:
+        if not previous or not previous.screen_signature or not current.screen_signature:
+            return
+        key = (previous.screen_signature, intent)
+        self._transitions[key] = current
+        self._transitions.move_to_end(key)
+        while len(self._transitions) > self.max_transitions:
+            self._transitions.popitem(last=False)
+
+    def prefetch(self, ui_state: UIState, intent: IntentAction, goal: Optional[str]) -> bool:
+        self._discard()
+        if self._closed:
+            return False
+        predicted = self._transitions.get((ui_state.screen_signature, intent)) if ui_state.screen_signature else None
+        if not predicted:
+            return False
+        future = self._pool.submit(self._timed_propose, predicted, goal)
+        self._pending = _Prefetch(predicted_signature=predicted.screen_signature, goal=goal, future=future, submitted_at=time.perf_counter())
+        return True
+
+    def begin_step(self) -> None:
+        """Clear the previous step's outcome; steps decided without the LLM never call ``take``."""
+        self.last_outcome = None
+
+    def take(self, ui_state: UIState, goal: Optional[str]) -> Optional[List[IntentAction]]:
+        pending, self._pending = self._pending, None
+        if not pending:
+            self.last_outcome = None
+            return None
+        if pending.predicted_signature != ui_state.screen_signature or pending.goal != goal:
+            pending.future.cancel()
+            self.misses += 1
+            self.last_outcome = "miss"
+            return None
+        wait_start = time.perf_counter()
+        try:
+            proposals, self.last_from_model, call_seconds = pending.future.result()
+        except Exception as exc:
+            self.logger.debug("Speculative proposal failed: %s", exc)
+            self.misses += 1
+            self.last_outcome = "error"
+            return None
+        waited = time.perf_counter() - wait_start
+        self.hits += 1
+        self.saved_seconds += max(call_seconds - waited, 0.0)
+        self.last_outcome = "hit"
+        return proposals
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "saved_seconds": round(self.saved_seconds, 4),
+        }
+
+    def shutdown(self) -> None:
+        self._closed = True
+        self._discard()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _discard(self) -> None:
+        if self._pending:
+            self._pending.future.cancel()
+            self._pending = None
+
+    def _timed_propose(self, ui_state: UIState, goal: Optional[str]) -> Tuple[List[IntentAction], bool, float]:
+        start = time.perf_counter()
+        proposals, from_model = self.llm.propose_sourced(ui_state, goal, candidate_actions=[])
+        return proposals, from_model, time.perf_counter() - start
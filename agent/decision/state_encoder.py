@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import json
+import threading
+import uuid
+from typing import Any, Dict, Optional, Sequence
+
+from agent.state.models import IntentAction, UIElement, UIState
+
+_STATE_CODES = {
+    "enabled": "en",
+    "disabled": "dis",
+    "focused": "foc",
+    "checked": "chk",
+    "selected": "sel",
+    "offscreen": "off",
+    "expanded": "exp",
+}
+
+
+class StateEncoder:
+    """
+    Compact, size-bounded encoding of ``UIState`` for the LLM endpoint.
+
+    Elements are sent as short rows keyed by session-scoped refs (``e0``,
+    ``e1``...) in salience order until ``max_bytes`` is reached. The first call
+    of a session (a window change starts a new one) and every ``resync_every``
+    calls send a full snapshot; other calls send only added, changed and
+    removed rows against the previous payload. Refs returned by the server
+    resolve back to element ids through ``resolve_ref``. A session that has
+    handed out more than ``max_refs`` refs starts over with a full snapshot.
+
+    Encoding is thread-safe, but deltas assume the server sees payloads in
+    ``seq`` order; callers sending from several threads must serialize
+    encoding and sending (``PooledLLMClient`` does).
+    """
+
+    def __init__(self, max_bytes: int = 8192, max_text_chars: int = 80, resync_every: int = 25, max_refs: int = 4096):
+        self.max_bytes = max_bytes
+        self.max_text_chars = max_text_chars
+        self.resync_every = resync_every
+        self.max_refs = max_refs
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.session_id = uuid.uuid4().hex[:12]
+            self._seq = 0
+            self._window: Optional[str] = None
+            self._previous: Dict[str, Dict[str, Any]] = {}
+            self._ref_by_element: Dict[str, str] = {}
+            self._element_by_ref: Dict[str, str] = {}
+
+    def encode(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]] = None) -> Dict[str, Any]:
+        with self._lock:
+            return self._encode(ui_state, goal, candidate_actions)
+
+    def _encode(self, ui_state: UIState, goal: Optional[str], candidate_actions: Optional[Sequence[IntentAction]]) -> Dict[str, Any]:
+        if (self._window and self._window != ui_state.window.fingerprint) or len(self._ref_by_element) > self.max_refs:
+            self.reset()
+        rows = self._budgeted_rows(ui_state)
+        full = not self._previous or self._seq % self.resync_every == 0
+        state: Dict[str, Any] = {
+            "session": self.session_id,
+            "seq": self._seq,
+            "window": {"exe": ui_state.window.exe_name, "title": ui_state.window.title},
+            "focused": self._ref_by_element.get(ui_state.focused_element_id or ""),
+        }
+        if full:
+            state["mode"] = "full"
+            state["elements"] = list(rows.values())
+        else:
+            state["mode"] = "delta"
+            state["base_seq"] = self._seq - 1
+            state["added"] = [row for ref, row in rows.items() if ref not in self._previous]
+            state["changed"] = [row for ref, row in rows.items() if ref in self._previous and self._previous[ref] != row]
+            state["removed"] = [ref for ref in self._previous if ref not in rows]
+        self._previous = rows
+        self._window = ui_state.window.fingerprint
+        self._seq += 1
+        return {
+            "goal": goal,
+            "candidate_actions": [a.verb.value for a in candidate_actions] if candidate_actions else [],
+            "salient": ui_state.salient_text,
+            "state": state,
+        }
+
+    def resolve_ref(self, ref: Optional[str]) -> Optional[str]:
+        with self._lock:
+            return self._element_by_ref.get(ref) if ref else None
+
+    def resolve_actions(self, actions: Any) -> Any:
+        """Rewrite ``target.ref`` in server actions to the matching ``element_id``."""
+        if not isinstance(actions, list):
+            return actions
+        for action in actions:
+            target = action.get("target") if isinstance(action, dict) else None
+            if isinstance(target, dict) and target.get("ref") and not target.get("element_id"):
+                target["element_id"] = self.resolve_ref(target.pop("ref"))
+        return actions
+
+    def _budgeted_rows(self, ui_state: UIState) -> Dict[str, Dict[str, Any]]:
+        rows: Dict[str, Dict[str, Any]] = {}
+        used = 0
+        for element in sorted(ui_state.elements, key=lambda e: (-(e.salience or 0.0), e.element_id)):
+            row = self._row(element)
+            size = len(json.dumps(row, separators=(",", ":"))) + 1
+            if used + size > self.max_bytes:
+                break
+            used += size
+            rows[row["ref"]] = row
+        return rows
+
+    def _row(self, element: UIElement) -> Dict[str, Any]:
+        ref = self._ref_by_element.get(element.element_id)
+        if not ref:
+            ref = f"e{len(self._ref_by_element)}"
+            self._ref_by_element[element.element_id] = ref
+            self._element_by_ref[ref] = element.element_id
+        row: Dict[str, Any] = {"ref": ref}
+        if element.role:
+            row["role"] = element.role
+        if element.name:
+            row["name"] = element.name[: self.max_text_chars]
+        if element.value:
+            row["value"] = element.value[: self.max_text_chars]
+        if element.automation_id:
+            row["aid"] = element.automation_id
+        states = [_STATE_CODES[s.value] for s in element.states if s.value in _STATE_CODES]
+        if states:
+            row["st"] = states
+        if element.group:
+            row["grp"] = [element.group.total, *element.group.visible]
+        if element.bbox:
+            row["box"] = [int(v) for v in element.bbox]
+        return row
+
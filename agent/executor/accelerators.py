@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import ctypes
+import sys
+from typing import Any, Dict, Optional
+
+from agent.state.models import ActionVerb, ElementState, GroundedTarget, IntentAction, UIElement, WindowInfo
+
+_MODIFIERS = {"ctrl", "control", "alt", "shift", "win"}
+_MENU_ROLES = {"menuitem", "menu item"}
+
+
+def normalize_key(raw: Optional[str]) -> Optional[str]:
+    """Turn UIA key strings such as ``"Ctrl+S"`` or ``"Alt, F"`` into a KEYPRESS chord."""
+    if not raw:
+        return None
+    parts = [part.strip().lower() for part in raw.replace(",", "+").split("+") if part.strip()]
+    if not parts or any(" " in part for part in parts):
+        return None
+    return "+".join(parts)
+
+
+def foreground_window_handle() -> Optional[int]:
+    if not sys.platform.startswith("win"):
+        return None
+    try:
+        return int(ctypes.windll.user32.GetForegroundWindow())
+    except Exception:
+        return None
+
+
+class AcceleratorStrategy:
+    """
+    Turns eligible clicks into a single KEYPRESS.
+
+    A click qualifies when its element is enabled and exposes an accelerator
+    key, or an access key that is a modifier chord or belongs to a menu item.
+    A menu item's bare access key is only sent while its parent menu is
+    expanded; otherwise, as for menu-bar items, it is sent as an ``alt+``
+    chord. The key is only sent while the state's window still has the
+    foreground, so it cannot land elsewhere.
+    """
+
+    def __init__(self, focus_probe: Optional[callable] = None):
+        self.focus_probe = focus_probe or foreground_window_handle
+        self.used = 0
+        self.fallbacks = 0
+        self.skipped_unfocused = 0
+
+    def keypress_for(
+        self, intent: IntentAction, grounded: GroundedTarget, window: WindowInfo, parent: Optional[UIElement] = None
+    ) -> Optional[IntentAction]:
+        element = grounded.element
+        if intent.verb != ActionVerb.CLICK or not element or ElementState.DISABLED in element.states:
+            return None
+        key = normalize_key(element.accelerator_key)
+        if not key:
+            access = normalize_key(element.access_key)
+            if access and set(access.split("+")[:-1]) & _MODIFIERS:
+                key = access
+            elif access and (element.role or "").lower() in _MENU_ROLES:
+                key = access if parent is not None and ElementState.EXPANDED in parent.states else f"alt+{access}"
+        if not key:
+            return None
+        if not window.hwnd or self.focus_probe() != window.hwnd:
+            self.skipped_unfocused += 1
+            return None
+        return IntentAction(verb=ActionVerb.KEYPRESS, key=key)
+
+    def record(self, success: bool) -> None:
+        if success:
+            self.used += 1
+        else:
+            self.fallbacks += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {"used": self.used, "fallbacks": self.fallbacks, "skipped_unfocused": self.skipped_unfocused}
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# UIA property ids used with ItemContainerPattern.FindItemByProperty.
+_UIA_NAME_PROPERTY_ID = 30005
+_UIA_AUTOMATION_ID_PROPERTY_ID = 30011
+
+
+@dataclass(frozen=True)
+class ContainerSearchResult:
+    item: Optional[Any]
+    method: str
+    pages: int
+    seconds: float
+
+
+class UIAContainer:
+    """
+    Adapts a pywinauto wrapper to the container interface used by ``ContainerSearch``.
+
+    Stand-in providers (tests, benchmarks) implement ``find_item``, ``items``,
+    ``scroll_page`` and ``scroll_into_view`` directly.
+    """
+
+    def __init__(self, wrapper: Any):
+        self.wrapper = wrapper
+
+    def find_item(self, query: str) -> Optional[Any]:
+        pattern = _pattern(self.wrapper, "iface_item_container")
+        if pattern is None:
+            raise NotImplementedError("container does not support ItemContainerPattern")
+        element = None
+        for property_id in (_UIA_NAME_PROPERTY_ID, _UIA_AUTOMATION_ID_PROPERTY_ID):
+            element = pattern.FindItemByProperty(None, property_id, query)
+            if element:
+                break
+        if not element:
+            return None
+        info_module = importlib.import_module("pywinauto.uia_element_info")
+        wrappers = importlib.import_module("pywinauto.controls.uiawrapper")
+        return wrappers.UIAWrapper(info_module.UIAElementInfo(element))
+
+    def items(self) -> List[Any]:
+        return list(self.wrapper.children())
+
+    def scroll_page(self) -> bool:
+        pattern = _pattern(self.wrapper, "iface_scroll")
+        if pattern is None or not pattern.CurrentVerticallyScrollable:
+            return False
+        before = pattern.CurrentVerticalScrollPercent
+        self.wrapper.scroll("down", "page", 1)
+        return pattern.CurrentVerticalScrollPercent != before
+
+    def scroll_into_view(self, item: Any) -> None:
+        """Realize and scroll virtualized items; a no-op for items without those patterns."""
+        virtualized = _pattern(item, "iface_virtualized_item")
+        if virtualized is not None:
+            virtualized.Realize()
+        scroll_item = _pattern(item, "iface_scroll_item")
+        if scroll_item is not None:
+            scroll_item.ScrollIntoView()
+
+
+def _pattern(wrapper: Any, name: str) -> Optional[Any]:
+    """pywinauto's ``iface_*`` properties raise ``NoPatternInterfaceError`` rather than returning None."""
+    try:
+        return getattr(wrapper, name, None)
+    except Exception:
+        return None
+
+
+class ContainerSearch:
+    """
+    Finds an item in a list/tree/grid container by name or automation id.
+
+    The container's own lookup (ItemContainerPattern style) is tried first and
+    the hit is scrolled into view. Containers without it fall back to a tight
+    loop that pages the container and probes only its visible children, up to
+    ``max_pages``; neither path re-observes the whole window.
+    """
+
+    def __init__(self, max_pages: int = 500, clock: Optional[callable] = None):
+        self.max_pages = max_pages
+        self.clock = clock or time.perf_counter
+        self.logger = logging.getLogger(__name__)
+        self.lookups = 0
+        self.probe_searches = 0
+        self.pages_scrolled = 0
+        self.last: Optional[ContainerSearchResult] = None
+
+    def find(self, container: Any, query: str) -> ContainerSearchResult:
+        container = container if hasattr(container, "find_item") else UIAContainer(container)
+        start = self.clock()
+        try:
+            item = container.find_item(query)
+            method = "item_container"
+            pages = 0
+            self.lookups += 1
+        except NotImplementedError:
+            item, pages = self._scroll_and_probe(container, query)
+            method = "scroll_probe"
+            self.probe_searches += 1
+            self.pages_scrolled += pages
+        if item is not None:
+            container.scroll_into_view(item)
+        self.last = ContainerSearchResult(item=item, method=method, pages=pages, seconds=self.clock() - start)
+        self.logger.debug("Container search for %r via %s: found=%s pages=%s", query, method, item is not None, pages)
+        return self.last
+
+    def stats(self) -> Dict[str, Any]:
+        return {"lookups": self.lookups, "probe_searches": self.probe_searches, "pages_scrolled": self.pages_scrolled}
+
+    def _scroll_and_probe(self, container: Any, query: str) -> tuple:
+        for page in range(self.max_pages + 1):
+            for item in container.items():
+                if _matches(item, query):
+                    return item, page
+            if page == self.max_pages or not container.scroll_page():
+                return None, page
+        return None, self.max_pages
+
+
+def _matches(item: Any, query: str) -> bool:
+    info = getattr(item, "element_info", item)
+    name = getattr(info, "name", None)
+    if getattr(info, "automation_id", None) == query:
+        return True
+    return isinstance(name, str) and name.strip().lower() == query.strip().lower()
@@ -1,18 +1,104 @@
 from __future__ import annotations
 
-from typing import Optional
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional
+
+from agent.grounding.anchors import AnchorStore, ref_path
+from agent.state.models import WindowInfo
 
 
 class UIAHandleResolver:
-    def __init__(self, backend: str = "uia"):
+    """
+    Turns a ``backend_ref`` into a live pywinauto wrapper.
+
+    Resolved wrappers are kept in an LRU keyed by ``backend_ref`` and reused
+    while a cheap liveness probe (window handle still valid, non-empty
+    rectangle) passes. The cache is cleared whenever the window fingerprint
+    changes. ``timeout`` caps how long a search waits for the element to
+    appear; ``None`` keeps pywinauto's find timeout.
+    """
+
+    def __init__(self, backend: str = "uia", anchors: Optional[AnchorStore] = None, max_cached: int = 256, desktop_factory: Optional[callable] = None):
         self.backend = backend
+        self.anchors = anchors
+        self.max_cached = max_cached
+        self.desktop_factory = desktop_factory
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._window_fingerprint: Optional[str] = None
+        self._latencies: deque = deque(maxlen=256)
+        self._not_found: Optional[str] = None
 
-    def resolve(self, backend_ref: Optional[str]):
+    def resolve(self, backend_ref: Optional[str], window: Optional[WindowInfo] = None, timeout: Optional[float] = None):
         if not backend_ref:
             return None
+        if window is not None and window.fingerprint != self._window_fingerprint:
+            self.clear()
+            self._window_fingerprint = window.fingerprint
+        start = time.perf_counter()
+        cached = self._cache.get(backend_ref)
+        if cached is not None:
+            if _alive(cached):
+                self._cache.move_to_end(backend_ref)
+                self.hits += 1
+                self._latencies.append(time.perf_counter() - start)
+                return cached
+            self.invalidate(backend_ref)
+        self.misses += 1
+        wrapper = self._resolve_uncached(backend_ref, window, timeout)
+        self._latencies.append(time.perf_counter() - start)
+        if wrapper is not None:
+            self._cache[backend_ref] = wrapper
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return wrapper
+
+    def gone(self, backend_ref: Optional[str], window: Optional[WindowInfo] = None) -> bool:
+        """
+        True only when ``backend_ref`` is positively gone: its own window handle
+        is dead, or the last lookup reported no such element while ``window``
+        is still alive. A lookup that failed for any other reason is not proof.
+        """
+        if not backend_ref:
+            return False
+        head = backend_ref.split("|", 1)[0]
+        if head.isdigit() and int(head):
+            return _is_window(int(head)) is False
+        return self._not_found == backend_ref and window is not None and bool(window.hwnd) and _is_window(window.hwnd) is True
+
+    def invalidate(self, backend_ref: Optional[str]) -> None:
+        if backend_ref and self._cache.pop(backend_ref, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.invalidations += len(self._cache)
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        samples = sorted(self._latencies)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidations": self.invalidations,
+            "mean_ms": 1000.0 * sum(samples) / len(samples) if samples else 0.0,
+            "p95_ms": 1000.0 * samples[min(int(len(samples) * 0.95), len(samples) - 1)] if samples else 0.0,
+        }
+
+    def _desktop(self):
+        if self.desktop_factory:
+            return self.desktop_factory()
+        module = __import__("pywinauto.desktop", fromlist=["Desktop"])
+        return module.Desktop(backend=self.backend)
+
+    def _resolve_uncached(self, backend_ref: str, window: Optional[WindowInfo], timeout: Optional[float]):
+        self._not_found = None
         try:
-            module = __import__("pywinauto.desktop", fromlist=["Desktop"])
-            desktop = module.Desktop(backend=self.backend)
+            desktop = self._desktop()
             parts = backend_ref.split("|")
             handle = int(parts[0]) if parts and parts[0] else None
             automation_id = parts[1] if len(parts) > 1 else None
@@ -20,10 +106,67 @@ class UIAHandleResolver:
             role = parts[3] if len(parts) > 3 else None
             if handle:
                 return desktop.window(handle=handle).wrapper_object()
+            anchored = self._resolve_anchored(desktop, window, automation_id, name, role)
+            if anchored is not None:
+                return anchored
+            wrapper = None
             if automation_id:
-                return desktop.window(best_match=name, control_type=role, automation_id=automation_id).wrapper_object()
-            if name:
-                return desktop.window(best_match=name).wrapper_object()
+                wrapper = _find(desktop.window(best_match=name, control_type=role, automation_id=automation_id), timeout)
+            elif name:
+                wrapper = _find(desktop.window(best_match=name), timeout)
+            if wrapper is not None and self.anchors is not None and window is not None:
+                self.anchors.record_path(window, automation_id, name, role, ref_path(backend_ref), success=True)
+            return wrapper
+        except Exception as exc:
+            # pywinauto.findwindows.ElementNotFoundError, or pywinauto.timings.TimeoutError from a capped
+            # wait; matched by name so pywinauto stays optional.
+            if type(exc).__name__ in ("ElementNotFoundError", "TimeoutError"):
+                self._not_found = backend_ref
+            return None
+
+    def _resolve_anchored(self, desktop: Any, window: Optional[WindowInfo], automation_id: Optional[str], name: Optional[str], role: Optional[str]) -> Optional[Any]:
+        """Walk a previously successful child-index path from the window instead of searching the desktop."""
+        if self.anchors is None or window is None or not window.hwnd:
+            return None
+        path = self.anchors.known_path(window, automation_id, name, role)
+        if not path:
+            return None
+        try:
+            wrapper = desktop.window(handle=window.hwnd).wrapper_object()
+            for step in path.split(".")[1:]:
+                wrapper = wrapper.children()[int(step)]
+            info = wrapper.element_info
+            if (automation_id and info.automation_id != automation_id) or (not automation_id and info.name != name):
+                raise LookupError("anchored path leads to a different element")
         except Exception:
+            self.anchors.record_path(window, automation_id, name, role, path, success=False)
             return None
+        self.anchors.record_path(window, automation_id, name, role, path, success=True)
+        return wrapper
+
+
+def _find(spec: Any, timeout: Optional[float]) -> Any:
+    if timeout is None:
+        return spec.wrapper_object()
+    return spec.wait("exists", timeout=timeout)
+
+
+def _alive(wrapper: Any) -> bool:
+    try:
+        info = wrapper.element_info
+        handle = getattr(info, "handle", None)
+        if handle and not _is_window(handle):
+            return False
+        rect = info.rectangle
+        return rect.right > rect.left and rect.bottom > rect.top
+    except Exception:
+        return False
+
+
+def _is_window(handle: int) -> Optional[bool]:
+    """Whether ``handle`` is a live window, or ``None`` when pywinauto cannot tell."""
+    try:
+        handleprops = __import__("pywinauto.handleprops", fromlist=["iswindow"])
+        return bool(handleprops.iswindow(handle))
+    except Exception:
         return None
@@ -5,42 +5,53 @@ import logging
 import time
 from typing import Optional, Tuple
 
+from agent.executor.plan import key_chords
+from agent.executor.retry import RetryPolicy
+from agent.executor.text_entry import TextEntry
 from agent.state.models import ActionVerb, ExecutionMethod, ExecutionResult, ExecutionStatus, GroundedTarget, IntentAction
 
 
 class MouseKeyboardExecutor:
-    def __init__(self, driver: Optional[callable] = None, max_retries: int = 1, backoff_seconds: float = 0.1):
+    def __init__(
+        self,
+        driver: Optional[callable] = None,
+        max_retries: int = 1,
+        backoff_seconds: float = 0.1,
+        retry_policy: Optional[RetryPolicy] = None,
+        text_entry: Optional[TextEntry] = None,
+    ):
         self.driver = driver
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.text_entry = text_entry or TextEntry()
         self.logger = logging.getLogger(__name__)
 
     def execute(self, intent: IntentAction, target: GroundedTarget) -> ExecutionResult:
         start = time.time()
-        error: Optional[str] = None
-        for attempt in range(self.max_retries + 1):
-            try:
-                self._perform(intent, target)
-                return ExecutionResult(status=ExecutionStatus.OK, method=ExecutionMethod.MOUSE, duration=time.time() - start)
-            except Exception as exc:
-                error = str(exc)
-                self.logger.debug("Mouse/keyboard attempt %s failed: %s", attempt + 1, error)
-                time.sleep(self.backoff_seconds * (2 ** attempt))
+        outcome = self.retry_policy.run(lambda: self._perform(intent, target), max_attempts=self.max_retries + 1, base_delay=self.backoff_seconds)
+        if outcome.ok:
+            return ExecutionResult(status=ExecutionStatus.OK, method=ExecutionMethod.MOUSE, duration=time.time() - start)
+        self.logger.debug("Mouse/keyboard action failed after %s attempt(s) (%s): %s", outcome.attempts, outcome.error_class.value, outcome.error)
         return ExecutionResult(
-            status=ExecutionStatus.FAIL, method=ExecutionMethod.MOUSE, duration=time.time() - start, error=error
+            status=ExecutionStatus.FAIL, method=ExecutionMethod.MOUSE, duration=time.time() - start, error=str(outcome.error)
         )
 
     def _perform(self, intent: IntentAction, target: GroundedTarget) -> None:
-        if not target.element:
+        # Typing and key presses go to whatever has focus; everything else needs a target.
+        if not target.element and intent.verb not in {ActionVerb.TYPE, ActionVerb.KEYPRESS, ActionVerb.WAIT}:
             raise ValueError("Cannot perform action without grounded element")
         driver = self._load_driver()
-        bbox_center = self._bbox_center(target.element.bbox)
+        bbox_center = self._bbox_center(target.element.bbox) if target.element else None
         if intent.verb in {ActionVerb.CLICK, ActionVerb.DOUBLE_CLICK, ActionVerb.RIGHT_CLICK}:
             if not bbox_center:
                 raise RuntimeError("No coordinates for mouse action")
             self._click(driver, bbox_center, intent.verb)
         elif intent.verb == ActionVerb.TYPE and intent.text is not None:
             self._type(driver, intent.text)
+        elif intent.verb == ActionVerb.KEYPRESS and intent.key:
+            for chord in key_chords(intent.key):
+                driver.hotkey(*chord)
         elif intent.verb == ActionVerb.SCROLL and intent.amount is not None:
             self._scroll(driver, intent.amount, bbox_center)
         elif intent.verb == ActionVerb.FOCUS_WINDOW and bbox_center:
@@ -74,7 +85,7 @@ class MouseKeyboardExecutor:
         driver.click(x=point[0], y=point[1], clicks=clicks, button=button)
 
     def _type(self, driver: any, text: str) -> None:
-        driver.typewrite(text, interval=0.01)
+        self.text_entry.enter_driver(driver, text)
 
     def _scroll(self, driver: any, amount: int, point: Optional[Tuple[int, int]]) -> None:
         if point:
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import List, Optional, Sequence, Tuple
+
+from agent.state.models import ActionVerb, GroundedTarget, IntentAction
+
+PlanStep = Tuple[IntentAction, GroundedTarget]
+
+_SEND_KEYS_MODIFIERS = {"ctrl": "^", "control": "^", "shift": "+", "alt": "%"}
+_SEND_KEYS_SPECIAL = set("+^%~(){}[]")
+
+
+def key_chords(key: Optional[str]) -> List[List[str]]:
+    """Split a KEYPRESS ``key`` such as ``"ctrl+a tab enter"`` into chords pressed in order."""
+    return [_chord(chord.lower()) for chord in (key or "").split()]
+
+
+def _chord(text: str) -> List[str]:
+    # A trailing "+" after a separator (or on its own) is the plus key itself.
+    if text.endswith("+") and (len(text) == 1 or text[-2] == "+"):
+        head = text[:-2]
+        return (head.split("+") if head else []) + ["+"]
+    return text.split("+")
+
+
+def to_send_keys(key: Optional[str]) -> str:
+    """Translate a KEYPRESS ``key`` into pywinauto ``type_keys`` notation."""
+    out: List[str] = []
+    for chord in key_chords(key):
+        *modifiers, last = chord
+        prefix = "".join(_SEND_KEYS_MODIFIERS.get(m, "") for m in modifiers)
+        if len(last) == 1:
+            out.append(prefix + escape_send_keys(last))
+        else:
+            out.append(prefix + "{" + last.upper() + "}")
+    return "".join(out)
+
+
+def escape_send_keys(text: str) -> str:
+    """Escape characters ``type_keys`` would treat as modifiers or key names."""
+    return "".join("{" + ch + "}" if ch in _SEND_KEYS_SPECIAL else ch for ch in text)
+
+
+def coalesce(steps: Sequence[PlanStep]) -> List[PlanStep]:
+    """
+    Merge adjacent TYPE steps into one TYPE and adjacent KEYPRESS steps into
+    one KEYPRESS. A step merges into the previous one only when it targets
+    the same element or has no target (input goes to the focused element).
+    """
+    merged: List[PlanStep] = []
+    for intent, grounded in steps:
+        if merged and _mergeable(merged[-1], (intent, grounded)):
+            prev_intent, prev_grounded = merged[-1]
+            if intent.verb == ActionVerb.TYPE:
+                prev_intent = replace(prev_intent, text=(prev_intent.text or "") + (intent.text or ""))
+            else:
+                prev_intent = replace(prev_intent, key=f"{prev_intent.key} {intent.key}")
+            merged[-1] = (prev_intent, prev_grounded)
+            continue
+        merged.append((intent, grounded))
+    return merged
+
+
+def _mergeable(previous: PlanStep, step: PlanStep) -> bool:
+    (prev_intent, prev_grounded), (intent, grounded) = previous, step
+    if intent.verb != prev_intent.verb or intent.verb not in {ActionVerb.TYPE, ActionVerb.KEYPRESS}:
+        return False
+    if intent.verb == ActionVerb.TYPE and (prev_intent.text is None or intent.text is None):
+        return False
+    if intent.verb == ActionVerb.KEYPRESS and (not prev_intent.key or not intent.key):
+        return False
+    if not intent.target:
+        return True
+    return bool(grounded.element and prev_grounded.element and grounded.element.element_id == prev_grounded.element.element_id)
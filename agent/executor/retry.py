@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+
+class ErrorClass(str, Enum):
+    TRANSIENT = "transient"
+    STALE = "stale"
+    PERMANENT = "permanent"
+
+
+# Messages raised by the executors themselves when a target can never support the action.
+_PERMANENT_MARKERS = ("cannot be clicked", "cannot accept", "cannot scroll", "cannot focus", "unsupported", "without grounded element", "not available")
+_STALE_MARKERS = ("wrapper unavailable", "stale", "no longer exists", "invalid window handle", "element not available")
+_PERMANENT_TYPES = {"ValueError", "TypeError", "NotImplementedError", "LookupError", "ElementNotEnabled"}
+_STALE_TYPES = {"ElementNotFoundError", "COMError", "InvalidWindowHandle"}
+
+
+def classify(exc: BaseException) -> ErrorClass:
+    name = type(exc).__name__
+    message = str(exc).lower()
+    if name in _STALE_TYPES or any(marker in message for marker in _STALE_MARKERS):
+        return ErrorClass.STALE
+    if name in _PERMANENT_TYPES or any(marker in message for marker in _PERMANENT_MARKERS):
+        return ErrorClass.PERMANENT
+    return ErrorClass.TRANSIENT
+
+
+@dataclass(frozen=True)
+class RetryOutcome:
+    ok: bool
+    attempts: int
+    error: Optional[BaseException] = None
+    error_class: Optional[ErrorClass] = None
+
+
+class RetryPolicy:
+    """
+    Error-class-aware retries shared by the executors.
+
+    Permanent errors fail on the first attempt, stale-handle errors call
+    ``on_stale`` (to drop a cached wrapper) and retry immediately, and
+    transient errors back off with jitter. No attempt starts and no sleep
+    runs past the step deadline set by ``start_step`` (or ``budget_seconds``
+    from the first call when no step is active), and nothing sleeps after the
+    final attempt.
+    """
+
+    def __init__(
+        self,
+        budget_seconds: float = 2.0,
+        max_delay: float = 1.0,
+        jitter: float = 0.5,
+        sleep: Optional[Callable[[float], None]] = None,
+        clock: Optional[Callable[[], float]] = None,
+        rng: Optional[Callable[[], float]] = None,
+    ):
+        self.budget_seconds = budget_seconds
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.sleep = sleep or time.sleep
+        self.clock = clock or time.monotonic
+        self.rng = rng or random.random
+        self.step_deadline: Optional[float] = None
+        self.attempts = 0
+        self.fast_failures = 0
+        self.stale_retries = 0
+        self.budget_exhausted = 0
+        self.slept_seconds = 0.0
+
+    def start_step(self) -> None:
+        self.step_deadline = self.clock() + self.budget_seconds
+
+    def run(self, operation: Callable[[], Any], max_attempts: int = 3, base_delay: float = 0.25, on_stale: Optional[Callable[[], None]] = None) -> RetryOutcome:
+        deadline = self.step_deadline if self.step_deadline is not None else self.clock() + self.budget_seconds
+        error: Optional[BaseException] = None
+        error_class: Optional[ErrorClass] = None
+        ran = 0
+        for attempt in range(max(max_attempts, 1)):
+            if attempt and self.clock() >= deadline:
+                self.budget_exhausted += 1
+                break
+            self.attempts += 1
+            ran += 1
+            try:
+                operation()
+                return RetryOutcome(ok=True, attempts=ran)
+            except Exception as exc:
+                error, error_class = exc, classify(exc)
+            if error_class == ErrorClass.PERMANENT:
+                self.fast_failures += 1
+                break
+            if attempt == max_attempts - 1:
+                break
+            if error_class == ErrorClass.STALE:
+                self.stale_retries += 1
+                if on_stale:
+                    on_stale()
+                continue
+            delay = min(base_delay * (2 ** attempt), self.max_delay) * (1 + self.jitter * (self.rng() - 0.5))
+            remaining = deadline - self.clock()
+            if delay >= remaining:
+                self.budget_exhausted += 1
+                break
+            self.sleep(delay)
+            self.slept_seconds += delay
+        return RetryOutcome(ok=False, attempts=ran, error=error, error_class=error_class)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "fast_failures": self.fast_failures,
+            "stale_retries": self.stale_retries,
+            "budget_exhausted": self.budget_exhausted,
+            "slept_seconds": round(self.slept_seconds, 4),
+        }
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from agent.executor.plan import escape_send_keys
+
+
+@dataclass(frozen=True)
+class TextEntryResult:
+    method: str
+    chars: int
+    seconds: float
+    verified: Optional[bool]
+
+    def as_dict(self) -> Dict[str, Any]:
+        payload = asdict(self)
+        payload["chars_per_second"] = round(self.chars / self.seconds, 1) if self.seconds > 0 else None
+        return payload
+
+
+class TextEntry:
+    """
+    Picks the fastest reliable way to enter text into a target.
+
+    Short payloads are typed key by key so applications see ordinary key
+    events. Longer payloads try ValuePattern ``set_value``, then a clipboard
+    paste, then ``type_keys`` in chunks; a strategy that is unavailable or
+    raises moves on to the next. ``set_value`` replaces the whole value, so it
+    is only used on an empty field, where it matches typing. Applications
+    paste asynchronously, so the previous clipboard content is restored only
+    once the pasted text is read back, and paste is skipped when the value
+    cannot be read. UIA entries are verified by reading the value back
+    through ValuePattern.
+    """
+
+    SET_VALUE = "set_value"
+    PASTE = "paste"
+    CHUNKED = "chunked_keys"
+    PER_KEY = "per_key"
+
+    def __init__(
+        self,
+        clipboard: Optional[Any] = None,
+        fast_min_chars: int = 64,
+        chunk_size: int = 256,
+        paste_timeout: float = 1.0,
+        poll_interval: float = 0.02,
+        clock: Optional[callable] = None,
+        sleep: Optional[callable] = None,
+    ):
+        self.clipboard = clipboard
+        self.fast_min_chars = fast_min_chars
+        self.chunk_size = chunk_size
+        self.paste_timeout = paste_timeout
+        self.poll_interval = poll_interval
+        self.clock = clock or time.perf_counter
+        self.sleep = sleep or time.sleep
+        self.logger = logging.getLogger(__name__)
+        self.last: Optional[TextEntryResult] = None
+        self._totals: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "chars": 0, "seconds": 0.0})
+
+    def enter_uia(self, wrapper: Any, text: str) -> TextEntryResult:
+        start = self.clock()
+        if len(text) >= self.fast_min_chars:
+            for method, strategy in ((self.SET_VALUE, self._set_value), (self.PASTE, self._paste_uia), (self.CHUNKED, self._chunked_keys)):
+                try:
+                    if not strategy(wrapper, text):
+                        continue
+                except Exception as exc:
+                    self.logger.debug("Text entry via %s failed: %s", method, exc)
+                    continue
+                # Text may already have been written, so a mismatch is reported rather than retried.
+                return self._record(method, text, start, _verify(wrapper, text))
+        if hasattr(wrapper, "type_keys"):
+            wrapper.type_keys(escape_send_keys(text), with_spaces=True, set_foreground=True)
+            return self._record(self.PER_KEY, text, start, _verify(wrapper, text))
+        if self._set_value(wrapper, text):
+            return self._record(self.SET_VALUE, text, start, _verify(wrapper, text))
+        raise RuntimeError("UIA element cannot accept text input")
+
+    def enter_driver(self, driver: Any, text: str) -> TextEntryResult:
+        """
+        Keyboard-level entry for the mouse/keyboard fallback. The value cannot
+        be read back here, so a paste could never be confirmed before restoring
+        the clipboard; long text is typed without the per-key interval instead.
+        """
+        start = self.clock()
+        if len(text) >= self.fast_min_chars:
+            driver.typewrite(text, interval=0)
+            return self._record(self.CHUNKED, text, start, None)
+        driver.typewrite(text, interval=0.01)
+        return self._record(self.PER_KEY, text, start, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            method: {**totals, "chars_per_second": round(totals["chars"] / totals["seconds"], 1) if totals["seconds"] else None}
+            for method, totals in self._totals.items()
+        }
+
+    def _set_value(self, wrapper: Any, text: str) -> bool:
+        # Typing inserts at the caret and replaces a selection; neither is known here, so only an empty field qualifies.
+        if _read_value(wrapper) != "":
+            return False
+        for attr in ("set_value", "set_edit_text"):
+            setter = getattr(wrapper, attr, None)
+            if callable(setter):
+                setter(text)
+                return True
+        return False
+
+    def _paste_uia(self, wrapper: Any, text: str) -> bool:
+        clipboard = self._clipboard()
+        if clipboard is None or not hasattr(wrapper, "type_keys") or _read_value(wrapper) is None:
+            return False
+        saved: Optional[str] = None
+        try:
+            saved = clipboard.paste()
+        except Exception as exc:
+            self.logger.debug("Could not save clipboard: %s", exc)
+        clipboard.copy(text)
+        wrapper.type_keys("^v", set_foreground=True)
+        if not self._await_value(wrapper, text):
+            # Restoring now could make the pending paste insert the previous clipboard content instead.
+            self.logger.warning("Paste not observed within %.2fs; leaving the clipboard unrestored", self.paste_timeout)
+            return True
+        if saved is not None:
+            try:
+                clipboard.copy(saved)
+            except Exception as exc:
+                self.logger.debug("Could not restore clipboard: %s", exc)
+        return True
+
+    def _await_value(self, wrapper: Any, text: str) -> bool:
+        deadline = self.clock() + self.paste_timeout
+        while not _verify(wrapper, text):
+            if self.clock() + self.poll_interval > deadline:
+                return False
+            self.sleep(self.poll_interval)
+        return True
+
+    def _chunked_keys(self, wrapper: Any, text: str) -> bool:
+        if not hasattr(wrapper, "type_keys"):
+            return False
+        for offset in range(0, len(text), self.chunk_size):
+            wrapper.type_keys(escape_send_keys(text[offset : offset + self.chunk_size]), with_spaces=True, with_newlines=True, pause=0, set_foreground=offset == 0)
+        return True
+
+    def _clipboard(self) -> Optional[Any]:
+        if self.clipboard is None:
+            try:
+                self.clipboard = importlib.import_module("pyperclip")
+            except Exception:
+                self.clipboard = False
+        return self.clipboard or None
+
+    def _record(self, method: str, text: str, start: float, verified: Optional[bool]) -> TextEntryResult:
+        result = TextEntryResult(method=method, chars=len(text), seconds=self.clock() - start, verified=verified)
+        totals = self._totals[method]
+        totals["count"] += 1
+        totals["chars"] += result.chars
+        totals["seconds"] += result.seconds
+        self.last = result
+        return result
+
+
+def _read_value(wrapper: Any) -> Optional[str]:
+    getter = getattr(wrapper, "get_value", None)
+    if not callable(getter):
+        return None
+    try:
+        value = getter()
+    except Exception:
+        return None
+    return value if isinstance(value, str) else None
+
+
+def _verify(wrapper: Any, text: str) -> Optional[bool]:
+    value = _read_value(wrapper)
+    if value is None:
+        return None
+    # Pasted and typed text lands at the caret, so the field may hold more than ``text``.
+    return text.replace("\r\n", "\n") in value.replace("\r\n", "\n")
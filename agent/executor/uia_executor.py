@@ -4,29 +4,49 @@ import time
 import logging
 from typing import Any, Optional
 
+from agent.executor.container_search import ContainerSearch
 from agent.executor.handle_resolver import UIAHandleResolver
-from agent.state.models import ActionVerb, ExecutionMethod, ExecutionResult, ExecutionStatus, GroundedTarget, IntentAction
+from agent.executor.plan import to_send_keys
+from agent.executor.retry import RetryPolicy
+from agent.executor.text_entry import TextEntry
+from agent.state.models import ActionVerb, ExecutionMethod, ExecutionResult, ExecutionStatus, GroundedTarget, IntentAction, WindowInfo
 
 
 class UIAExecutor:
-    def __init__(self, app_loader: Optional[callable] = None, max_retries: int = 2, backoff_seconds: float = 0.25, resolver: Optional[UIAHandleResolver] = None):
+    def __init__(
+        self,
+        app_loader: Optional[callable] = None,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.25,
+        resolver: Optional[UIAHandleResolver] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        text_entry: Optional[TextEntry] = None,
+        container_search: Optional[ContainerSearch] = None,
+    ):
         self.app_loader = app_loader
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
         self.logger = logging.getLogger(__name__)
         self.resolver = resolver or UIAHandleResolver()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.text_entry = text_entry or TextEntry()
+        self.container_search = container_search or ContainerSearch()
+        # Foreground window of the state being acted on; lets the resolver consult anchors.
+        self.window: Optional[WindowInfo] = None
 
     def execute(self, intent: IntentAction, target: GroundedTarget) -> ExecutionResult:
         start = time.time()
-        error: Optional[str] = None
-        for attempt in range(self.max_retries + 1):
-            try:
-                self._invoke(intent, target)
-                return ExecutionResult(status=ExecutionStatus.OK, method=ExecutionMethod.UIA, duration=time.time() - start)
-            except Exception as exc:
-                error = self._map_error(exc)
-                self.logger.debug("UIA attempt %s failed: %s", attempt + 1, error)
-                time.sleep(self.backoff_seconds * (2 ** attempt))
+        outcome = self.retry_policy.run(
+            lambda: self._invoke(intent, target),
+            max_attempts=self.max_retries + 1,
+            base_delay=self.backoff_seconds,
+            # A cached wrapper may have gone stale between actions; resolve it afresh on retry.
+            on_stale=lambda: self.resolver.invalidate(getattr(target.element, "backend_ref", None)),
+        )
+        if outcome.ok:
+            return ExecutionResult(status=ExecutionStatus.OK, method=ExecutionMethod.UIA, duration=time.time() - start)
+        error = self._map_error(outcome.error)
+        self.logger.debug("UIA action failed after %s attempt(s) (%s): %s", outcome.attempts, outcome.error_class.value, error)
         return ExecutionResult(
             status=ExecutionStatus.FAIL,
             method=ExecutionMethod.UIA,
@@ -46,8 +66,12 @@ class UIAExecutor:
             self._perform_click(wrapper, verb)
         elif verb == ActionVerb.TYPE and intent.text is not None:
             self._perform_type(wrapper, intent.text)
+        elif verb == ActionVerb.KEYPRESS and intent.key:
+            self._perform_keys(wrapper, intent.key)
         elif verb == ActionVerb.SCROLL and intent.amount is not None:
             self._perform_scroll(wrapper, intent.amount)
+        elif verb == ActionVerb.FIND_IN_CONTAINER and intent.text:
+            self._perform_find(wrapper, intent.text)
         elif verb == ActionVerb.FOCUS_WINDOW:
             self._perform_focus(wrapper)
         elif verb == ActionVerb.WAIT:
@@ -64,7 +88,7 @@ class UIAExecutor:
         ref = getattr(element, "backend_ref", None)
         if not ref:
             return None
-        return self.resolver.resolve(ref)
+        return self.resolver.resolve(ref, self.window)
 
     def _perform_click(self, wrapper: Any, verb: ActionVerb) -> None:
         action = {
@@ -81,13 +105,30 @@ class UIAExecutor:
         raise RuntimeError("UIA element cannot be clicked")
 
     def _perform_type(self, wrapper: Any, text: str) -> None:
+        result = self.text_entry.enter_uia(wrapper, text)
+        self.logger.debug("Entered %s chars via %s in %.3fs (verified=%s)", result.chars, result.method, result.seconds, result.verified)
+        if result.verified is False:
+            # A permanent error: the text may be partly written, so it is not retried.
+            raise ValueError(f"entered text did not read back after {result.method}")
+
+    def _perform_keys(self, wrapper: Any, key: str) -> None:
         if hasattr(wrapper, "type_keys"):
-            wrapper.type_keys(text, with_spaces=True, set_foreground=True)
+            wrapper.type_keys(to_send_keys(key), set_foreground=True)
             return
-        if hasattr(wrapper, "set_value"):
-            wrapper.set_value(text)
-            return
-        raise RuntimeError("UIA element cannot accept text input")
+        raise RuntimeError("UIA element cannot accept key presses")
+
+    def has_focus(self, target: GroundedTarget) -> Optional[bool]:
+        """Cheap focus probe for plan steps; ``None`` when focus cannot be determined."""
+        if not target.element:
+            return None
+        wrapper = self._resolve_wrapper(target.element)
+        probe = getattr(wrapper, "has_keyboard_focus", None)
+        if not callable(probe):
+            return None
+        try:
+            return bool(probe())
+        except Exception:
+            return None
 
     def _perform_scroll(self, wrapper: Any, amount: int) -> None:
         if hasattr(wrapper, "scroll"):
@@ -98,6 +139,11 @@ class UIAExecutor:
             return
         raise RuntimeError("UIA element cannot scroll")
 
+    def _perform_find(self, wrapper: Any, query: str) -> None:
+        result = self.container_search.find(wrapper, query)
+        if result.item is None:
+            raise LookupError(f"container has no item matching {query!r} ({result.method}, {result.pages} pages)")
+
     def _perform_focus(self, wrapper: Any) -> None:
         if hasattr(wrapper, "set_focus"):
             wrapper.set_focus()
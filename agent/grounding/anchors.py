@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from agent.grounding.index import GroundingIndex
+from agent.grounding.temporal import normalized_target
+from agent.state.models import IntentTarget, UIElement, WindowInfo
+
+
+@dataclass
+class Anchor:
+    automation_id: Optional[str]
+    role: Optional[str]
+    name: Optional[str]
+    path: Optional[str]
+    region: Optional[Tuple[int, int, int, int]]
+    weight: float = 1.0
+    successes: int = 1
+    failures: int = 0
+
+
+def app_key(window: WindowInfo) -> Optional[str]:
+    if not window.exe_name:
+        return None
+    return f"{window.exe_name.lower()}|{(window.class_name or '').lower()}"
+
+
+def ref_path(backend_ref: Optional[str]) -> Optional[str]:
+    # backend_ref is "handle|automation_id|name|role|parent_chain"; the chain never contains "|".
+    if not backend_ref or "|" not in backend_ref:
+        return None
+    return backend_ref.rsplit("|", 1)[-1] or None
+
+
+def _region(bbox: Optional[Sequence[int]], window: WindowInfo, cell: int = 16) -> Optional[Tuple[int, int, int, int]]:
+    if not bbox or len(bbox) != 4:
+        return None
+    left, top = (window.bbox[0], window.bbox[1]) if window.bbox else (0, 0)
+    return (
+        round((bbox[0] - left) / cell),
+        round((bbox[1] - top) / cell),
+        round((bbox[2] - bbox[0]) / cell),
+        round((bbox[3] - bbox[1]) / cell),
+    )
+
+
+class AnchorStore:
+    """
+    Cross-run memory of where targets were found in each application.
+
+    Anchors are keyed by exe name and window class plus either the run-stable
+    fields of a normalized ``IntentTarget`` (grounding; targets that only carry
+    an element id are not anchored) or an automation id/name/role triple
+    (handle resolution), and record the element's automation id, role, tree path and
+    window-relative region. Each success adds one to an anchor's weight; each
+    failure halves it and subtracts a half, so anchors that keep failing drop
+    out. The store is merged into a JSON file on flush.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_per_key: int = 3, max_keys: int = 4096):
+        self.path = path
+        self.max_per_key = max_per_key
+        self.max_keys = max_keys
+        self.logger = logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self.decayed = 0
+        self._anchors: Dict[str, List[Anchor]] = {}
+        self._removed: Set[str] = set()
+        self._dirty = False
+        self.restore(self._read_disk())
+        if self.path:
+            atexit.register(self.flush)
+
+    def lookup(self, window: WindowInfo, target: IntentTarget, index: GroundingIndex) -> Optional[UIElement]:
+        """Return the element the best live anchor for ``target`` points at in this state, if any."""
+        key = self._target_key(window, target)
+        for anchor in self._anchors.get(key, []) if key else []:
+            element = self._locate(anchor, window, index)
+            if element:
+                self.hits += 1
+                return element
+        self.misses += 1
+        return None
+
+    def record(self, window: WindowInfo, target: Optional[IntentTarget], element: Optional[UIElement], success: bool) -> None:
+        key = self._target_key(window, target) if target else None
+        if key and element:
+            self._update(key, self._anchor_for(element, window), success)
+
+    def known_path(self, window: WindowInfo, automation_id: Optional[str], name: Optional[str], role: Optional[str]) -> Optional[str]:
+        key = self._ref_key(window, automation_id, name, role)
+        anchors = self._anchors.get(key, []) if key else []
+        return anchors[0].path if anchors else None
+
+    def record_path(self, window: WindowInfo, automation_id: Optional[str], name: Optional[str], role: Optional[str], path: Optional[str], success: bool) -> None:
+        key = self._ref_key(window, automation_id, name, role)
+        if key and path:
+            self._update(key, Anchor(automation_id=automation_id, role=role, name=name, path=path, region=None), success)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "decayed": self.decayed,
+            "keys": len(self._anchors),
+        }
+
+    def snapshot(self) -> Dict[str, List[Dict[str, Any]]]:
+        return {key: [asdict(anchor) for anchor in anchors] for key, anchors in self._anchors.items()}
+
+    def restore(self, data: Dict[str, Any]) -> None:
+        """Replace the in-memory anchors with ``data`` (a ``snapshot`` or the store file's contents)."""
+        self._anchors.clear()
+        for key, rows in data.items():
+            try:
+                anchors = [Anchor(**{**row, "region": tuple(row["region"]) if row.get("region") else None}) for row in rows]
+            except (TypeError, KeyError):
+                self.logger.debug("Skipping malformed anchor entry %s", key)
+                continue
+            self._anchors[key] = sorted(anchors, key=lambda a: -a.weight)[: self.max_per_key]
+
+    def close(self) -> None:
+        """Flush and drop the exit hook, which would otherwise keep this instance alive until exit."""
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def flush(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        merged = self._read_disk()
+        for key in self._removed:
+            merged.pop(key, None)
+        merged.update(self.snapshot())
+        live = {key: rows for key, rows in merged.items() if rows}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(live), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._removed.clear()
+        self._dirty = False
+
+    def _locate(self, anchor: Anchor, window: WindowInfo, index: GroundingIndex) -> Optional[UIElement]:
+        if anchor.automation_id:
+            pool = index.by_automation_id.get(anchor.automation_id, [])
+        else:
+            pool = index.by_name.get((anchor.name or "").lower(), [])
+        pool = [e for e in pool if (e.role or "").lower() == (anchor.role or "")]
+        if len(pool) <= 1:
+            return pool[0] if pool else None
+        for element in pool:
+            if anchor.path and ref_path(element.backend_ref) == anchor.path:
+                return element
+        if not anchor.region:
+            return None
+
+        def distance(element: UIElement) -> int:
+            region = _region(element.bbox, window)
+            return sum(abs(a - b) for a, b in zip(region, anchor.region)) if region else 1 << 30
+
+        return min(pool, key=distance)
+
+    def _anchor_for(self, element: UIElement, window: WindowInfo) -> Anchor:
+        return Anchor(
+            automation_id=element.automation_id,
+            role=(element.role or "").lower(),
+            name=element.name,
+            path=ref_path(element.backend_ref),
+            region=_region(element.bbox, window),
+        )
+
+    def _update(self, key: str, observed: Anchor, success: bool) -> None:
+        anchors = self._anchors.setdefault(key, [])
+        existing = next((a for a in anchors if _same_anchor(a, observed)), None)
+        if success:
+            if existing:
+                existing.weight += 1.0
+                existing.successes += 1
+                existing.path, existing.region = observed.path or existing.path, observed.region or existing.region
+            else:
+                anchors.append(observed)
+            self._removed.discard(key)
+        elif existing:
+            existing.failures += 1
+            existing.weight = existing.weight * 0.5 - 0.5
+            if existing.weight <= 0:
+                anchors.remove(existing)
+                self.decayed += 1
+        else:
+            if not anchors:
+                del self._anchors[key]
+            return
+        anchors.sort(key=lambda a: -a.weight)
+        del anchors[self.max_per_key :]
+        if not anchors:
+            del self._anchors[key]
+            self._removed.add(key)
+        elif len(self._anchors) > self.max_keys:
+            # Evict the weakest key rather than the one just touched.
+            weakest = min((k for k in self._anchors if k != key), key=lambda k: self._anchors[k][0].weight)
+            del self._anchors[weakest]
+            self._removed.add(weakest)
+        self._dirty = True
+
+    def _target_key(self, window: WindowInfo, target: IntentTarget) -> Optional[str]:
+        # element_id embeds the window handle and a bbox bucket, so it never recurs in a later run.
+        stable = normalized_target(target)[:-1]
+        app = app_key(window)
+        if not app or not any(stable):
+            return None
+        return f"target|{app}|{json.dumps(stable)}"
+
+    def _ref_key(self, window: WindowInfo, automation_id: Optional[str], name: Optional[str], role: Optional[str]) -> Optional[str]:
+        app = app_key(window)
+        if not app or not (automation_id or name):
+            return None
+        return f"ref|{app}|{automation_id or ''}|{(name or '').lower()}|{(role or '').lower()}"
+
+    def _read_disk(self) -> Dict[str, Any]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            self.logger.warning("Ignoring unreadable anchor store %s: %s", self.path, exc)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+
+def _same_anchor(a: Anchor, b: Anchor) -> bool:
+    if a.automation_id or b.automation_id:
+        return a.automation_id == b.automation_id and a.role == b.role
+    return (a.name or "").lower() == (b.name or "").lower() and a.role == b.role and a.path == b.path
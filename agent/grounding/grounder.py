@@ -1,37 +1,147 @@
 from __future__ import annotations
 
 import logging
+import weakref
 from difflib import SequenceMatcher
 from dataclasses import replace
-from typing import List, Optional
+from typing import Callable, List, Optional, Sequence
 
+from agent.grounding.anchors import AnchorStore
+from agent.grounding.index import FUZZY_NAME_THRESHOLD, GroundingIndex
+from agent.grounding.temporal import TemporalGroundingCache, target_key
 from agent.state.models import GroundedTarget, IntentAction, IntentTarget, UIElement, UIState
 
 
 class Grounder:
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        use_index: bool = True,
+        temporal_cache: Optional[TemporalGroundingCache] = None,
+        anchors: Optional[AnchorStore] = None,
+        expander: Optional[Callable[[UIElement, IntentTarget, UIState], List[UIElement]]] = None,
+    ):
         self.logger = logger or logging.getLogger(__name__)
+        self.use_index = use_index
+        self.temporal_cache = temporal_cache if temporal_cache is not None else TemporalGroundingCache()
+        self.anchors = anchors
+        self.expander = expander
+        self.expansions = 0
+        self.last_cache_outcome: Optional[str] = None
+        self._index_state: Optional[weakref.ref] = None
+        self._index: Optional[GroundingIndex] = None
 
     def ground(self, intent: IntentAction, ui_state: UIState) -> GroundedTarget:
-        candidates = self._match_candidates(intent.target, ui_state) if intent.target else []
-        element = candidates[0] if candidates else None
-        confidence = candidates[0].salience if candidates else 0.0
-        return GroundedTarget(element=element, confidence=float(confidence), alternatives=candidates[1:])
+        return self.ground_batch([intent], ui_state)[0]
 
-    def _match_candidates(self, target: IntentTarget, ui_state: UIState) -> List[UIElement]:
+    def ground_batch(self, intents: Sequence[IntentAction], ui_state: UIState) -> List[GroundedTarget]:
+        """Ground several intents against the same state, sharing one per-state index."""
+        targets: List[Optional[IntentTarget]] = [intent.target for intent in intents]
+        results: List[Optional[GroundedTarget]] = [None] * len(intents)
+        if self.use_index and (self.temporal_cache is not None or self.anchors is not None):
+            index = self.index_for(ui_state)
+            outcomes = []
+            for slot, target in enumerate(targets):
+                if not target:
+                    continue
+                outcome, element = "miss", None
+                if self.temporal_cache is not None:
+                    element = self.temporal_cache.lookup(target_key(target, ui_state.window), index.by_element_id, ui_state.window)
+                    outcome = "hit" if element else "miss"
+                if element is None and self.anchors is not None:
+                    element = self.anchors.lookup(ui_state.window, target, index)
+                    outcome = "anchor" if element else outcome
+                outcomes.append(outcome)
+                score = self._score_element(target, element)[0] if element else 0.0
+                if score > 0:
+                    hit = replace(element, salience=element.salience + score)
+                    results[slot] = GroundedTarget(element=hit, confidence=float(hit.salience), alternatives=[])
+                    targets[slot] = None
+                    if outcome == "anchor" and self.temporal_cache is not None:
+                        self.temporal_cache.store(target_key(target, ui_state.window), element, ui_state.window)
+            self.last_cache_outcome = outcomes[0] if len(outcomes) == 1 else (",".join(outcomes) or None)
+        candidates = self._match_candidates_batch(targets, ui_state)
+        for slot, ranked in enumerate(candidates):
+            if results[slot] is not None:
+                continue
+            if self.expander is not None and targets[slot] and not (ranked and self._strong_match(targets[slot], ranked[0])):
+                ranked = self._merge_expanded(targets[slot], ranked, self._expand_groups(targets[slot], ui_state))
+            element = ranked[0] if ranked else None
+            confidence = ranked[0].salience if ranked else 0.0
+            results[slot] = GroundedTarget(element=element, confidence=float(confidence), alternatives=ranked[1:])
+            if element and self.temporal_cache is not None and intents[slot].target:
+                self.temporal_cache.store(target_key(intents[slot].target, ui_state.window), element, ui_state.window)
+        return results
+
+    def record_outcome(self, intent: IntentAction, ui_state: UIState, grounded: GroundedTarget, success: bool) -> None:
+        """Feed a verified outcome back into the anchor store; failures also drop the temporal entry."""
+        if self.anchors is not None:
+            self.anchors.record(ui_state.window, intent.target, grounded.element, success)
+        if not success:
+            self.forget(intent, ui_state)
+
+    def forget(self, intent: IntentAction, ui_state: UIState) -> None:
+        """Drop the temporal entry for ``intent``, e.g. after the grounded action failed to verify."""
+        if intent.target and self.temporal_cache is not None:
+            self.temporal_cache.forget(target_key(intent.target, ui_state.window))
+
+    @staticmethod
+    def _strong_match(target: IntentTarget, element: UIElement) -> bool:
+        """Exact id and name constraints are hard filters in scoring; only a fuzzy ``name_contains`` hit is weak."""
+        if target.name_contains:
+            return target.name_contains.lower() in (element.name or "").lower()
+        return bool(target.element_id or target.automation_id or target.name_equals)
+
+    def _merge_expanded(self, target: IntentTarget, ranked: List[UIElement], expanded: List[UIElement]) -> List[UIElement]:
+        """Rank expanded items together with the visible ones, strong matches first."""
+        if not expanded:
+            return ranked
+        seen = {element.element_id for element in ranked}
+        merged = ranked + [element for element in expanded if element.element_id not in seen]
+        return sorted(merged, key=lambda e: (not self._strong_match(target, e), -(e.salience or 0.0), e.element_id))
+
+    def _expand_groups(self, target: IntentTarget, ui_state: UIState) -> List[UIElement]:
+        """Ask the expander for matching items hidden behind group summaries when nothing on screen matched strongly."""
         scored: List[UIElement] = []
+        for group in (element for element in ui_state.elements if element.group is not None):
+            for element in self.expander(group, target, ui_state):
+                score = self._score_element(target, element)[0]
+                if score > 0:
+                    scored.append(replace(element, salience=element.salience + score))
+        if scored:
+            self.expansions += 1
+        return sorted(scored, key=lambda e: (-(e.salience or 0.0), e.element_id))
+
+    def _match_candidates(self, target: IntentTarget, ui_state: UIState) -> List[UIElement]:
+        return self._match_candidates_batch([target], ui_state)[0]
+
+    def _match_candidates_batch(self, targets: Sequence[Optional[IntentTarget]], ui_state: UIState) -> List[List[UIElement]]:
+        scored: List[List[UIElement]] = [[] for _ in targets]
+        debug = self.logger.isEnabledFor(logging.DEBUG)
         debug_rows: List[str] = []
-        for element in ui_state.elements:
-            score, reason = self._score_element(target, element)
-            if score <= 0:
+        index = self.index_for(ui_state) if self.use_index else None
+        for slot, target in enumerate(targets):
+            if not target:
                 continue
-            element_salience = element.salience + score
-            debug_rows.append(f"{element.element_id} -> {element_salience:.2f} ({reason})")
-            scored.append(replace(element, salience=element_salience))
-        scored_sorted = sorted(scored, key=lambda e: (-(e.salience or 0.0), e.element_id))
+            pool = index.candidates(target) if index else ui_state.elements
+            for element in pool:
+                score, reason = self._score_element(target, element)
+                if score <= 0:
+                    continue
+                element_salience = element.salience + score
+                if debug:
+                    debug_rows.append(f"[{slot}] {element.element_id} -> {element_salience:.2f} ({reason})")
+                scored[slot].append(replace(element, salience=element_salience))
         if debug_rows:
             self.logger.debug("Grounding candidates:\n%s", "\n".join(debug_rows))
-        return scored_sorted
+        return [sorted(rows, key=lambda e: (-(e.salience or 0.0), e.element_id)) for rows in scored]
+
+    def index_for(self, ui_state: UIState) -> GroundingIndex:
+        """Build the grounding index lazily, once per ``UIState`` instance."""
+        if self._index is None or self._index_state is None or self._index_state() is not ui_state:
+            self._index = GroundingIndex(ui_state)
+            self._index_state = weakref.ref(ui_state)
+        return self._index
 
     def _score_element(self, target: IntentTarget, element: UIElement) -> tuple[float, str]:
         score = 0.0
@@ -62,9 +172,16 @@ class Grounder:
             else:
                 return 0.0, "name mismatch"
         if target.name_contains:
-            contains = target.name_contains.lower() in name
-            fuzzy = SequenceMatcher(None, target.name_contains.lower(), name).ratio()
-            if contains or fuzzy > 0.55:
+            query = target.name_contains.lower()
+            contains = query in name
+            # Length ratio, then quick_ratio, are cheap upper bounds on ratio().
+            if not contains and 2.0 * min(len(query), len(name)) / max(len(query) + len(name), 1) <= FUZZY_NAME_THRESHOLD:
+                return 0.0, "name missing"
+            matcher = SequenceMatcher(None, query, name)
+            if not contains and matcher.quick_ratio() <= FUZZY_NAME_THRESHOLD:
+                return 0.0, "name missing"
+            fuzzy = matcher.ratio()
+            if contains or fuzzy > FUZZY_NAME_THRESHOLD:
                 reasons.append("name_contains")
                 score += 2.0 * fuzzy
             else:
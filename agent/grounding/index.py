@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, List
+
+from agent.state.models import IntentTarget, UIElement, UIState
+
+# ``Grounder._score_element`` accepts a ``name_contains`` match that is not a substring only above this ratio.
+FUZZY_NAME_THRESHOLD = 0.55
+
+
+class GroundingIndex:
+    """
+    Lookup structures over one ``UIState`` used to narrow grounding candidates.
+
+    Hard constraints (element id, automation id, exact name) resolve through
+    hash maps. ``name_contains`` goes through per-character counts: a name is a
+    candidate if it contains the query or shares enough characters that
+    ``SequenceMatcher.quick_ratio`` (an upper bound on ``ratio``) exceeds
+    ``FUZZY_NAME_THRESHOLD``, so the pool holds every name a full scan could
+    accept. Targets without a hard constraint, including role-only ones (a
+    role mismatch is only a penalty), fall back to every element.
+    """
+
+    def __init__(self, ui_state: UIState):
+        self.elements = ui_state.elements
+        self.by_element_id: Dict[str, List[UIElement]] = {}
+        self.by_automation_id: Dict[str, List[UIElement]] = {}
+        self.by_name: Dict[str, List[UIElement]] = {}
+        self._names: List[str] = []
+        self._counts_by_char: Dict[str, List[int]] = {}
+        for element in self.elements:
+            self.by_element_id.setdefault(element.element_id, []).append(element)
+            if element.automation_id:
+                self.by_automation_id.setdefault(element.automation_id, []).append(element)
+            name = (element.name or "").lower()
+            self._names.append(name)
+            self.by_name.setdefault(name, []).append(element)
+
+    def candidates(self, target: IntentTarget) -> List[UIElement]:
+        pools: List[List[UIElement]] = []
+        if target.element_id:
+            pools.append(self.by_element_id.get(target.element_id, []))
+        if target.automation_id:
+            pools.append(self.by_automation_id.get(target.automation_id, []))
+        if target.name_equals:
+            pools.append(self.by_name.get(target.name_equals.lower(), []))
+        if target.name_contains and not pools:
+            pools.append(self._fuzzy_name_candidates(target.name_contains.lower()))
+        if not pools:
+            return list(self.elements)
+        return min(pools, key=len)
+
+    def _fuzzy_name_candidates(self, query: str) -> List[UIElement]:
+        size = len(query)
+        columns = [[count if count < wanted else wanted for count in self._char_counts(char)] for char, wanted in Counter(query).items()]
+        shared = map(sum, zip(*columns))
+        return [
+            element
+            for element, name, common in zip(self.elements, self._names, shared)
+            if 2.0 * common / (size + len(name)) > FUZZY_NAME_THRESHOLD or (common == size and query in name)
+        ]
+
+    def _char_counts(self, char: str) -> List[int]:
+        # Per-character columns are built on first use; most states are only grounded by id or exact name.
+        counts = self._counts_by_char.get(char)
+        if counts is None:
+            counts = self._counts_by_char[char] = [name.count(char) for name in self._names]
+        return counts
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from agent.perception.hashing import element_signature
+from agent.state.models import IntentTarget, UIElement, WindowInfo
+
+TargetKey = Tuple[str, Tuple[Optional[str], ...]]
+
+
+def normalized_target(target: IntentTarget) -> Tuple[Optional[str], ...]:
+    def norm(value: Optional[str]) -> Optional[str]:
+        return " ".join(value.lower().split()) if value else None
+
+    return (
+        norm(target.role),
+        norm(target.name_contains),
+        norm(target.name_equals),
+        target.automation_id,
+        norm(target.near_text),
+        target.element_id,
+    )
+
+
+def target_key(target: IntentTarget, window: WindowInfo) -> TargetKey:
+    return window.fingerprint, normalized_target(target)
+
+
+class TemporalGroundingCache:
+    """
+    Remembers which element each (target, window) grounded to last time.
+
+    An entry is reused only while an element with the same id and the same
+    ``element_signature`` is present in the new state; anything else is a miss
+    and the caller falls back to full grounding.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._entries: "OrderedDict[TargetKey, Tuple[str, str]]" = OrderedDict()
+
+    def lookup(self, key: TargetKey, elements_by_id: Dict[str, Any], window: WindowInfo) -> Optional[UIElement]:
+        entry = self._entries.get(key)
+        if not entry:
+            self.misses += 1
+            return None
+        element_id, signature = entry
+        matches = elements_by_id.get(element_id) or []
+        element = matches[0] if len(matches) == 1 else None
+        if not element or element_signature(element, window) != signature:
+            self.stale += 1
+            self.misses += 1
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return element
+
+    def store(self, key: TargetKey, element: UIElement, window: WindowInfo) -> None:
+        self._entries[key] = (element.element_id, element_signature(element, window))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def forget(self, key: TargetKey) -> None:
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "stale": self.stale, "hit_rate": self.hits / total if total else 0.0}
@@ -7,6 +7,8 @@ from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from agent.logging.writer import BackgroundJsonlWriter
+
 LOG_VERSION = 1
 
 
@@ -22,11 +24,36 @@ class LogEvent:
 
 
 class JsonLogger:
-    def __init__(self, log_dir: Path, host_platform: Optional[str] = None):
+    """
+    Writes run events to ``<log_dir>/<run_id>.jsonl``.
+
+    By default events are handed to a ``BackgroundJsonlWriter``, so ``log``
+    only enqueues and payloads are serialized later on the writer thread;
+    callers must not mutate a payload after logging it. ``background=False``
+    appends synchronously instead.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        host_platform: Optional[str] = None,
+        background: bool = True,
+        fsync: str = "close",
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        flush_interval: float = 0.5,
+        compress: bool = False,
+    ):
         self.log_dir = log_dir
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self.run_id = uuid.uuid4().hex
         self.host_platform = host_platform
+        self.writer = (
+            BackgroundJsonlWriter(
+                self.log_dir / self.run_id, fsync=fsync, max_segment_bytes=max_segment_bytes, flush_interval=flush_interval, compress=compress
+            )
+            if background
+            else None
+        )
 
     def log(self, step_index: int, kind: str, payload: Dict[str, Any]) -> None:
         event = LogEvent(
@@ -38,6 +65,18 @@ class JsonLogger:
             version=LOG_VERSION,
             host_platform=self.host_platform,
         )
+        if self.writer is not None:
+            # vars() rather than asdict(): asdict deep-copies the payload on the caller's thread.
+            self.writer.write(dict(vars(event)))
+            return
         path = self.log_dir / f"{self.run_id}.jsonl"
         with path.open("a", encoding="utf-8") as f:
             f.write(json.dumps(asdict(event), ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
@@ -0,0 +1,184 @@
+"""
+Replay recorded runs through the perception-decision pipeline offline.
+
+    python -m agent.logging.pipeline_replay --log-dir logs --run-id <id>
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from agent.decision.decision_cache import intent_from_payload, intent_to_payload
+from agent.decision.decision_engine import DecisionEngine
+from agent.decision.llm_interface import LLMInterface
+from agent.decision.micropolicy import MicropolicyTable
+from agent.grounding.anchors import AnchorStore
+from agent.grounding.grounder import Grounder
+from agent.logging.recording import CONFIG_EVENT, DECISION_EVENT, OBSERVATION_EVENT, observation_from_dict
+from agent.logging.replay import select_events
+from agent.perception.compression import UICompressor
+from agent.selector.selector import Selector
+from agent.skills.skill_library import SkillLibrary
+from agent.state.models import IntentAction, Observation, VerificationStatus, WorkingMemory
+from agent.verifier.verifier import VerificationContext, Verifier
+
+STAGES = ("compress", "decide", "ground", "verify")
+
+
+@dataclass
+class RecordedStep:
+    step_index: int
+    before: Optional[Observation] = None
+    after: Optional[Observation] = None
+    decision: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ReplayReport:
+    steps: int = 0
+    timings: Dict[str, List[float]] = field(default_factory=lambda: {stage: [] for stage in STAGES})
+    differences: List[Dict[str, Any]] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        stages = {}
+        for stage, samples in self.timings.items():
+            if samples:
+                ordered = sorted(samples)
+                stages[stage] = {
+                    "count": len(samples),
+                    "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+                }
+        return {"steps": self.steps, "stages": stages, "differences": len(self.differences)}
+
+
+def load_recording(log_dir: Path, run_id: str) -> List[RecordedStep]:
+    steps: Dict[int, RecordedStep] = {}
+    for event in select_events(log_dir, run_id, kinds={OBSERVATION_EVENT, DECISION_EVENT}):
+        index = event.get("step_index")
+        step = steps.setdefault(index, RecordedStep(step_index=index))
+        payload = event.get("payload") or {}
+        if event.get("kind") == DECISION_EVENT:
+            step.decision = payload
+        elif payload.get("phase") == "after":
+            step.after = observation_from_dict(payload["observation"])
+        else:
+            step.before = observation_from_dict(payload["observation"])
+    return [steps[index] for index in sorted(steps) if steps[index].before is not None]
+
+
+def load_inputs(log_dir: Path, run_id: str) -> Optional[Dict[str, Any]]:
+    """The micropolicy rules, skill stats and anchors a recorded run started with; ``None`` for older recordings."""
+    for event in select_events(log_dir, run_id, kinds={CONFIG_EVENT}):
+        return event.get("payload") or {}
+    return None
+
+
+class PipelineReplayer:
+    """
+    Feeds recorded observations through ``UICompressor``, ``DecisionEngine``,
+    ``Grounder`` and ``Verifier`` without a Windows host or an LLM endpoint.
+
+    Steps the live run decided through the LLM get the recorded intent back
+    from a stand-in client, so every other stage runs for real. ``inputs``
+    (see ``load_inputs``) restores the micropolicy rules, skill stats and
+    anchors the live run started with; anchors then learn from the recorded
+    verification outcomes as they did live. Without ``inputs`` the built-in
+    defaults are used. The decision cache is off, so a replay depends only on
+    the recording.
+    """
+
+    def __init__(self, clock: Optional[callable] = None, inputs: Optional[Dict[str, Any]] = None):
+        inputs = inputs or {}
+        self.clock = clock or time.perf_counter
+        self.compressor = UICompressor()
+        anchors = None
+        if inputs.get("anchors") is not None:
+            anchors = AnchorStore()
+            anchors.restore(inputs["anchors"])
+        self.grounder = Grounder(anchors=anchors)
+        self.verifier = Verifier()
+        self._recorded_intent: Optional[IntentAction] = None
+        skills = SkillLibrary()
+        if inputs.get("skills"):
+            skills.restore(inputs["skills"])
+        self.engine = DecisionEngine(
+            skills=skills,
+            selector=Selector(max_actions=10**9),
+            llm=LLMInterface(client=self._recorded_client, max_retries=0),
+            micropolicy=MicropolicyTable.from_dicts(inputs["micropolicy"]) if inputs.get("micropolicy") is not None else None,
+            grounder=self.grounder,
+        )
+
+    def replay(self, steps: Iterable[RecordedStep]) -> ReplayReport:
+        report = ReplayReport()
+        memory = WorkingMemory()
+        for step in steps:
+            report.steps += 1
+            recorded = step.decision
+            memory.goal = recorded.get("goal", memory.goal)
+            self._recorded_intent = intent_from_payload(recorded.get("intent"))
+            ui_state = self._timed(report, "compress", lambda: self.compressor.compress(step.before))
+            try:
+                decision = self._timed(report, "decide", lambda: self.engine.decide(ui_state, memory))
+            except ValueError as exc:
+                report.differences.append({"step": step.step_index, "field": "decide", "recorded": recorded.get("rationale"), "replayed": str(exc)})
+                continue
+            grounded = decision.grounded or self._timed(report, "ground", lambda: self.grounder.ground(decision.intent, ui_state))
+            replayed = {
+                "rationale": decision.rationale,
+                "intent": intent_to_payload(decision.intent),
+                "element_id": grounded.element.element_id if grounded.element else None,
+            }
+            if step.after is not None:
+                after_state = self.compressor.compress(step.after)
+                context = VerificationContext(previous_state=ui_state, current_state=after_state, observation=step.after, intent=decision.intent)
+                replayed["verification"] = self._timed(report, "verify", lambda: self.verifier.verify(context)).status.value
+            for key, value in replayed.items():
+                if key in recorded and recorded[key] != value:
+                    report.differences.append({"step": step.step_index, "field": key, "recorded": recorded[key], "replayed": value})
+            if "verification" in recorded:
+                self.grounder.record_outcome(decision.intent, ui_state, grounded, recorded["verification"] == VerificationStatus.SUCCESS.value)
+        return report
+
+    def _recorded_client(self, ui_state, goal, candidate_actions=None):
+        _ = ui_state, goal, candidate_actions
+        return [self._recorded_intent] if self._recorded_intent else []
+
+    def _timed(self, report: ReplayReport, stage: str, call):
+        start = self.clock()
+        result = call()
+        report.timings[stage].append(self.clock() - start)
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--log-dir", default="logs", help="Directory containing recorded JSONL logs.")
+    parser.add_argument("--run-id", required=True, help="Run recorded with --record.")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the recording this many times for steadier timings.")
+    args = parser.parse_args()
+
+    steps = load_recording(Path(args.log_dir), args.run_id)
+    if not steps:
+        raise SystemExit("No recorded steps found; record runs with --record.")
+    inputs = load_inputs(Path(args.log_dir), args.run_id)
+    report = ReplayReport()
+    for _ in range(max(args.repeat, 1)):
+        current = PipelineReplayer(inputs=inputs).replay(steps)
+        report.steps += current.steps
+        report.differences = current.differences
+        for stage, samples in current.timings.items():
+            report.timings[stage].extend(samples)
+    print(json.dumps(report.summary(), indent=2))
+    for difference in report.differences:
+        print(f"[{difference['step']:02d}] {difference['field']}: recorded={difference['recorded']!r} replayed={difference['replayed']!r}")
+
+
+if __name__ == "__main__":
+    main()
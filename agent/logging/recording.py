@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from agent.state.models import OCRSpan, Observation, WindowInfo
+
+# Event kinds written by ``AgentConfig.record``; replayable with ``agent.logging.pipeline_replay``.
+OBSERVATION_EVENT = "rec_observation"
+DECISION_EVENT = "rec_decision"
+# Logged once per run: micropolicy rules, skill stats and grounding anchors as the run started.
+CONFIG_EVENT = "rec_config"
+
+
+def observation_to_dict(observation: Observation) -> Dict[str, Any]:
+    return {
+        "window": asdict(observation.window),
+        "raw_tree": observation.raw_tree,
+        "screenshot_path": observation.screenshot_path,
+        "ocr_results": [asdict(span) for span in observation.ocr_results] if observation.ocr_results is not None else None,
+        "timestamp": observation.timestamp,
+        "warnings": list(observation.warnings),
+    }
+
+
+def observation_from_dict(payload: Dict[str, Any]) -> Observation:
+    window = dict(payload.get("window") or {})
+    for key in ("bbox", "warnings"):
+        if isinstance(window.get(key), list):
+            window[key] = tuple(window[key]) if key == "bbox" else list(window[key])
+    spans = payload.get("ocr_results")
+    return Observation(
+        window=WindowInfo(**window),
+        raw_tree=_restore_boxes(payload.get("raw_tree")),
+        screenshot_path=payload.get("screenshot_path"),
+        ocr_results=[OCRSpan(text=span.get("text", ""), bbox=_tuple(span.get("bbox")), confidence=span.get("confidence")) for span in spans] if spans is not None else None,
+        timestamp=payload.get("timestamp") or 0.0,
+        warnings=list(payload.get("warnings") or []),
+    )
+
+
+def _restore_boxes(node: Any) -> Any:
+    """JSON turns bbox tuples into lists; restore them so element ids and signatures match the live run."""
+    if not isinstance(node, dict):
+        return node
+    restored = dict(node)
+    restored["bbox"] = _tuple(node.get("bbox"))
+    restored["children"] = [_restore_boxes(child) for child in node.get("children") or []]
+    return restored
+
+
+def _tuple(value: Optional[Any]) -> Optional[Any]:
+    return tuple(value) if isinstance(value, list) else value
@@ -1,47 +1,192 @@
 from __future__ import annotations
 
 import argparse
+import gzip
 import json
+import time
 from pathlib import Path
-from typing import Iterable, List
+from typing import IO, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+
+from agent.logging.writer import index_path, segment_path
+
+IndexEntry = Tuple[Optional[int], Optional[str], int]
+
+
+def iter_events(path: Path, offset: int = 0) -> Iterator[dict]:
+    """Stream events from a plain or gzipped segment, starting at an uncompressed byte ``offset``."""
+    with _open(path) as f:
+        if offset:
+            f.seek(offset)
+        for line in f:
+            event = _decode(line)
+            if event is not None:
+                yield event
 
 
 def load_events(path: Path) -> List[dict]:
-    events: List[dict] = []
+    return list(iter_events(path))
+
+
+def run_segments(log_dir: Path, run_id: str) -> List[Path]:
+    """All segment files of a run in write order; rotated segments may be gzipped."""
+    paths: List[Path] = []
+    while True:
+        for compressed in (False, True):
+            path = segment_path(log_dir / run_id, len(paths), compressed)
+            if path.exists():
+                paths.append(path)
+                break
+        else:
+            return paths
+
+
+def read_index(segment: Path) -> Optional[List[IndexEntry]]:
+    path = index_path(segment)
+    if not path.exists():
+        return None
+    entries: List[IndexEntry] = []
     with path.open("r", encoding="utf-8") as f:
         for line in f:
             try:
-                events.append(json.loads(line))
-            except json.JSONDecodeError:
+                step, kind, offset = json.loads(line)
+            except (json.JSONDecodeError, TypeError, ValueError):
+                # A torn last line from a live writer.
                 continue
-    return events
+            entries.append((step, kind, int(offset)))
+    return entries
+
+
+def select_events(
+    log_dir: Path, run_id: str, steps: Optional[Tuple[int, int]] = None, kinds: Optional[Set[str]] = None
+) -> Iterator[dict]:
+    """
+    Stream the events of a run, optionally limited to an inclusive step range
+    and a set of kinds.
+
+    Segments with a sidecar index are skipped when their step range does not
+    overlap ``steps``; within a segment, reading starts at the first matching
+    offset and, for plain files filtered by kind, seeks straight to each
+    matching event. Gzipped segments seek by decompressing up to the offset.
+    Segments without an index are scanned and filtered.
+    """
+    for segment in run_segments(log_dir, run_id):
+        entries = read_index(segment)
+        if not entries:
+            yield from (event for event in iter_events(segment) if _wanted(event.get("step_index"), event.get("kind"), steps, kinds))
+            continue
+        matching = [entry for entry in entries if _wanted(entry[0], entry[1], steps, kinds)]
+        if not matching:
+            continue
+        if kinds and not segment.name.endswith(".gz"):
+            with segment.open("rb") as f:
+                for _, _, offset in matching:
+                    f.seek(offset)
+                    event = _decode(f.readline())
+                    if event is not None:
+                        yield event
+            continue
+        for event in iter_events(segment, matching[0][2]):
+            if _wanted(event.get("step_index"), event.get("kind"), steps, kinds):
+                yield event
+            elif steps and isinstance(event.get("step_index"), int) and event["step_index"] > steps[1]:
+                # Step indices only grow within a run.
+                break
+
+
+def follow_events(
+    log_dir: Path,
+    run_id: str,
+    steps: Optional[Tuple[int, int]] = None,
+    kinds: Optional[Set[str]] = None,
+    poll_interval: float = 0.5,
+    sleep: Callable[[float], None] = time.sleep,
+    stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[dict]:
+    """Like ``tail -f``: stream what is there, then keep yielding events as the run appends them, across rotations."""
+    segment_index, offset, partial = 0, 0, b""
+    while True:
+        segments = run_segments(log_dir, run_id)
+        if segment_index < len(segments):
+            path = segments[segment_index]
+            with _open(path) as f:
+                f.seek(offset)
+                chunk = f.read()
+            offset += len(chunk)
+            lines = (partial + chunk).split(b"\n")
+            partial = lines.pop()
+            for line in lines:
+                event = _decode(line)
+                if event is not None and _wanted(event.get("step_index"), event.get("kind"), steps, kinds):
+                    yield event
+            if segment_index + 1 < len(segments) and not chunk:
+                segment_index, offset, partial = segment_index + 1, 0, b""
+                continue
+        if stop is not None and stop():
+            return
+        sleep(poll_interval)
 
 
 def render(events: Iterable[dict]) -> None:
     for event in events:
         prefix = f"[{event.get('step_index'):02d}] {event.get('kind')}"
         payload = event.get("payload", {})
-        print(f"{prefix:<18} {payload}")
+        print(f"{prefix:<18} {payload}", flush=True)
+
+
+def parse_steps(raw: Optional[str]) -> Optional[Tuple[int, int]]:
+    """``"7"`` selects one step, ``"10:20"`` an inclusive range, ``"10:"`` everything from step 10."""
+    if not raw:
+        return None
+    low, sep, high = raw.partition(":")
+    if not sep:
+        return int(low), int(low)
+    return int(low or 0), int(high) if high else 2**62
+
+
+def _wanted(step: Optional[int], kind: Optional[str], steps: Optional[Tuple[int, int]], kinds: Optional[Set[str]]) -> bool:
+    if kinds and kind not in kinds:
+        return False
+    if steps and not (isinstance(step, int) and steps[0] <= step <= steps[1]):
+        return False
+    return True
+
+
+def _open(path: Path) -> IO[bytes]:
+    return gzip.open(path, "rb") if path.name.endswith(".gz") else path.open("rb")
+
+
+def _decode(line: bytes) -> Optional[dict]:
+    try:
+        event = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return event if isinstance(event, dict) else None
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Replay agent run from JSONL log.")
     parser.add_argument("--log-dir", default="logs", help="Directory containing JSONL logs.")
     parser.add_argument("--run-id", help="Run identifier (hex). If omitted, the newest log is used.")
+    parser.add_argument("--steps", help="Step or inclusive range to show, e.g. 7, 10:20 or 10:.")
+    parser.add_argument("--kind", action="append", help="Only show events of this kind; repeatable or comma-separated.")
+    parser.add_argument("--follow", action="store_true", help="Keep printing events as the run appends them.")
     args = parser.parse_args()
 
     log_dir = Path(args.log_dir)
-    if args.run_id:
-        path = log_dir / f"{args.run_id}.jsonl"
-    else:
-        candidates = sorted(log_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True)
+    run_id = args.run_id
+    if not run_id:
+        candidates = sorted(log_dir.glob("*.jsonl*"), key=lambda p: p.stat().st_mtime, reverse=True)
         if not candidates:
             raise SystemExit("No logs found.")
-        path = candidates[0]
+        run_id = candidates[0].name.split(".")[0]
 
-    events = load_events(path)
-    print(f"Loaded {len(events)} events from {path.name}")
-    render(events)
+    steps = parse_steps(args.steps)
+    kinds = {kind.strip() for raw in args.kind for kind in raw.split(",") if kind.strip()} if args.kind else None
+    print(f"Replaying run {run_id} ({len(run_segments(log_dir, run_id))} segment(s))")
+    try:
+        render(follow_events(log_dir, run_id, steps, kinds) if args.follow else select_events(log_dir, run_id, steps, kinds))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import signal
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, TextIO
+
+FSYNC_POLICIES = ("never", "batch", "close")
+
+_STOP = object()
+_live_writers: "weakref.WeakSet[BackgroundJsonlWriter]" = weakref.WeakSet()
+_signals_installed = False
+
+
+def segment_path(base: Path, index: int, compressed: bool = False) -> Path:
+    """``<base>.jsonl`` for the first segment, then ``<base>.001.jsonl``, ``<base>.002.jsonl``..."""
+    name = f"{base.name}.jsonl" if index == 0 else f"{base.name}.{index:03d}.jsonl"
+    return base.with_name(name + ".gz" if compressed else name)
+
+
+def index_path(segment: Path) -> Path:
+    """Sidecar index of a segment: one ``[step_index, kind, offset]`` line per record, offsets uncompressed."""
+    name = segment.name[: -len(".gz")] if segment.name.endswith(".gz") else segment.name
+    return segment.with_name(name[: -len(".jsonl")] + ".idx")
+
+
+class BackgroundJsonlWriter:
+    """
+    Appends JSON records to size-rotated segment files from a background thread.
+
+    ``write`` only enqueues; the thread serializes and writes in batches of up
+    to ``batch_size`` records or every ``flush_interval`` seconds through one
+    open file handle. ``fsync`` is ``"never"``, ``"batch"`` (after every
+    written batch) or ``"close"``. Each segment gets a sidecar index (see
+    ``index_path``) and, with ``compress``, is gzipped once rotated out.
+    Pending records are written on ``close``, at interpreter exit and on
+    SIGTERM/SIGBREAK.
+    """
+
+    def __init__(
+        self,
+        base: Path,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        fsync: str = "close",
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        max_queue: int = 100_000,
+        compress: bool = False,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.base = base
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self.logger = logging.getLogger(__name__)
+        self.segment = 0
+        self.records_written = 0
+        self.batches_written = 0
+        self._file: Optional[BinaryIO] = None
+        self._index: Optional[TextIO] = None
+        self._size = 0
+        # A full queue blocks the caller rather than dropping records.
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"jsonl-writer-{base.name[:8]}", daemon=True)
+        self._thread.start()
+        _live_writers.add(self)
+        _install_signal_handlers()
+        atexit.register(self.close)
+
+    @property
+    def path(self) -> Path:
+        return segment_path(self.base, self.segment)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self._closed:
+            raise ValueError("writer is closed")
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until everything enqueued so far is written; returns False on timeout."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        _live_writers.discard(self)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"records": self.records_written, "batches": self.batches_written, "segments": self.segment + 1, "queued": self._queue.qsize()}
+
+    def _run(self) -> None:
+        batch: List[Dict[str, Any]] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                item = None
+            if isinstance(item, dict):
+                batch.append(item)
+                if len(batch) < self.batch_size and time.monotonic() < deadline:
+                    continue
+            self._write_batch(batch)
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                self._close_file(sync=self.fsync != "never")
+                return
+
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        try:
+            for record in batch:
+                line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+                size = len(line.encode("utf-8"))
+                if self._file is not None and self._size and self._size + size > self.max_segment_bytes:
+                    rotated = self.path
+                    self._close_file(sync=self.fsync != "never")
+                    self.segment += 1
+                    if self.compress:
+                        _gzip(rotated)
+                if self._file is None:
+                    # Binary mode so ``_size`` is a byte offset usable by the index.
+                    self._file = self.path.open("ab")
+                    self._index = index_path(self.path).open("a", encoding="utf-8")
+                    self._size = self.path.stat().st_size
+                self._index.write(json.dumps([record.get("step_index"), record.get("kind"), self._size]) + "\n")
+                self._file.write(line.encode("utf-8"))
+                self._size += size
+            self._file.flush()
+            self._index.flush()
+            if self.fsync == "batch":
+                os.fsync(self._file.fileno())
+            self.records_written += len(batch)
+            self.batches_written += 1
+        except Exception as exc:
+            # The writer thread must survive a bad record or a full disk; the run keeps going.
+            self.logger.warning("Dropped %d log records: %s", len(batch), exc)
+
+    def _close_file(self, sync: bool) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            if sync:
+                os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+            self._index.close()
+            self._file = self._index = None
+            self._size = 0
+
+
+def _gzip(path: Path) -> None:
+    target = path.with_name(path.name + ".gz")
+    with path.open("rb") as source, gzip.open(target, "wb") as sink:
+        shutil.copyfileobj(source, sink)
+    os.remove(path)
+
+
+def _install_signal_handlers() -> None:
+    """Close live writers before SIGTERM (SIGBREAK on Windows) ends the process, then defer to the previous handler."""
+    global _signals_installed
+    if _signals_installed or threading.current_thread() is not threading.main_thread():
+        return
+    _signals_installed = True
+    for name in ("SIGTERM", "SIGBREAK"):
+        signum = getattr(signal, name, None)
+        if signum is None:
+            continue
+        previous = signal.getsignal(signum)
+
+        def handler(received, frame, previous=previous):
+            for writer in list(_live_writers):
+                writer.close()
+            if callable(previous):
+                previous(received, frame)
+            elif previous != signal.SIG_IGN:
+                raise SystemExit(128 + received)
+
+        try:
+            signal.signal(signum, handler)
+        except (ValueError, OSError):
+            continue
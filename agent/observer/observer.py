@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import importlib
+import itertools
 import logging
 import platform
 from pathlib import Path
 import time
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from agent.state.models import ElementState, Observation, OCRSpan, WindowInfo
 
@@ -13,13 +14,17 @@ logger = logging.getLogger(__name__)
 
 
 class Observer:
-    def __init__(self, screenshotter: Optional[callable] = None, ocr_reader: Optional[callable] = None, screenshot_dir: Path | str = Path("screenshots"), enable_screenshots: bool = True, enable_ocr: bool = True, max_depth: int = 4):
+    def __init__(self, screenshotter: Optional[callable] = None, ocr_reader: Optional[callable] = None, screenshot_dir: Path | str = Path("screenshots"), enable_screenshots: bool = True, enable_ocr: bool = True, max_depth: int = 4, group_min_run: int = 40, group_margin: int = 5):
         self.screenshotter = screenshotter
         self.ocr_reader = ocr_reader
         self.screenshot_dir = Path(screenshot_dir)
         self.enable_screenshots = enable_screenshots
         self.enable_ocr = enable_ocr
         self.max_depth = max_depth
+        self.group_min_run = group_min_run
+        self.group_margin = group_margin
+        # Sibling runs summarized in the latest snapshot, keyed by the summary node's backend_ref.
+        self._groups: Dict[str, Tuple[Sequence[Any], int, int, str, int]] = {}
         self.screenshot_dir.mkdir(parents=True, exist_ok=True)
         self._platform = platform.system().lower()
 
@@ -59,6 +64,7 @@ class Observer:
                 bbox=(rect.left, rect.top, rect.right, rect.bottom),
                 platform=self._platform,
                 warnings=warnings,
+                class_name=getattr(active, "class_name", lambda: None)(),
             )
         except Exception as exc:
             warnings.append(f"Unable to resolve foreground window: {exc}")
@@ -80,6 +86,7 @@ class Observer:
         try:
             desktop = self._pywinauto_desktop()
             wrapper = desktop.window(handle=window.hwnd).wrapper_object() if window.hwnd else desktop.active()
+            self._groups = {}
             return self._serialize_wrapper(wrapper, depth=0, parent_chain="root")
         except Exception as exc:
             warnings.append(f"UIA snapshot failed: {exc}")
@@ -102,18 +109,132 @@ class Observer:
             "children": [],
             "parent_chain": parent_chain,
             "backend_ref": ref,
+            "access_key": self._uia_property(info, "CurrentAccessKey"),
+            "accelerator_key": self._uia_property(info, "CurrentAcceleratorKey"),
         }
+        if depth + 1 > self.max_depth:
+            return node
         children: Sequence[Any] = []
         try:
             children = getattr(wrapper, "children", lambda: [])()
         except Exception:
             children = []
-        for idx, child in enumerate(children):
-            child_serialized = self._serialize_wrapper(child, depth + 1, f"{parent_chain}.{idx}")
-            if child_serialized:
-                node["children"].append(child_serialized)
+        roles = [self._child_role(child) for child in children] if len(children) >= self.group_min_run else [None] * len(children)
+        start = 0
+        for role, run in itertools.groupby(roles):
+            end = start + len(list(run))
+            if role is not None and end - start >= self.group_min_run:
+                node["children"].extend(self._serialize_group(children, start, end, role, bbox, depth + 1, parent_chain))
+            else:
+                for idx in range(start, end):
+                    child_serialized = self._serialize_wrapper(children[idx], depth + 1, f"{parent_chain}.{idx}")
+                    if child_serialized:
+                        node["children"].append(child_serialized)
+            start = end
         return node
 
+    def expand_group(self, group_ref: str, automation_id: Optional[str] = None, name: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Serialize items of a summarized run from the latest snapshot whose
+        automation id equals ``automation_id`` or whose name contains ``name``.
+        """
+        entry = self._groups.get(group_ref)
+        if entry is None or not (automation_id or name):
+            return []
+        children, start, end, parent_chain, depth = entry
+        needle = (name or "").lower()
+        nodes: List[Dict[str, Any]] = []
+        for idx in range(start, end):
+            info = getattr(children[idx], "element_info", None)
+            if automation_id and getattr(info, "automation_id", None) != automation_id:
+                continue
+            if needle and needle not in (getattr(info, "name", None) or "").lower():
+                continue
+            serialized = self._serialize_wrapper(children[idx], depth, f"{parent_chain}.{idx}")
+            if serialized:
+                nodes.append(serialized)
+            if len(nodes) >= limit:
+                break
+        return nodes
+
+    def _serialize_group(self, children: Sequence[Any], start: int, end: int, role: str, bbox: Optional[Sequence[int]], depth: int, parent_chain: str) -> List[Dict[str, Any]]:
+        """Serialize the on-screen part of a long same-role run plus ``group_margin`` neighbours, then a summary node."""
+        first, stop = self._visible_range(children, start, end, bbox)
+        low, high = max(start, first - self.group_margin), min(end, stop + self.group_margin)
+        nodes = []
+        for idx in range(low, high):
+            child_serialized = self._serialize_wrapper(children[idx], depth, f"{parent_chain}.{idx}")
+            if child_serialized:
+                nodes.append(child_serialized)
+        group_chain = f"{parent_chain}.{start}-{end}"
+        ref = f"group|{role}|{group_chain}"
+        showing = f"showing {first - start + 1}-{stop - start}" if stop > first else "none on screen"
+        nodes.append(
+            {
+                "name": f"{end - start} {role} items, {showing}",
+                "role": "item_group",
+                "automation_id": None,
+                "class_name": None,
+                "bbox": bbox,
+                "states": [],
+                "children": [],
+                "parent_chain": group_chain,
+                "backend_ref": ref,
+                "group": {"role": role, "total": end - start, "visible": [first - start, stop - start], "serialized": [low - start, high - start]},
+            }
+        )
+        self._groups[ref] = (children, start, end, parent_chain, depth)
+        return nodes
+
+    def _visible_range(self, children: Sequence[Any], start: int, end: int, bbox: Optional[Sequence[int]]) -> Tuple[int, int]:
+        """
+        Half-open index range of run items overlapping the container
+        vertically; ``(start, start)`` when none do.
+
+        Items are assumed to be laid out in order, so two binary searches read
+        O(log n) rectangles instead of one per item.
+        """
+        if not bbox:
+            return start, start
+        top, bottom = bbox[1], bbox[3]
+
+        def edges(idx: int) -> Tuple[int, int]:
+            item_box = self._rect_to_bbox(getattr(getattr(children[idx], "element_info", None), "rectangle", None))
+            return (item_box[1], item_box[3]) if item_box else (bottom, bottom)
+
+        low, high = start, end
+        while low < high:
+            mid = (low + high) // 2
+            if edges(mid)[1] > top:
+                high = mid
+            else:
+                low = mid + 1
+        first = low
+        low, high = first, end
+        while low < high:
+            mid = (low + high) // 2
+            if edges(mid)[0] < bottom:
+                low = mid + 1
+            else:
+                high = mid
+        if low <= first:
+            return start, start
+        return first, low
+
+    def _child_role(self, wrapper: Any) -> Optional[str]:
+        try:
+            return getattr(getattr(wrapper, "element_info", None), "control_type", None)
+        except Exception:
+            return None
+
+    def _uia_property(self, info: Any, name: str) -> Optional[str]:
+        # pywinauto's UIAElementInfo keeps the raw IUIAutomationElement on ``element``.
+        try:
+            value = getattr(getattr(info, "element", None), name, None)
+        except Exception:
+            return None
+        return value or None
+
     def _wrapper_states(self, wrapper: Any) -> List[ElementState]:
         states: List[ElementState] = []
         checks = [
@@ -134,6 +255,12 @@ class Observer:
                     states.append(state)
             except Exception:
                 continue
+        try:
+            # ExpandCollapseState: 0 collapsed, 1 expanded, 2 partially expanded, 3 leaf.
+            if wrapper.get_expand_state() == 1:
+                states.append(ElementState.EXPANDED)
+        except Exception:
+            pass
         return states
 
     def _rect_to_bbox(self, rect: Any) -> Optional[Sequence[int]]:
@@ -4,7 +4,7 @@ import time
 from typing import Any, Dict, List, Optional, Sequence
 
 from agent.perception.hashing import frame_signature, stable_element_id, screen_signature_hash
-from agent.state.models import ElementState, Observation, OCRSpan, TargetSource, UIElement, UIState, WindowInfo
+from agent.state.models import ElementGroup, ElementState, Observation, OCRSpan, TargetSource, UIElement, UIState, WindowInfo
 
 
 class UICompressor:
@@ -31,6 +31,13 @@ class UICompressor:
             derived_from="uia+ocr" if observation.raw_tree else "ocr",
         )
 
+    def elements_from_nodes(self, nodes: Sequence[Dict[str, Any]], window: WindowInfo, parents: Sequence[str]) -> List[UIElement]:
+        """Convert serialized nodes produced outside a full snapshot, e.g. an expanded item group."""
+        elements: List[UIElement] = []
+        for node in nodes:
+            elements.extend(self._elements_from_tree(node, window, parents))
+        return elements
+
     def _elements_from_tree(self, node: Dict[str, Any], window: WindowInfo, parents: Sequence[str]) -> List[UIElement]:
         elements: List[UIElement] = []
         element_id = stable_element_id(window, node.get("role"), node.get("name"), node.get("automation_id"), node.get("bbox"), node.get("parent_chain"))
@@ -49,6 +56,9 @@ class UICompressor:
             near_text=node.get("near_text"),
             salience=self._salience_score(node, states),
             backend_ref=node.get("backend_ref"),
+            access_key=node.get("access_key"),
+            accelerator_key=node.get("accelerator_key"),
+            group=self._coerce_group(node.get("group")),
         )
         elements.append(element)
         for child in node.get("children", []):
@@ -93,6 +103,11 @@ class UICompressor:
                     continue
         return normalized
 
+    def _coerce_group(self, group: Optional[Dict[str, Any]]) -> Optional[ElementGroup]:
+        if not group:
+            return None
+        return ElementGroup(role=group.get("role"), total=int(group.get("total", 0)), visible=tuple(group.get("visible", (0, 0))), serialized=tuple(group.get("serialized", (0, 0))))
+
     def _prioritize(self, elements: List[UIElement]) -> List[UIElement]:
         sorted_elements = sorted(
             elements,
@@ -151,4 +166,7 @@ class UICompressor:
         score += min(len(name) / 20.0, 1.0)
         if node.get("automation_id"):
             score += 0.5
+        if node.get("group"):
+            # Rank summaries above the items they stand for; they are the only handle on the off-screen ones.
+            score += 3.0
         return score
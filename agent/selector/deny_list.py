@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+def normalize(text: str) -> str:
+    """Case-fold and collapse runs of whitespace so "Delete\\u00a0 Account" matches "delete account"."""
+    return " ".join(text.casefold().split())
+
+
+class DenyListMatcher:
+    """
+    Aho-Corasick automaton over a deny list, built once.
+
+    ``search`` reports whether any term occurs as a substring of the
+    normalized text in a single pass, independent of the number of terms.
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: List[str] = sorted({normalize(term) for term in terms if term and term.strip()})
+        self._goto: List[Dict[str, int]] = [{}]
+        # Index into ``terms`` of a term ending at each node, directly or through its failure chain.
+        self._output: List[Optional[int]] = [None]
+        self._fail: List[int] = [0]
+        for index, term in enumerate(self.terms):
+            node = 0
+            for char in term:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._output.append(None)
+                    self._fail.append(0)
+                node = nxt
+            if self._output[node] is None:
+                self._output[node] = index
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def search(self, text: Optional[str]) -> Optional[str]:
+        """Return the first deny-list term found in ``text``, or ``None``."""
+        if not text or not self.terms:
+            return None
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for char in normalize(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node] is not None:
+                return self.terms[output[node]]
+        return None
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                state = self._fail[node]
+                while state and char not in self._goto[state]:
+                    state = self._fail[state]
+                self._fail[child] = self._goto[state].get(char, 0)
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
@@ -3,46 +3,56 @@ from __future__ import annotations
 import logging
 from typing import Iterable, Optional, Set
 
-from agent.state.models import ActionVerb, IntentAction, SafetyLevel, WorkingMemory
+from agent.selector.deny_list import DenyListMatcher
+from agent.state.models import ActionVerb, IntentAction, SafetyLevel, UIElement, WorkingMemory
 
 
 class Selector:
     def __init__(self, allow_verbs: Optional[Iterable[ActionVerb]] = None, deny_text: Optional[Iterable[str]] = None, safety_level: SafetyLevel = SafetyLevel.NORMAL, max_actions: int = 100):
         self.allow_verbs: Optional[Set[ActionVerb]] = set(allow_verbs) if allow_verbs else None
-        self.deny_text = {t.lower() for t in deny_text} if deny_text else {"purchase", "checkout", "delete account"}
+        self.deny_list = DenyListMatcher(deny_text if deny_text else ("purchase", "checkout", "delete account"))
         self.safety_level = safety_level
         self.max_actions = max_actions
         self._action_counter = 0
         self.logger = logging.getLogger(__name__)
 
-    def gate(self, intent: IntentAction, memory: WorkingMemory) -> IntentAction:
+    def gate(self, intent: IntentAction, memory: WorkingMemory, element: Optional[UIElement] = None) -> IntentAction:
         self._action_counter += 1
         if self._action_counter > self.max_actions:
             raise ValueError("Rate limit exceeded for actions")
-        if self.allow_verbs and intent.verb not in self.allow_verbs:
-            raise ValueError(f"Action {intent.verb.value} not in allowlist")
-        if self._is_forbidden(intent):
+        violation = self._violation(intent, memory, element)
+        if violation:
+            raise ValueError(violation)
+        self.logger.debug("Selector passed intent %s (safety=%s)", intent.verb, self.safety_level.value)
+        return intent
+
+    def admissible(self, intent: IntentAction, memory: WorkingMemory, element: Optional[UIElement] = None) -> bool:
+        """Side-effect free check used to screen candidates before one is gated."""
+        return self._violation(intent, memory, element) is None
+
+    def gate_element(self, element: Optional[UIElement]) -> None:
+        """Deny-list check for a target grounded after its intent was gated, e.g. one chosen by element_id."""
+        if self._is_forbidden(None, element):
             raise ValueError("Blocked dangerous action")
+
+    def _violation(self, intent: IntentAction, memory: WorkingMemory, element: Optional[UIElement] = None) -> Optional[str]:
+        if self.allow_verbs and intent.verb not in self.allow_verbs:
+            return f"Action {intent.verb.value} not in allowlist"
+        if self._is_forbidden(intent, element):
+            return "Blocked dangerous action"
         if self._is_high_safety(memory):
             if intent.verb in {ActionVerb.OPEN_URL, ActionVerb.RIGHT_CLICK}:
-                raise ValueError("Action forbidden under high safety policy")
+                return "Action forbidden under high safety policy"
             if intent.verb == ActionVerb.SCROLL and not self._is_scroll_allowed(intent):
-                raise ValueError("Scroll forbidden under high safety policy")
-        self.logger.debug("Selector passed intent %s (safety=%s)", intent.verb, self.safety_level.value)
-        return intent
+                return "Scroll forbidden under high safety policy"
+        return None
 
-    def _is_forbidden(self, intent: IntentAction) -> bool:
-        target_texts = [
-            intent.target.name_contains if intent.target else None,
-            intent.target.name_equals if intent.target else None,
-        ]
-        for text in target_texts:
-            if not text:
-                continue
-            lowered = text.lower()
-            if any(term in lowered for term in self.deny_text):
-                return True
-        return False
+    def _is_forbidden(self, intent: Optional[IntentAction], element: Optional[UIElement] = None) -> bool:
+        target = intent.target if intent else None
+        texts = [target.name_contains, target.name_equals, target.near_text] if target else []
+        if element is not None:
+            texts.extend((element.name, element.value, element.near_text))
+        return any(self.deny_list.search(text) for text in texts if text)
 
     def _is_high_safety(self, memory: WorkingMemory) -> bool:
         return self.safety_level == SafetyLevel.HIGH or memory.risk_mode == "high"
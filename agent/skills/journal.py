@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class StatsJournal:
+    """
+    Append-only journal for procedure statistics.
+
+    Results are buffered and appended to ``<state>.journal`` in batches; the
+    journal is periodically folded into the snapshot at ``state_path`` with an
+    atomic replace. Appends and compactions take an inter-process file lock so
+    several agents can share one state directory.
+
+    Only counts are journaled. Statuses derive from the merged counts, since
+    each process only sees its own share of the results.
+
+    Compaction first renames the journal to ``<state>.journal.<generation>``
+    and records that generation in the snapshot, so a crash between the
+    replace and deleting the rotated file cannot count entries twice.
+    """
+
+    def __init__(self, state_path: Path, batch_size: int = 16, flush_interval: float = 1.0, compact_every: int = 512):
+        self.state_path = state_path
+        self.journal_path = state_path.with_name(state_path.name + ".journal")
+        self.lock_path = state_path.with_name(state_path.name + ".lock")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        self.logger = logging.getLogger(__name__)
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._appended_since_compaction = 0
+        atexit.register(self.flush)
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        with self._locked():
+            return self._replay()
+
+    def append(self, name: str, success: bool) -> None:
+        self._buffer.append({"name": name, "success": success, "ts": time.time(), "pid": os.getpid()})
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._write_buffer():
+            return
+        if self._appended_since_compaction >= self.compact_every or not self.state_path.exists():
+            self.compact()
+
+    def close(self) -> None:
+        """Flush and drop the exit hook, which would otherwise keep this instance alive until exit."""
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def compact(self) -> Dict[str, Dict[str, Any]]:
+        """Fold the journal into the snapshot and return the merged state."""
+        self._write_buffer()
+        with self._locked():
+            generation = max([self._read_snapshot()[0], *self._rotated()]) + 1
+            if self.journal_path.exists():
+                os.replace(self.journal_path, self.rotated_path(generation))
+            self.journal_path.touch()
+            merged = self._replay()
+            tmp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                f.write(json.dumps({"generation": generation, "procedures": merged}))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_path)
+            for folded in self._rotated():
+                if folded <= generation:
+                    self.rotated_path(folded).unlink(missing_ok=True)
+        self._appended_since_compaction = 0
+        return merged
+
+    def _write_buffer(self) -> bool:
+        if not self._buffer:
+            return False
+        lines = "".join(json.dumps(entry) + "\n" for entry in self._buffer)
+        with self._locked():
+            if self._has_torn_tail():
+                lines = "\n" + lines
+            with self.journal_path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        self._appended_since_compaction += len(self._buffer)
+        self._buffer.clear()
+        self._last_flush = time.monotonic()
+        return True
+
+    def _has_torn_tail(self) -> bool:
+        try:
+            with self.journal_path.open("rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def rotated_path(self, generation: int) -> Path:
+        return self.journal_path.with_name(f"{self.journal_path.name}.{generation}")
+
+    def _rotated(self) -> List[int]:
+        prefix = self.journal_path.name + "."
+        return sorted(int(path.name[len(prefix):]) for path in self.journal_path.parent.glob(prefix + "*") if path.name[len(prefix):].isdigit())
+
+    def _read_snapshot(self) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """The folded generation and the merged stats; snapshots written before generations are a bare mapping."""
+        if not self.state_path.exists():
+            return 0, {}
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            self.logger.warning("Skill snapshot unreadable, replaying journal only: %s", exc)
+            return 0, {}
+        if isinstance(data.get("generation"), int) and isinstance(data.get("procedures"), dict):
+            return data["generation"], data["procedures"]
+        return 0, data
+
+    def _replay(self) -> Dict[str, Dict[str, Any]]:
+        generation, state = self._read_snapshot()
+        pending = [self.rotated_path(rotated) for rotated in self._rotated() if rotated > generation]
+        for path in pending + [self.journal_path]:
+            if path.exists():
+                self._apply(path, state)
+        return state
+
+    @staticmethod
+    def _apply(path: Path, state: Dict[str, Dict[str, Any]]) -> None:
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn tail from a crash mid-append; later complete lines are still applied.
+                    continue
+                meta = state.setdefault(entry["name"], {"runs": 0, "successes": 0, "failures": 0})
+                meta["runs"] = meta.get("runs", 0) + 1
+                key = "successes" if entry.get("success") else "failures"
+                meta[key] = meta.get(key, 0) + 1
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a+b") as handle:
+            _lock_file(handle)
+            try:
+                yield
+            finally:
+                _unlock_file(handle)
+
+
+def _lock_file(handle: Any) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        handle.seek(0)
+        while True:
+            try:
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    import fcntl
+
+    fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(handle: Any) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        return
+    import fcntl
+
+    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
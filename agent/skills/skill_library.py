@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-import json
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
+from agent.skills.journal import StatsJournal
 from agent.state.models import ActionVerb, IntentAction, IntentTarget, UIState, WorkingMemory
 
 
@@ -40,14 +40,17 @@ class Procedure:
 
 
 class SkillLibrary:
-    def __init__(self, state_path: Optional[Path] = None):
+    def __init__(self, state_path: Optional[Path] = None, journal: Optional[StatsJournal] = None):
         self.state_path = state_path
+        self.journal = journal or (StatsJournal(state_path) if state_path else None)
         self.procedures: Dict[str, Procedure] = {}
+        self._base_status: Dict[str, str] = {}
         self._register_defaults()
         self._load_state()
 
     def register(self, procedure: Procedure) -> None:
         self.procedures[procedure.name] = procedure
+        self._base_status[procedure.name] = procedure.status
 
     def _register_defaults(self) -> None:
         confirm_ok = Procedure(
@@ -85,7 +88,10 @@ class SkillLibrary:
         for procedure in self.procedures.values():
             if self._matches_context(procedure, ui_state, memory):
                 if procedure.steps:
-                    return procedure.steps[0].intent
+                    step = procedure.steps[0]
+                    if step.checkpoint and step.checkpoint.expected_change and not step.intent.expect:
+                        return replace(step.intent, expect=step.checkpoint.expected_change)
+                    return step.intent
         return None
 
     def record_result(self, procedure_name: str, success: bool) -> None:
@@ -98,7 +104,31 @@ class SkillLibrary:
         else:
             procedure.stats.failures += 1
         self._update_status(procedure)
-        self._persist_state()
+        if self.journal:
+            self.journal.append(procedure_name, success)
+
+    def flush(self) -> None:
+        if self.journal:
+            self.journal.flush()
+
+    def close(self) -> None:
+        if self.journal:
+            self.journal.close()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"runs": p.stats.runs, "successes": p.stats.successes, "failures": p.stats.failures, "status": p.status}
+            for name, p in self.procedures.items()
+        }
+
+    def restore(self, data: Dict[str, Dict[str, Any]]) -> None:
+        """Adopt stats and statuses from a ``snapshot``, e.g. one recorded with a run."""
+        self._apply_state(data)
+
+    def compact(self) -> None:
+        """Fold the shared journal into the snapshot and adopt the merged totals."""
+        if self.journal:
+            self._apply_state(self.journal.compact())
 
     def _matches_context(self, procedure: Procedure, ui_state: UIState, memory: WorkingMemory) -> bool:
         if procedure.status not in {"trusted", "trial"}:
@@ -114,37 +144,29 @@ class SkillLibrary:
         return True
 
     def _update_status(self, procedure: Procedure) -> None:
-        if procedure.stats.successes >= 3 and procedure.stats.failures == 0:
+        """Status is a function of the counts alone, so merged stats from several processes give one answer."""
+        stats = procedure.stats
+        if stats.successes >= 3 and stats.failures == 0:
             procedure.status = "trusted"
-        elif procedure.stats.failures >= 3 and procedure.stats.failures >= procedure.stats.successes:
+        elif stats.failures >= 3 and stats.failures >= stats.successes:
             procedure.status = "degraded"
-
-    def _persist_state(self) -> None:
-        if not self.state_path:
-            return
-        payload = {
-            name: {
-                "runs": p.stats.runs,
-                "successes": p.stats.successes,
-                "failures": p.stats.failures,
-                "status": p.status,
-            }
-            for name, p in self.procedures.items()
-        }
-        self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        self.state_path.write_text(json.dumps(payload), encoding="utf-8")
+        else:
+            procedure.status = self._base_status.get(procedure.name, procedure.status)
 
     def _load_state(self) -> None:
-        if not self.state_path or not self.state_path.exists():
+        if not self.journal:
             return
         try:
-            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            data = self.journal.load()
         except Exception:
             return
+        self._apply_state(data)
+
+    def _apply_state(self, data: Dict[str, Dict[str, Any]]) -> None:
         for name, meta in data.items():
             if name in self.procedures:
                 proc = self.procedures[name]
                 proc.stats.runs = meta.get("runs", proc.stats.runs)
                 proc.stats.successes = meta.get("successes", proc.stats.successes)
                 proc.stats.failures = meta.get("failures", proc.stats.failures)
-                proc.status = meta.get("status", proc.status)
+                self._update_status(proc)
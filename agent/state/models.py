@@ -4,7 +4,7 @@ import hashlib
 import time
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 class ActionVerb(str, Enum):
@@ -14,6 +14,7 @@ class ActionVerb(str, Enum):
     TYPE = "type"
     KEYPRESS = "keypress"
     SCROLL = "scroll"
+    FIND_IN_CONTAINER = "find_in_container"
     WAIT = "wait"
     FOCUS_WINDOW = "focus_window"
     OPEN_URL = "open_url"
@@ -35,6 +36,7 @@ class ElementState(str, Enum):
     CHECKED = "checked"
     SELECTED = "selected"
     OFFSCREEN = "offscreen"
+    EXPANDED = "expanded"
 
 
 class ExecutionMethod(str, Enum):
@@ -73,6 +75,7 @@ class WindowInfo:
     bbox: Optional[Sequence[int]]
     platform: Optional[str] = None
     warnings: Sequence[str] = field(default_factory=list)
+    class_name: Optional[str] = None
 
     @property
     def fingerprint(self) -> str:
@@ -80,6 +83,16 @@ class WindowInfo:
         return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
 
 
+@dataclass(frozen=True)
+class ElementGroup:
+    """Summary of a long run of same-role siblings; ranges are item indices within the run, end exclusive."""
+
+    role: Optional[str]
+    total: int
+    visible: Tuple[int, int]
+    serialized: Tuple[int, int]
+
+
 @dataclass(frozen=True)
 class UIElement:
     element_id: str
@@ -95,6 +108,9 @@ class UIElement:
     near_text: Optional[str] = None
     salience: float = 0.0
     backend_ref: Optional[str] = None
+    access_key: Optional[str] = None
+    accelerator_key: Optional[str] = None
+    group: Optional[ElementGroup] = None
 
 
 @dataclass(frozen=True)
@@ -143,6 +159,10 @@ class IntentAction:
     key: Optional[str] = None
     amount: Optional[int] = None
     wait_seconds: Optional[float] = None
+    # Follow-up actions grounded against the same state and run without re-observing.
+    then: Tuple["IntentAction", ...] = ()
+    # Expected effect, e.g. "target_gone" or a checkpoint phrase such as "dialog dismissed".
+    expect: Optional[str] = None
 
 
 @dataclass(frozen=True)
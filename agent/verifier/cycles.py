@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, Hashable, List, Optional, Tuple
+
+
+class CycleDetector:
+    """
+    Detects a step history that keeps repeating itself.
+
+    Each step pushes a token (the resulting screen signature plus the intent
+    that produced it) into a bounded ring. ``last_seen`` maps tokens to their
+    latest position, so a new token yields its only candidate period in O(1)
+    and at most ``max_cycle * repeats`` comparisons confirm it.
+    """
+
+    def __init__(self, max_cycle: int = 4, repeats: int = 2, history: int = 64):
+        if max_cycle < 2 or repeats < 2:
+            raise ValueError("max_cycle and repeats must be at least 2")
+        self.max_cycle = max_cycle
+        self.repeats = repeats
+        self._ring: Deque[Tuple[int, Hashable]] = deque(maxlen=max(history, max_cycle * repeats))
+        self._last_seen: Dict[Hashable, int] = {}
+        self._position = 0
+
+    def push(self, token: Hashable) -> Optional[List[Hashable]]:
+        """Record ``token``; returns one period of the cycle when the last steps repeat it ``repeats`` times."""
+        if len(self._ring) == self._ring.maxlen:
+            position, evicted = self._ring[0]
+            if self._last_seen.get(evicted) == position:
+                del self._last_seen[evicted]
+        previous = self._last_seen.get(token)
+        self._ring.append((self._position, token))
+        self._last_seen[token] = self._position
+        self._position += 1
+        if previous is None:
+            return None
+        period = self._position - 1 - previous
+        span = period * self.repeats
+        if period < 2 or period > self.max_cycle or span > len(self._ring):
+            return None
+        ring = self._ring
+        if all(ring[-k][1] == ring[-k - period][1] for k in range(1, span - period + 1)):
+            return [ring[-k][1] for k in range(period, 0, -1)]
+        return None
+
+    def reset(self) -> None:
+        self._ring.clear()
+        self._last_seen.clear()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, List, Optional
+
+from agent.executor.accelerators import foreground_window_handle
+from agent.state.models import ActionVerb, GroundedTarget, IntentAction, UIElement, WindowInfo
+
+
+class ExpectationKind(str, Enum):
+    TARGET_GONE = "target_gone"
+    VALUE_SET = "value_set"
+    WINDOW_CHANGED = "window_changed"
+    FOCUS_MOVED = "focus_moved"
+
+
+@dataclass(frozen=True)
+class Expectation:
+    kind: ExpectationKind
+    element: Optional[UIElement] = None
+    value: Optional[str] = None
+    before: Optional[str] = None
+
+
+# Phrases used by ProcedureCheckpoint.expected_change and LLM proposals, checked in order.
+_PHRASES = (
+    (ExpectationKind.TARGET_GONE, ("dismiss", "closed", "disappear", "gone", "removed")),
+    (ExpectationKind.WINDOW_CHANGED, ("window", "dialog open", "appears", "opened")),
+    (ExpectationKind.FOCUS_MOVED, ("focus",)),
+    (ExpectationKind.VALUE_SET, ("value", "text entered", "filled")),
+)
+
+
+def expectation_kind(expect: Optional[str]) -> Optional[ExpectationKind]:
+    if not expect:
+        return None
+    text = expect.strip().lower()
+    try:
+        return ExpectationKind(text)
+    except ValueError:
+        pass
+    for kind, phrases in _PHRASES:
+        if any(phrase in text for phrase in phrases):
+            return kind
+    return None
+
+
+def expectations_for(intent: IntentAction, grounded: Optional[GroundedTarget]) -> List[Expectation]:
+    """
+    Expected effects of ``intent``: an explicit ``intent.expect`` wins, otherwise
+    the verb's default. An empty list means only a full re-observation can tell.
+    """
+    element = grounded.element if grounded else None
+    kind = expectation_kind(intent.expect)
+    if kind is None:
+        if intent.verb == ActionVerb.TYPE and intent.text:
+            kind = ExpectationKind.VALUE_SET
+        elif intent.verb == ActionVerb.CLOSE_DIALOG:
+            kind = ExpectationKind.TARGET_GONE if element else ExpectationKind.WINDOW_CHANGED
+        else:
+            return []
+    if kind != ExpectationKind.WINDOW_CHANGED and element is None:
+        return []
+    if kind == ExpectationKind.VALUE_SET and not intent.text:
+        return []
+    return [Expectation(kind=kind, element=element, value=intent.text if kind == ExpectationKind.VALUE_SET else None)]
+
+
+def with_baseline(expectations: List[Expectation], probe: "UIAProbe", window: WindowInfo) -> List[Expectation]:
+    """Record the pre-action value for VALUE_SET expectations; call before executing the action."""
+    return [
+        replace(e, before=probe.value(e.element, window)) if e.kind == ExpectationKind.VALUE_SET else e
+        for e in expectations
+    ]
+
+
+class UIAProbe:
+    """
+    Answers narrow questions about single elements or the foreground window.
+
+    Every method returns ``None`` when it cannot tell (no UIA, no backend ref,
+    provider error), which sends the step back to a full re-observation.
+    Element lookups wait at most ``lookup_timeout`` seconds, since the
+    verifier polls anyway.
+    """
+
+    def __init__(self, resolver: Any, focus_probe: Optional[callable] = None, available: Optional[bool] = None, lookup_timeout: float = 0.1):
+        self.resolver = resolver
+        self.lookup_timeout = lookup_timeout
+        self.focus_probe = focus_probe or foreground_window_handle
+        self.available = sys.platform.startswith("win") if available is None else available
+
+    def exists(self, element: UIElement, window: Optional[WindowInfo]) -> Optional[bool]:
+        """A failed lookup only counts as gone when the resolver can prove it; otherwise the probe cannot tell."""
+        if not self.available or not element.backend_ref:
+            return None
+        # A dead handle or a lookup that already came back empty answers without searching again.
+        if self.resolver.gone(element.backend_ref, window):
+            return False
+        if self._wrapper(element, window) is not None:
+            return True
+        return False if self.resolver.gone(element.backend_ref, window) else None
+
+    def value(self, element: UIElement, window: Optional[WindowInfo]) -> Optional[str]:
+        wrapper = self._wrapper(element, window)
+        if wrapper is None:
+            return None
+        for attr in ("get_value", "window_text"):
+            getter = getattr(wrapper, attr, None)
+            if callable(getter):
+                try:
+                    value = getter()
+                except Exception:
+                    continue
+                if isinstance(value, str):
+                    return value
+        return None
+
+    def focused(self, element: UIElement, window: Optional[WindowInfo]) -> Optional[bool]:
+        wrapper = self._wrapper(element, window)
+        try:
+            return bool(wrapper.has_keyboard_focus()) if wrapper is not None else None
+        except Exception:
+            return None
+
+    def foreground(self) -> Optional[int]:
+        return self.focus_probe() if self.available else None
+
+    def _wrapper(self, element: UIElement, window: Optional[WindowInfo]) -> Optional[Any]:
+        if not self.available or not element.backend_ref:
+            return None
+        return self.resolver.resolve(element.backend_ref, window, timeout=self.lookup_timeout)
+
+
+def check(expectation: Expectation, probe: UIAProbe, window: WindowInfo) -> Optional[bool]:
+    """True when the effect is observed, False when not (yet), None when the probe cannot tell."""
+    element = expectation.element
+    if expectation.kind == ExpectationKind.TARGET_GONE:
+        exists = probe.exists(element, window)
+        return None if exists is None else not exists
+    if expectation.kind == ExpectationKind.VALUE_SET:
+        # Without the pre-action value a field that already held the text would pass.
+        value = probe.value(element, window)
+        if value is None or expectation.before is None:
+            return None
+        value = value.replace("\r\n", "\n")
+        return expectation.value.replace("\r\n", "\n") in value and value != expectation.before.replace("\r\n", "\n")
+    if expectation.kind == ExpectationKind.FOCUS_MOVED:
+        return probe.focused(element, window)
+    foreground = probe.foreground()
+    if foreground is None or not window.hwnd:
+        return None
+    return foreground != window.hwnd
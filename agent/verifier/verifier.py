@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Any, Dict, Optional, Sequence
 
-from agent.state.models import Observation, UIState, VerificationResult, VerificationStatus
+from agent.state.models import IntentAction, Observation, UIState, VerificationResult, VerificationStatus
+from agent.verifier.cycles import CycleDetector
+from agent.verifier.expectations import Expectation, UIAProbe, check
 
 
 @dataclass
@@ -12,30 +15,94 @@ class VerificationContext:
     current_state: UIState
     observation: Observation
     stuck_threshold: int = 3
+    intent: Optional[IntentAction] = None
 
 
 class Verifier:
-    def __init__(self):
-        self._recent_signatures: List[str] = []
+    def __init__(
+        self,
+        probe_timeout: float = 1.0,
+        poll_interval: float = 0.05,
+        sleep: Optional[callable] = None,
+        clock: Optional[callable] = None,
+        max_cycle: int = 4,
+    ):
+        self.cycles = CycleDetector(max_cycle=max_cycle)
+        self._last_signature: Optional[str] = None
+        self._same_signature_run = 0
+        self.probe_timeout = probe_timeout
+        self.poll_interval = poll_interval
+        self.sleep = sleep or time.sleep
+        self.clock = clock or time.monotonic
+        self.probe_counts: Dict[str, int] = {"success": 0, "fail": 0, "inconclusive": 0}
+
+    def verify_expected(self, expectations: Sequence[Expectation], probe: UIAProbe, previous_state: UIState) -> Optional[VerificationResult]:
+        """
+        Check expected effects by probing only the affected elements or windows,
+        polling for up to ``probe_timeout`` while effects settle. Returns
+        ``None`` when any probe is inconclusive so the caller re-observes and
+        falls back to ``verify``.
+        """
+        if not expectations:
+            return None
+        deadline = self.clock() + self.probe_timeout
+        pending = list(expectations)
+        while True:
+            still_pending = []
+            for expectation in pending:
+                outcome = check(expectation, probe, previous_state.window)
+                if outcome is None:
+                    self.probe_counts["inconclusive"] += 1
+                    return None
+                if not outcome:
+                    still_pending.append(expectation)
+            pending = still_pending
+            if not pending:
+                self.probe_counts["success"] += 1
+                return VerificationResult(status=VerificationStatus.SUCCESS, failure_reason=None, guidance_delta=None, updated_focus_id=None)
+            if self.clock() + self.poll_interval > deadline:
+                break
+            self.sleep(self.poll_interval)
+        self.probe_counts["fail"] += 1
+        reason = f"expected {pending[0].kind.value} not observed"
+        return VerificationResult(status=VerificationStatus.FAIL, failure_reason=reason, guidance_delta="retry-different-target", updated_focus_id=None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"probe": dict(self.probe_counts)}
+
+    def track(self, state: UIState, intent: Optional[IntentAction] = None) -> Optional[VerificationResult]:
+        """
+        Feed the state observed after a probe-verified step into stuck and cycle
+        detection, which ``verify_expected`` skips. Returns a STUCK result or ``None``.
+        """
+        status, reason, guidance = self._detect_stuck(state.screen_signature, intent)
+        if status != VerificationStatus.STUCK:
+            return None
+        return VerificationResult(status=status, failure_reason=reason, guidance_delta=guidance, updated_focus_id=None)
 
     def verify(self, context: VerificationContext) -> VerificationResult:
-        status, reason = self._detect_stuck(context.current_state)
+        status, reason, guidance = self._detect_stuck(context.current_state.screen_signature, context.intent, context.stuck_threshold)
         if status == VerificationStatus.STUCK:
-            return VerificationResult(status=status, failure_reason=reason, guidance_delta="replan", updated_focus_id=None)
+            return VerificationResult(status=status, failure_reason=reason, guidance_delta=guidance, updated_focus_id=None)
         delta_status, guidance, failure = self._state_delta(context)
         focus_id = context.current_state.focused_element_id
         return VerificationResult(status=delta_status, failure_reason=failure, guidance_delta=guidance, updated_focus_id=focus_id)
 
-    def _detect_stuck(self, ui_state: UIState) -> tuple[VerificationStatus, Optional[str]]:
-        signature = ui_state.screen_signature
+    def _detect_stuck(
+        self, signature: Optional[str], intent: Optional[IntentAction], stuck_threshold: int = 3
+    ) -> tuple[VerificationStatus, Optional[str], Optional[str]]:
         if not signature:
-            return VerificationStatus.SUCCESS, None
-        self._recent_signatures.append(signature)
-        if len(self._recent_signatures) > 3:
-            self._recent_signatures.pop(0)
-        if len(self._recent_signatures) == 3 and len(set(self._recent_signatures)) == 1:
-            return VerificationStatus.STUCK, "screen signature unchanged"
-        return VerificationStatus.SUCCESS, None
+            return VerificationStatus.SUCCESS, None, None
+        self._same_signature_run = self._same_signature_run + 1 if signature == self._last_signature else 1
+        self._last_signature = signature
+        if self._same_signature_run >= stuck_threshold:
+            return VerificationStatus.STUCK, "screen signature unchanged", "replan"
+        cycle = self.cycles.push((signature, _intent_key(intent)))
+        if cycle:
+            # One action flipping between states should be avoided; distinct actions need a different plan.
+            guidance = "blacklist-intent" if len({intent for _, intent in cycle}) == 1 else "break-cycle"
+            return VerificationStatus.STUCK, f"cycle of {len(cycle)} steps repeated", guidance
+        return VerificationStatus.SUCCESS, None, None
 
     def _state_delta(self, context: VerificationContext) -> tuple[VerificationStatus, Optional[str], Optional[str]]:
         previous = context.previous_state
@@ -56,3 +123,9 @@ class Verifier:
             guidance = "focus-shift"
         status = VerificationStatus.FAIL if failure else VerificationStatus.SUCCESS
         return status, guidance, failure
+
+
+def _intent_key(intent: Optional[IntentAction]) -> Optional[tuple]:
+    if intent is None:
+        return None
+    return (intent.verb.value, intent.target, intent.text, intent.key, intent.amount)
@@ -0,0 +1,103 @@
+"""
+Compare item-container lookup with the scroll-and-probe fallback on a virtual list.
+
+    python -m benchmarks.container_search --rows 100000 --lookups 20
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from agent.executor.container_search import ContainerSearch
+
+
+@dataclass(frozen=True)
+class VirtualRow:
+    name: str
+    automation_id: str
+    index: int
+
+
+class VirtualListProvider:
+    """
+    Stand-in for a virtualized list control with ``rows`` items of which only
+    ``page_size`` are realized at a time. ``supports_lookup=False`` behaves
+    like a container without ItemContainerPattern.
+    """
+
+    def __init__(self, rows: int = 100_000, page_size: int = 30, supports_lookup: bool = True, page_delay: float = 0.0):
+        self.rows = rows
+        self.page_size = page_size
+        self.supports_lookup = supports_lookup
+        self.page_delay = page_delay
+        self.offset = 0
+        self.realized = 0
+        self._by_key: Dict[str, int] = {}
+        for index in range(rows):
+            self._by_key[self._name(index).lower()] = index
+            self._by_key[f"row-{index}"] = index
+
+    def find_item(self, query: str) -> Optional[VirtualRow]:
+        if not self.supports_lookup:
+            raise NotImplementedError("stand-in configured without item lookup")
+        index = self._by_key.get(query) if query.startswith("row-") else self._by_key.get(query.strip().lower())
+        return self._row(index) if index is not None else None
+
+    def items(self) -> List[VirtualRow]:
+        end = min(self.offset + self.page_size, self.rows)
+        self.realized += end - self.offset
+        return [self._row(index) for index in range(self.offset, end)]
+
+    def scroll_page(self) -> bool:
+        if self.offset + self.page_size >= self.rows:
+            return False
+        if self.page_delay:
+            time.sleep(self.page_delay)
+        self.offset += self.page_size
+        return True
+
+    def scroll_into_view(self, item: VirtualRow) -> None:
+        self.offset = max(0, min(item.index, self.rows - self.page_size))
+
+    def _row(self, index: int) -> VirtualRow:
+        return VirtualRow(name=self._name(index), automation_id=f"row-{index}", index=index)
+
+    @staticmethod
+    def _name(index: int) -> str:
+        return f"Invoice {index:06d}"
+
+
+def run(rows: int, lookups: int, page_delay: float, seed: int = 11) -> None:
+    rng = random.Random(seed)
+    targets = [VirtualListProvider._name(rng.randrange(rows)) for _ in range(lookups)]
+    for supports_lookup in (True, False):
+        search = ContainerSearch(max_pages=rows)
+        provider = VirtualListProvider(rows, supports_lookup=supports_lookup, page_delay=page_delay)
+        elapsed, pages, found = 0.0, 0, 0
+        for target in targets:
+            provider.offset = 0
+            result = search.find(provider, target)
+            elapsed += result.seconds
+            pages += result.pages
+            found += result.item is not None and provider.items()[0].name == target
+        label = "item lookup " if supports_lookup else "scroll+probe"
+        print(
+            f"{rows:>7} rows | {label} | {elapsed * 1000 / lookups:9.3f} ms/lookup"
+            f" | {pages / lookups:8.1f} pages/lookup (each was a full agent step before) | found {found}/{lookups}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=20)
+    parser.add_argument("--page-delay", type=float, default=0.0, help="Simulated seconds per scrolled page.")
+    args = parser.parse_args()
+    run(args.rows, args.lookups, args.page_delay)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare indexed grounding against the legacy full scan.
+
+    python -m benchmarks.grounding_index --sizes 1000 10000 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List
+
+from agent.grounding.grounder import Grounder
+from agent.state.models import ActionVerb, ElementState, IntentAction, IntentTarget, TargetSource, UIElement, UIState, WindowInfo
+
+WORDS = ["save", "open", "file", "edit", "view", "export", "report", "customer", "invoice", "settings", "cancel", "next", "print", "close", "help"]
+ROLES = ["button", "listitem", "text", "edit", "menuitem", "hyperlink"]
+
+
+def synthetic_state(size: int, seed: int = 7) -> UIState:
+    rng = random.Random(seed)
+    window = WindowInfo(hwnd=1, pid=1, exe_name="bench.exe", title="Bench", bbox=(0, 0, 1920, 1080), platform="windows", warnings=[])
+    elements: List[UIElement] = []
+    for i in range(size):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).title() + f" {i}"
+        if i % 97 == 0:
+            # Typos that share no trigram with their word but still fuzzy-match it.
+            name = f"Sbve {i}"
+        left, top = rng.randint(0, 1800), rng.randint(0, 1000)
+        elements.append(
+            UIElement(
+                element_id=f"el{i:06d}",
+                source=TargetSource.UIA,
+                role=rng.choice(ROLES),
+                name=name,
+                value=None,
+                automation_id=f"auto{i}" if i % 3 == 0 else None,
+                class_name=None,
+                bbox=(left, top, left + rng.randint(10, 200), top + rng.randint(10, 40)),
+                states=[ElementState.ENABLED],
+                parent_element_ids=[],
+                near_text=None,
+                salience=round(rng.random() * 4, 3),
+            )
+        )
+    return UIState(window=window, timestamp=0.0, elements=elements, focused_element_id=None, salient_text=[], screen_signature="bench")
+
+
+def synthetic_intents(size: int) -> List[IntentAction]:
+    return [
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="export report")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="invoce", role="button")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="save")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals=f"Save {size // 2}")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(automation_id=f"auto{(size // 3) * 3 - 3}")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(element_id=f"el{size - 1:06d}")),
+    ]
+
+
+def _ranking(grounded) -> List[tuple]:
+    return [(e.element_id, round(e.salience, 9)) for e in ([grounded.element] if grounded.element else []) + list(grounded.alternatives)]
+
+
+def _timed(grounder: Grounder, intents: List[IntentAction], state: UIState) -> tuple:
+    start = time.perf_counter()
+    results = [grounder.ground(intent, state) for intent in intents]
+    return results, (time.perf_counter() - start) * 1000
+
+
+def run(sizes: List[int]) -> None:
+    for size in sizes:
+        state = synthetic_state(size)
+        intents = synthetic_intents(size)
+        fuzzy = [i for i in intents if i.target.name_contains]
+        exact = [i for i in intents if not i.target.name_contains]
+        legacy, indexed = Grounder(use_index=False), Grounder()
+        expected_exact, legacy_exact_ms = _timed(legacy, exact, state)
+        expected_fuzzy, legacy_fuzzy_ms = _timed(legacy, fuzzy, state)
+        start = time.perf_counter()
+        indexed.index_for(state)
+        build_ms = (time.perf_counter() - start) * 1000
+        actual_exact, indexed_exact_ms = _timed(indexed, exact, state)
+        actual_fuzzy, indexed_fuzzy_ms = _timed(indexed, fuzzy, state)
+        same = all(_ranking(a) == _ranking(b) for a, b in zip(actual_exact + actual_fuzzy, expected_exact + expected_fuzzy))
+        print(
+            f"{size:>6} elements | exact: legacy {legacy_exact_ms:8.1f} ms  indexed {indexed_exact_ms:6.2f} ms"
+            f" | fuzzy: legacy {legacy_fuzzy_ms:8.1f} ms  indexed {indexed_fuzzy_ms:8.1f} ms"
+            f" | index build {build_ms:6.1f} ms | same ranking: {same}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    run(parser.parse_args().sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import argparse
+from pathlib import Path
 
 from agent.agent_loop import AgentConfig, AutomationAgent
 from agent.state.models import SafetyLevel
@@ -17,10 +18,29 @@ def main():
         ocr_binary=args.ocr_binary,
         llm_endpoint=args.llm_endpoint,
         llm_api_key=args.llm_api_key,
+        llm_timeout=args.llm_timeout,
+        llm_hedge=args.llm_hedge,
+        llm_step_deadline=args.llm_step_deadline,
+        enable_decision_cache=not args.disable_decision_cache,
+        speculative_llm=args.speculative_llm,
+        micropolicy_path=args.micropolicy_rules,
+        enable_anchors=not args.disable_anchors,
+        plan_focus_checks=args.plan_focus_checks,
+        execution_budget_seconds=args.execution_budget,
+        keyboard_accelerators=not args.disable_accelerators,
+        probe_verification=not args.disable_probe_verification,
+        max_cycle_length=args.max_cycle_length,
+        log_fsync=args.log_fsync,
+        log_segment_mb=args.log_segment_mb,
+        log_compress=args.log_compress,
+        record=args.record,
     )
     agent = AutomationAgent(config=config)
     agent.memory.goal = "Example goal: open an application window and click OK."
-    agent.run()
+    try:
+        agent.run()
+    finally:
+        agent.close()
 
 
 def _parse_args():
@@ -40,6 +60,22 @@ def _parse_args():
     parser.add_argument("--ocr-binary", help="Path to tesseract executable for OCR.")
     parser.add_argument("--llm-endpoint", help="HTTP endpoint for LLM proposals.")
     parser.add_argument("--llm-api-key", help="API key for LLM endpoint.")
+    parser.add_argument("--llm-timeout", type=float, default=10.0, help="Per-request deadline in seconds for LLM calls.")
+    parser.add_argument("--llm-hedge", action="store_true", help="Send a duplicate LLM request once the first exceeds the observed p95 latency.")
+    parser.add_argument("--llm-step-deadline", type=float, default=20.0, help="Overall budget in seconds for LLM retries within one step.")
+    parser.add_argument("--micropolicy-rules", type=Path, help="JSON file with deterministic micropolicy rules, merged over the built-in ok/next rules by name.")
+    parser.add_argument("--speculative-llm", action="store_true", help="Prefetch LLM proposals for the predicted next screen while acting.")
+    parser.add_argument("--disable-decision-cache", action="store_true", help="Always call the LLM instead of reusing verified decisions.")
+    parser.add_argument("--disable-anchors", action="store_true", help="Do not reuse element locations remembered from earlier runs.")
+    parser.add_argument("--plan-focus-checks", action="store_true", help="Check keyboard focus before untargeted typing within a multi-action plan.")
+    parser.add_argument("--execution-budget", type=float, default=2.0, help="Seconds of executor retries and backoff allowed per step.")
+    parser.add_argument("--disable-accelerators", action="store_true", help="Always click instead of sending an element's accelerator or access key.")
+    parser.add_argument("--disable-probe-verification", action="store_true", help="Always verify a step by re-observing the whole window.")
+    parser.add_argument("--max-cycle-length", type=int, default=4, help="Longest repeating step cycle the verifier detects.")
+    parser.add_argument("--log-fsync", choices=["never", "batch", "close"], default="close", help="When the background log writer fsyncs run logs.")
+    parser.add_argument("--log-segment-mb", type=int, default=64, help="Rotate run logs into a new segment file after this many MB.")
+    parser.add_argument("--log-compress", action="store_true", help="Gzip run log segments once they are rotated out.")
+    parser.add_argument("--record", action="store_true", help="Log full observations and decisions for offline pipeline replay.")
     return parser.parse_args()
 
 
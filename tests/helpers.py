@@ -0,0 +1,120 @@
+"""Synthetic stand-ins shared by the tests; the benchmarks keep their own, larger generators."""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from agent.state.models import ActionVerb, ElementState, IntentAction, IntentTarget, TargetSource, UIElement, UIState, WindowInfo
+
+DENY_SYLLABLES = ["pur", "chase", "del", "ete", "ac", "count", "trans", "fer", "wire", "pay", "ment", "sub", "mit", "con", "firm", "re", "fund"]
+SCREEN_TEXTS = [
+    "Save report",
+    "Open customer invoice 4411",
+    "Settings  >  Notifications",
+    "Search results for quarterly export",
+    "Confirm and send wire transfer to vendor",
+    "Cancel",
+]
+WORDS = ["save", "open", "file", "edit", "view", "export", "report", "customer", "invoice", "settings", "cancel", "next", "print", "close", "help"]
+ROLES = ["button", "listitem", "text", "edit", "menuitem", "hyperlink"]
+
+
+def deny_terms(count: int, seed: int = 3) -> List[str]:
+    rng = random.Random(seed)
+    terms = set()
+    while len(terms) < count:
+        words = ["".join(rng.choice(DENY_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 3))]
+        terms.add(" ".join(words))
+    return sorted(terms)
+
+
+def grounding_state(size: int, seed: int = 7) -> UIState:
+    """Random names from ``WORDS``; every 97th element is the typo "Sbve", which shares no trigram with "save"."""
+    rng = random.Random(seed)
+    window = WindowInfo(hwnd=1, pid=1, exe_name="test.exe", title="Test", bbox=(0, 0, 1920, 1080), platform="windows", warnings=[])
+    elements: List[UIElement] = []
+    for i in range(size):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).title() + f" {i}"
+        if i % 97 == 0:
+            name = f"Sbve {i}"
+        left, top = rng.randint(0, 1800), rng.randint(0, 1000)
+        elements.append(
+            UIElement(
+                element_id=f"el{i:06d}",
+                source=TargetSource.UIA,
+                role=rng.choice(ROLES),
+                name=name,
+                value=None,
+                automation_id=f"auto{i}" if i % 3 == 0 else None,
+                class_name=None,
+                bbox=(left, top, left + rng.randint(10, 200), top + rng.randint(10, 40)),
+                states=[ElementState.ENABLED],
+                parent_element_ids=[],
+                near_text=None,
+                salience=round(rng.random() * 4, 3),
+            )
+        )
+    return UIState(window=window, timestamp=0.0, elements=elements, focused_element_id=None, salient_text=[], screen_signature="test")
+
+
+def grounding_intents(size: int) -> List[IntentAction]:
+    return [
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="export report")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="invoce", role="button")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="save")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals=f"Save {size // 2}")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(automation_id=f"auto{(size // 3) * 3 - 3}")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(element_id=f"el{size - 1:06d}")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="ok", role="button")),
+    ]
+
+
+@dataclass(frozen=True)
+class VirtualRow:
+    name: str
+    automation_id: str
+    index: int
+
+
+class VirtualListProvider:
+    """
+    A virtualized list with ``rows`` items of which only ``page_size`` are
+    realized at a time. ``supports_lookup=False`` behaves like a container
+    without ItemContainerPattern.
+    """
+
+    def __init__(self, rows: int = 1000, page_size: int = 30, supports_lookup: bool = True):
+        self.rows = rows
+        self.page_size = page_size
+        self.supports_lookup = supports_lookup
+        self.offset = 0
+        self._by_key: Dict[str, int] = {}
+        for index in range(rows):
+            self._by_key[self._name(index).lower()] = index
+            self._by_key[f"row-{index}"] = index
+
+    def find_item(self, query: str) -> Optional[VirtualRow]:
+        if not self.supports_lookup:
+            raise NotImplementedError("stand-in configured without item lookup")
+        index = self._by_key.get(query) if query.startswith("row-") else self._by_key.get(query.strip().lower())
+        return self._row(index) if index is not None else None
+
+    def items(self) -> List[VirtualRow]:
+        return [self._row(index) for index in range(self.offset, min(self.offset + self.page_size, self.rows))]
+
+    def scroll_page(self) -> bool:
+        if self.offset + self.page_size >= self.rows:
+            return False
+        self.offset += self.page_size
+        return True
+
+    def scroll_into_view(self, item: VirtualRow) -> None:
+        self.offset = max(0, min(item.index, self.rows - self.page_size))
+
+    def _row(self, index: int) -> VirtualRow:
+        return VirtualRow(name=self._name(index), automation_id=f"row-{index}", index=index)
+
+    @staticmethod
+    def _name(index: int) -> str:
+        return f"Invoice {index:06d}"
@@ -0,0 +1,54 @@
+from agent.executor.accelerators import AcceleratorStrategy, normalize_key
+from agent.perception.compression import UICompressor
+from agent.state.models import ActionVerb, ElementState, GroundedTarget, IntentAction, IntentTarget, Observation, WindowInfo
+
+WINDOW = WindowInfo(hwnd=42, pid=1, exe_name="editor.exe", title="Editor", bbox=(0, 0, 800, 600))
+
+
+def _elements():
+    tree = {
+        "name": "Editor",
+        "role": "Window",
+        "children": [
+            {"name": "Save", "role": "MenuItem", "accelerator_key": "Ctrl+S", "access_key": "S", "states": [ElementState.ENABLED], "parent_chain": "root.0"},
+            {
+                "name": "File",
+                "role": "MenuItem",
+                "access_key": "Alt, F",
+                "states": [ElementState.ENABLED, ElementState.EXPANDED],
+                "parent_chain": "root.1",
+                "children": [{"name": "Open", "role": "MenuItem", "access_key": "O", "states": [ElementState.ENABLED], "parent_chain": "root.1.0"}],
+            },
+            {"name": "Edit", "role": "MenuItem", "access_key": "E", "states": [ElementState.ENABLED], "parent_chain": "root.3"},
+            {"name": "Apply", "role": "Button", "access_key": "A", "states": [ElementState.ENABLED], "parent_chain": "root.2"},
+        ],
+    }
+    state = UICompressor().compress(Observation(window=WINDOW, raw_tree=tree, screenshot_path=None, ocr_results=[]))
+    return {element.name: element for element in state.elements}
+
+
+def _parent(elements, name):
+    parent_id = elements[name].parent_element_ids[-1]
+    return next(element for element in elements.values() if element.element_id == parent_id)
+
+
+def _click(element):
+    return IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(element_id=element.element_id)), GroundedTarget(element=element, confidence=5.0, alternatives=[])
+
+
+def test_clicks_with_accelerators_become_keypresses_only_while_the_window_is_focused():
+    elements = _elements()
+    assert elements["Save"].accelerator_key == "Ctrl+S"
+    focused = AcceleratorStrategy(focus_probe=lambda: 42)
+    assert focused.keypress_for(*_click(elements["Save"]), WINDOW).key == "ctrl+s"
+    assert focused.keypress_for(*_click(elements["File"]), WINDOW).key == "alt+f"
+    # A bare access key on a button is not safe to send without its menu context.
+    assert focused.keypress_for(*_click(elements["Apply"]), WINDOW) is None
+    # Bare menu access keys only work inside an open menu; menu-bar items need Alt.
+    assert focused.keypress_for(*_click(elements["Open"]), WINDOW, _parent(elements, "Open")).key == "o"
+    assert focused.keypress_for(*_click(elements["Edit"]), WINDOW, _parent(elements, "Edit")).key == "alt+e"
+
+    unfocused = AcceleratorStrategy(focus_probe=lambda: 7)
+    assert unfocused.keypress_for(*_click(elements["Save"]), WINDOW) is None
+    assert unfocused.stats()["skipped_unfocused"] == 1
+    assert normalize_key("Ctrl+Shift+N") == "ctrl+shift+n" and normalize_key("Page Up") is None
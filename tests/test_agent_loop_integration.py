@@ -1,8 +1,10 @@
+from dataclasses import replace
+
 from agent.agent_loop import AgentConfig, AutomationAgent
 from agent.executor.mouse_keyboard import MouseKeyboardExecutor
 from agent.executor.uia_executor import UIAExecutor
 from agent.perception.compression import UICompressor
-from agent.state.models import ActionVerb, ElementState, ExecutionMethod, ExecutionResult, ExecutionStatus, Observation, WindowInfo
+from agent.state.models import ActionVerb, ElementState, ExecutionMethod, ExecutionResult, ExecutionStatus, IntentAction, Observation, WindowInfo
 
 
 class DummyObserver:
@@ -47,3 +49,17 @@ def test_agent_loop_runs_with_mock_components(tmp_path):
     agent.run()
     assert agent.trace
     assert agent.trace[0].intent.verb in {ActionVerb.CLICK, ActionVerb.WAIT}
+
+
+def test_speculation_survives_repeated_runs_until_close(tmp_path):
+    config = AgentConfig(log_dir=tmp_path, step_budget=1, enable_ocr=False, enable_screenshots=False, speculative_llm=True)
+    agent = AutomationAgent(observer=DummyObserver(), compressor=UICompressor(), uia_executor=NoOpExecutor(), mouse_executor=NoOpMouse(), config=config)
+    agent.run()
+    agent.run()
+    speculator = agent.decision_engine.speculator
+    state = UICompressor().compress(DummyObserver().observe())
+    wait = IntentAction(verb=ActionVerb.WAIT, wait_seconds=0.0)
+    speculator.record_transition(state, wait, replace(state, screen_signature="next"))
+    assert speculator.prefetch(state, wait, goal=None)
+    agent.close()
+    assert not speculator.prefetch(state, wait, goal=None)
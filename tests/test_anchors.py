@@ -0,0 +1,47 @@
+from agent.grounding.anchors import AnchorStore
+from agent.grounding.grounder import Grounder
+from agent.state.models import ActionVerb, IntentAction, IntentTarget, TargetSource, UIElement, UIState, WindowInfo
+
+
+def _state(hwnd, save_bbox):
+    window = WindowInfo(hwnd=hwnd, pid=hwnd, exe_name="App.exe", title=f"Doc {hwnd}", bbox=(100, 100, 900, 700), class_name="MainWnd")
+    elements = [
+        UIElement(f"save-{hwnd}", TargetSource.UIA, "button", "Save", None, "btnSave", None, save_bbox, backend_ref="|btnSave|Save|button|root.0.2"),
+        UIElement(f"save-as-{hwnd}", TargetSource.UIA, "button", "Save as", None, "btnSaveAs", None, (300, 110, 360, 130)),
+    ]
+    return UIState(window=window, timestamp=0.0, elements=elements, focused_element_id=None, salient_text=[], screen_signature=str(hwnd))
+
+
+def test_anchor_survives_runs_and_decays_after_failures(tmp_path):
+    path = tmp_path / "anchors.json"
+    intent = IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="save"))
+    first_run = Grounder(anchors=AnchorStore(path))
+    state = _state(1, (110, 110, 170, 130))
+    grounded = first_run.ground(intent, state)
+    first_run.record_outcome(intent, state, grounded, success=True)
+    first_run.anchors.flush()
+
+    # A new run sees a different window handle, so only the anchor can short-circuit grounding.
+    store = AnchorStore(path)
+    second_run = Grounder(anchors=store)
+    state = _state(2, (112, 110, 172, 130))
+    grounded = second_run.ground(intent, state)
+    assert second_run.last_cache_outcome == "anchor"
+    assert grounded.element.element_id == "save-2"
+
+    second_run.record_outcome(intent, state, grounded, success=False)
+    assert store.stats()["decayed"] == 1
+    store.flush()
+    assert AnchorStore(path).stats()["keys"] == 0
+
+
+def test_anchor_key_ignores_per_run_element_ids():
+    store = AnchorStore()
+    first, second = _state(1, (110, 110, 170, 130)), _state(2, (110, 110, 170, 130))
+    save = first.elements[0]
+    store.record(first.window, IntentTarget(element_id="save-1"), save, success=True)
+    assert store.stats()["keys"] == 0
+
+    store.record(first.window, IntentTarget(name_equals="Save", element_id="save-1"), save, success=True)
+    found = store.lookup(second.window, IntentTarget(name_equals="Save", element_id="save-2"), Grounder().index_for(second))
+    assert found.element_id == "save-2"
@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+from agent.executor.container_search import ContainerSearch, UIAContainer
+from agent.executor.uia_executor import UIAExecutor
+from agent.state.models import ActionVerb, ExecutionStatus, GroundedTarget, IntentAction, IntentTarget, TargetSource, UIElement
+from tests.helpers import VirtualListProvider
+
+
+def test_item_lookup_and_scroll_probe_find_the_same_row():
+    search = ContainerSearch()
+    direct = VirtualListProvider(rows=5000, page_size=20)
+    probed = VirtualListProvider(rows=5000, page_size=20, supports_lookup=False)
+    hit = search.find(direct, "Invoice 004321")
+    assert hit.method == "item_container" and hit.pages == 0 and direct.offset == 4321
+    fallback = search.find(probed, "row-4321")
+    assert fallback.method == "scroll_probe" and fallback.item == hit.item and fallback.pages == 216
+    assert search.find(VirtualListProvider(rows=50, supports_lookup=False), "Missing").item is None
+
+
+class NoPatternInterfaceError(Exception):
+    pass
+
+
+class PatternlessWrapper:
+    """Mimics pywinauto wrappers, whose ``iface_*`` properties raise for unsupported patterns."""
+
+    def __init__(self, name=None, automation_id=None, children=()):
+        self.element_info = SimpleNamespace(name=name, automation_id=automation_id)
+        self._children = list(children)
+
+    def __getattr__(self, name):
+        if name.startswith("iface_"):
+            raise NoPatternInterfaceError(name)
+        raise AttributeError(name)
+
+    def children(self):
+        return self._children
+
+
+def test_missing_patterns_fall_back_to_scroll_probe():
+    rows = [PatternlessWrapper(f"Row {i}", f"row-{i}") for i in range(3)]
+    hit = ContainerSearch().find(UIAContainer(PatternlessWrapper("List", children=rows)), "row-2")
+    assert hit.method == "scroll_probe" and hit.item is rows[2] and hit.pages == 0
+
+
+def test_find_in_container_intent_fails_fast_when_the_item_is_absent():
+    provider = VirtualListProvider(rows=1000)
+    container = UIElement("list", TargetSource.UIA, "list", "Invoices", None, "invoices", None, (0, 0, 100, 400))
+    executor = UIAExecutor(app_loader=lambda _: provider)
+    grounded = GroundedTarget(element=container, confidence=5.0, alternatives=[])
+    intent = IntentAction(verb=ActionVerb.FIND_IN_CONTAINER, target=IntentTarget(automation_id="invoices"), text="Invoice 000777")
+    assert executor.execute(intent, grounded).status == ExecutionStatus.OK
+    assert provider.offset == 777
+    missing = executor.execute(IntentAction(verb=ActionVerb.FIND_IN_CONTAINER, text="Invoice 999999"), grounded)
+    assert missing.status == ExecutionStatus.FAIL and executor.retry_policy.fast_failures == 1
@@ -0,0 +1,69 @@
+from agent.decision.decision_cache import DecisionCache
+from agent.decision.decision_engine import DecisionEngine
+from agent.decision.llm_interface import LLMInterface
+from agent.selector.selector import Selector
+from agent.skills.skill_library import SkillLibrary
+from agent.state.models import ActionVerb, IntentAction, IntentTarget, UIState, WindowInfo, WorkingMemory
+
+
+def _state(signature: str = "sig") -> UIState:
+    window = WindowInfo(hwnd=1, pid=1, exe_name="batch.exe", title="Batch", bbox=(0, 0, 10, 10), platform="windows", warnings=[])
+    return UIState(window=window, timestamp=0.0, elements=[], focused_element_id=None, salient_text=[], screen_signature=signature)
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, ui_state, goal, candidate_actions=None):
+        self.calls += 1
+        return [IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals="Export"))]
+
+
+def test_verified_decision_skips_llm_and_persists(tmp_path):
+    path = tmp_path / "decisions.json"
+    client = CountingClient()
+    engine = DecisionEngine(SkillLibrary(), Selector(), llm=LLMInterface(client=client), cache=DecisionCache(path=path))
+    memory = WorkingMemory(goal="Export  Report")
+    first = engine.decide(_state(), memory)
+    engine.record_outcome(first, success=True)
+    second = engine.decide(_state(), memory)
+    assert client.calls == 1
+    assert second.rationale == "cache" and not second.used_llm
+    engine.cache.flush()
+
+    reloaded = DecisionEngine(SkillLibrary(), Selector(), llm=LLMInterface(client=client), cache=DecisionCache(path=path))
+    third = reloaded.decide(_state(), WorkingMemory(goal="export report"))
+    assert client.calls == 1
+    assert third.intent == first.intent
+
+
+def test_failed_outcome_invalidates_entry():
+    now = [0.0]
+    cache = DecisionCache(ttl_seconds=10.0, clock=lambda: now[0])
+    key = cache.key_for(_state(), "goal")
+    intent = IntentAction(verb=ActionVerb.WAIT, wait_seconds=1.0)
+    cache.put(key, intent)
+    assert cache.get(key) is None
+    cache.record_outcome(key, success=True)
+    assert cache.get(key) == intent
+    cache.record_outcome(key, success=False)
+    assert cache.get(key) is None
+    cache.put(key, intent)
+    cache.record_outcome(key, success=True)
+    now[0] = 11.0
+    assert cache.get(key) is None
+
+
+def test_fallback_answers_are_not_cached():
+    def heuristic(ui_state, goal, candidate_actions=None):
+        return [IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals="Export"))]
+
+    heuristic.heuristic = True
+    memory = WorkingMemory(goal="export")
+    for llm in (LLMInterface(client=heuristic), LLMInterface(client=lambda **_: [{"verb": "bogus"}]), LLMInterface()):
+        engine = DecisionEngine(SkillLibrary(), Selector(), llm=llm, cache=DecisionCache())
+        decision = engine.decide(_state(), memory)
+        engine.record_outcome(decision, success=True)
+        assert not decision.used_llm
+        assert engine.cache.get(decision.cache_key) is None
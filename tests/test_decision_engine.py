@@ -0,0 +1,61 @@
+from agent.decision.decision_engine import DecisionEngine
+from agent.decision.llm_interface import LLMInterface
+from agent.grounding.grounder import Grounder
+from agent.selector.selector import Selector
+from agent.skills.skill_library import SkillLibrary
+from agent.state.models import ActionVerb, ElementState, IntentAction, IntentTarget, TargetSource, UIElement, UIState, WindowInfo, WorkingMemory
+
+
+def _state() -> UIState:
+    window = WindowInfo(hwnd=1, pid=1, exe_name="app.exe", title="App", bbox=(0, 0, 100, 100), platform="windows", warnings=[])
+    elements = [
+        UIElement(
+            element_id=f"btn-{name.lower()}",
+            source=TargetSource.UIA,
+            role="button",
+            name=name,
+            value=None,
+            automation_id=name.lower(),
+            class_name=None,
+            bbox=(0, 0, 10, 10),
+            states=[ElementState.ENABLED],
+            parent_element_ids=[],
+            near_text=None,
+            salience=1.0,
+        )
+        for name in ("Export", "Print")
+    ]
+    return UIState(window=window, timestamp=0.0, elements=elements, focused_element_id=None, salient_text=[], screen_signature="sig")
+
+
+def test_llm_proposals_are_jointly_ranked_with_grounded_alternatives():
+    proposals = [
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals="Missing")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="Purchase")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="print")),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(automation_id="export")),
+    ]
+    engine = DecisionEngine(SkillLibrary(), Selector(), llm=LLMInterface(client=lambda **_: proposals), grounder=Grounder())
+    decision = engine.decide(_state(), WorkingMemory(goal="export"))
+    assert decision.intent.target.automation_id == "export"
+    assert decision.grounded.element.element_id == "btn-export"
+    assert [grounded.element.element_id for _, grounded in decision.alternatives] == ["btn-print"]
+
+
+def test_llm_plan_is_grounded_against_the_same_state_and_truncated_at_unknown_targets():
+    raw = {
+        "verb": "click",
+        "target": {"automation_id": "export"},
+        "then": [
+            {"verb": "type", "text": "report"},
+            {"verb": "keypress", "key": "enter"},
+            {"verb": "click", "target": {"automation_id": "print"}},
+            {"verb": "click", "target": {"name_equals": "Missing"}},
+            {"verb": "keypress", "key": "esc"},
+        ],
+    }
+    engine = DecisionEngine(SkillLibrary(), Selector(), llm=LLMInterface(client=lambda **_: [raw]), grounder=Grounder())
+    decision = engine.decide(_state(), WorkingMemory(goal="export"))
+    assert decision.intent.then == ()
+    assert [step.verb for step, _ in decision.plan] == [ActionVerb.TYPE, ActionVerb.KEYPRESS, ActionVerb.CLICK]
+    assert decision.plan[2][1].element.element_id == "btn-print"
@@ -33,3 +33,74 @@ def test_uia_executor_uses_backend_handle():
     result = executor.execute(intent, target)
     assert result.status == ExecutionStatus.OK
     assert wrapper.clicked
+
+
+class _Rect:
+    def __init__(self, left, top, right, bottom):
+        self.left, self.top, self.right, self.bottom = left, top, right, bottom
+
+
+class _Info:
+    def __init__(self, rect):
+        self.handle = None
+        self.rectangle = rect
+
+
+class _Found:
+    def __init__(self, wrapper):
+        self._wrapper = wrapper
+
+    def wrapper_object(self):
+        return self._wrapper
+
+
+class _Desktop:
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+        self.searches = 0
+
+    def window(self, **_):
+        self.searches += 1
+        return _Found(self.wrapper)
+
+
+def test_resolver_caches_live_wrappers_until_window_changes():
+    from agent.executor.handle_resolver import UIAHandleResolver
+    from agent.state.models import WindowInfo
+
+    wrapper = DummyWrapper()
+    wrapper.element_info = _Info(_Rect(0, 0, 10, 10))
+    desktop = _Desktop(wrapper)
+    resolver = UIAHandleResolver(desktop_factory=lambda: desktop)
+    window = WindowInfo(hwnd=1, pid=1, exe_name="app.exe", title="A", bbox=None)
+    ref = "|ok|OK|Button|root.0"
+    assert resolver.resolve(ref, window) is wrapper
+    assert resolver.resolve(ref, window) is wrapper
+    assert desktop.searches == 1 and resolver.stats()["hits"] == 1
+
+    wrapper.element_info.rectangle = _Rect(0, 0, 0, 0)
+    resolver.resolve(ref, window)
+    assert desktop.searches == 2
+
+    resolver.resolve(ref, WindowInfo(hwnd=2, pid=1, exe_name="app.exe", title="B", bbox=None))
+    assert desktop.searches == 3
+    assert resolver.stats()["invalidations"] == 2
+
+
+def test_unverified_text_entry_fails_without_retrying():
+    class Field:
+        def __init__(self):
+            self.typed = []
+
+        def type_keys(self, keys, **_):
+            self.typed.append(keys)
+
+        def get_value(self):
+            return ""
+
+    field = Field()
+    element = UIElement("f", TargetSource.UIA, "edit", "Notes", None, None, None, None, [], [], None, 1.0)
+    executor = UIAExecutor(app_loader=lambda _: field)
+    result = executor.execute(IntentAction(verb=ActionVerb.TYPE, text="hello"), GroundedTarget(element=element, confidence=1.0, alternatives=[]))
+    assert result.status == ExecutionStatus.FAIL and field.typed == ["hello"]
+    assert executor.text_entry.last.verified is False
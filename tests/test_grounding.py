@@ -1,3 +1,5 @@
+from dataclasses import replace
+
 from agent.grounding.grounder import Grounder
 from agent.state.models import ActionVerb, ElementState, IntentAction, IntentTarget, TargetSource, UIElement, UIState, WindowInfo
 
@@ -62,3 +64,58 @@ def test_grounder_honors_automation_id():
     grounded = Grounder().ground(intent, ui_state)
     assert grounded.element is not None
     assert grounded.element.element_id == "cancel-btn"
+
+
+def test_ground_batch_matches_individual_grounding():
+    ui_state = _ui_state()
+    intents = [
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="cancel")),
+        IntentAction(verb=ActionVerb.WAIT, wait_seconds=1.0),
+        IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(automation_id="submit")),
+    ]
+    grounder = Grounder()
+    batch = grounder.ground_batch(intents, ui_state)
+    assert batch == [grounder.ground(intent, ui_state) for intent in intents]
+    assert batch[1].element is None
+
+
+def test_indexed_grounding_matches_full_scan_ranking():
+    from tests.helpers import grounding_intents, grounding_state
+
+    ui_state = grounding_state(400)
+    legacy, indexed = Grounder(use_index=False), Grounder()
+    for intent in grounding_intents(400):
+        expected = legacy.ground(intent, ui_state)
+        actual = indexed.ground(intent, ui_state)
+        assert actual == expected
+
+    # "Sbve" shares no trigram with "save" but still fuzzy-matches, so it must stay an alternative.
+    ui_state = _ui_state()
+    ui_state.elements[:] = [replace(ui_state.elements[0], element_id="save", name="Save"), replace(ui_state.elements[1], element_id="sbve", name="Sbve")]
+    for query in ("save", "Sumbit", "Cancle"):
+        intent = IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains=query))
+        assert Grounder().ground(intent, ui_state) == Grounder(use_index=False).ground(intent, ui_state)
+    grounded = Grounder().ground(IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="save")), ui_state)
+    assert [grounded.element.name] + [e.name for e in grounded.alternatives] == ["Save", "Sbve"]
+
+
+def test_temporal_cache_reuses_unchanged_element_and_drops_changed_one():
+    from dataclasses import replace
+
+    ui_state = _ui_state()
+    intent = IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="Submit "))
+    grounder = Grounder()
+    first = grounder.ground(intent, ui_state)
+    assert grounder.last_cache_outcome == "miss"
+    again = grounder.ground(intent, ui_state)
+    assert grounder.last_cache_outcome == "hit"
+    assert again.element == first.element and again.confidence == first.confidence
+    grounder.ground(IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="  SUBMIT")), ui_state)
+    assert grounder.last_cache_outcome == "hit"
+
+    moved = replace(ui_state.elements[0], bbox=(50, 50, 60, 60))
+    changed = replace(ui_state, elements=[moved, ui_state.elements[1]])
+    grounded = grounder.ground(intent, changed)
+    assert grounder.last_cache_outcome == "miss"
+    assert grounded.element.bbox == (50, 50, 60, 60)
+    assert grounder.temporal_cache.stats()["stale"] == 1
@@ -0,0 +1,226 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agent.agent_loop import AgentConfig, AutomationAgent
+from agent.decision.llm_client import PooledLLMClient
+from agent.decision.llm_interface import LLMInterface
+from agent.perception.compression import UICompressor
+from agent.state.models import ActionVerb, UIState, WindowInfo
+from tests.test_agent_loop_integration import DummyObserver, NoOpExecutor, NoOpMouse
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            raw = gzip.decompress(raw)
+        body = json.loads(raw)
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.bodies.append(body)
+            delay = self.server.delays.pop(0) if self.server.delays else 0.0
+        time.sleep(delay)
+        if self.server.ndjson:
+            self._stream_lines(self.server.ndjson)
+            return
+        payload = json.dumps({"actions": [{"verb": "click", "target": {"name_equals": body["goal"]}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream_lines(self, lines):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for delay, item in lines:
+            time.sleep(delay)
+            chunk = (json.dumps(item) + "\n").encode("utf-8")
+            self.wfile.write(f"{len(chunk):x}\r\n".encode("ascii") + chunk + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+    server.delays = []
+    server.bodies = []
+    server.ndjson = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _state() -> UIState:
+    window = WindowInfo(hwnd=1, pid=1, exe_name="app.exe", title="App", bbox=(0, 0, 10, 10), platform="windows", warnings=[])
+    return UIState(window=window, timestamp=0.0, elements=[], focused_element_id=None, salient_text=["Save"], screen_signature="sig")
+
+
+def test_pooled_client_reuses_connection(stand_in_server):
+    client = PooledLLMClient(f"http://127.0.0.1:{stand_in_server.server_port}/propose", api_key="k")
+    llm = LLMInterface(client=client)
+    start = time.perf_counter()
+    for _ in range(20):
+        actions = llm.propose(_state(), goal="Save")
+    elapsed = time.perf_counter() - start
+    assert actions[0].verb == ActionVerb.CLICK and actions[0].target.name_equals == "Save"
+    assert stand_in_server.requests == 20
+    assert stand_in_server.connections == 1
+    assert client.stats()["connections_opened"] == 1
+    assert elapsed < 2.0
+    client.close()
+
+
+def test_async_calls_share_pool(stand_in_server):
+    client = PooledLLMClient(f"http://127.0.0.1:{stand_in_server.server_port}/propose", pool_size=2)
+
+    async def burst():
+        return await asyncio.gather(*(client.acall(_state(), goal=f"g{i}") for i in range(6)))
+
+    results = asyncio.run(burst())
+    assert [r[0]["target"]["name_equals"] for r in results] == [f"g{i}" for i in range(6)]
+    assert client.stats()["connections_opened"] <= 4
+    client.close()
+
+
+def test_hedged_request_beats_slow_primary(stand_in_server):
+    client = PooledLLMClient(f"http://127.0.0.1:{stand_in_server.server_port}/propose", hedge=True, hedge_min_samples=4)
+    for _ in range(4):
+        client(_state(), goal="warm")
+    stand_in_server.delays = [1.0]
+    start = time.perf_counter()
+    actions = client(_state(), goal="Save")
+    assert time.perf_counter() - start < 0.8
+    assert actions[0]["target"]["name_equals"] == "Save"
+    assert client.stats()["hedges_won"] == 1
+    client.close()
+
+
+def test_deadline_is_enforced(stand_in_server):
+    client = PooledLLMClient(f"http://127.0.0.1:{stand_in_server.server_port}/propose")
+    stand_in_server.delays = [1.0]
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        client(_state(), goal="Save", deadline=start + 0.1)
+    assert time.monotonic() - start < 0.5
+    client.close()
+
+
+def test_large_state_is_gzipped_and_delta_encoded(stand_in_server):
+    from agent.state.models import ElementState, TargetSource, UIElement
+
+    elements = [
+        UIElement(
+            element_id=f"el{i}",
+            source=TargetSource.UIA,
+            role="listitem",
+            name=f"Row {i} of the customer table",
+            value=None,
+            automation_id=f"row{i}",
+            class_name=None,
+            bbox=(0, i * 20, 400, i * 20 + 18),
+            states=[ElementState.ENABLED],
+            parent_element_ids=[],
+            near_text=None,
+            salience=1.0,
+        )
+        for i in range(200)
+    ]
+    window = WindowInfo(hwnd=1, pid=1, exe_name="crm.exe", title="CRM", bbox=(0, 0, 800, 600), platform="windows", warnings=[])
+    state = UIState(window=window, timestamp=0.0, elements=elements, focused_element_id=None, salient_text=[], screen_signature="a")
+    client = PooledLLMClient(f"http://127.0.0.1:{stand_in_server.server_port}/propose")
+    client(state, goal="open")
+    client(state, goal="open")
+    stats = client.stats()
+    assert stats["bytes_sent"] < stats["bytes_raw"] / 3
+    first, second = stand_in_server.bodies
+    assert first["state"]["mode"] == "full"
+    assert second["state"]["mode"] == "delta" and not second["state"]["added"] and not second["state"]["removed"]
+    client.close()
+
+
+def test_stream_yields_first_action_before_response_completes(stand_in_server):
+    stand_in_server.ndjson = [
+        (0.0, {"verb": "click", "target": {"name_equals": "Save"}}),
+        (0.5, {"verb": "click", "target": {"name_equals": "Later"}}),
+    ]
+    client = PooledLLMClient(f"http://127.0.0.1:{stand_in_server.server_port}/propose")
+    start = time.perf_counter()
+    stream = client.stream(_state(), goal="Save")
+    first = next(stream)
+    assert time.perf_counter() - start < 0.4
+    assert first["target"]["name_equals"] == "Save"
+    stream.close()
+    stand_in_server.ndjson = None
+    time.sleep(0.7)
+    client(_state(), goal="again")
+    assert client.stats()["connections_opened"] == 1
+    client.close()
+
+
+def test_forked_client_does_not_wait_behind_the_original(stand_in_server):
+    client = PooledLLMClient(f"http://127.0.0.1:{stand_in_server.server_port}/propose")
+    speculative = client.fork()
+    stand_in_server.delays = [1.0]
+    slow = threading.Thread(target=speculative, args=(_state(), "prefetch"))
+    slow.start()
+    while stand_in_server.requests < 1:
+        time.sleep(0.01)
+    start = time.perf_counter()
+    actions = client(_state(), goal="Save")
+    assert time.perf_counter() - start < 0.5
+    assert actions[0]["target"]["name_equals"] == "Save"
+    slow.join()
+    assert stand_in_server.bodies[0]["state"]["session"] != stand_in_server.bodies[1]["state"]["session"]
+    speculative.close()
+    client.close()
+
+
+def test_default_wiring_hedges_the_streamed_proposal(stand_in_server, tmp_path):
+    config = AgentConfig(
+        log_dir=tmp_path,
+        enable_ocr=False,
+        enable_screenshots=False,
+        llm_endpoint=f"http://127.0.0.1:{stand_in_server.server_port}/propose",
+        llm_api_key="k",
+        llm_hedge=True,
+    )
+    agent = AutomationAgent(observer=DummyObserver(), compressor=UICompressor(), uia_executor=NoOpExecutor(), mouse_executor=NoOpMouse(), config=config)
+    llm = agent.decision_engine.llm
+    assert llm.supports_streaming
+    for _ in range(8):
+        llm.propose_first(_state(), goal="warm", accept=lambda a: True)
+    stand_in_server.delays = [1.0]
+    start = time.perf_counter()
+    action, _ = llm.propose_first(_state(), goal="Save", accept=lambda a: True)
+    assert time.perf_counter() - start < 0.8
+    assert action.target.name_equals == "Save"
+    assert agent.llm_client.stats()["hedges_won"] == 1
+    assert not agent.llm_client._idle.empty()
+    agent.close()
+    assert agent.llm_client._idle.empty()
@@ -1,5 +1,13 @@
+import threading
+import time
+
+from agent.decision.circuit_breaker import CircuitBreaker
+from agent.decision.decision_engine import DecisionEngine
 from agent.decision.llm_interface import LLMInterface
-from agent.state.models import ActionVerb, ElementState, TargetSource, UIElement, UIState, WindowInfo
+from agent.grounding.grounder import Grounder
+from agent.selector.selector import Selector
+from agent.skills.skill_library import SkillLibrary
+from agent.state.models import ActionVerb, ElementState, TargetSource, UIElement, UIState, WindowInfo, WorkingMemory
 
 
 def _state():
@@ -29,3 +37,110 @@ def test_llm_interface_fallback_generates_action():
     actions = llm.propose(_state(), goal="click button")
     assert actions
     assert actions[0].verb == ActionVerb.CLICK
+
+
+def _failing_client(ui_state, goal, candidate_actions=None):
+    raise ConnectionError("endpoint down")
+
+
+def test_llm_interface_does_not_sleep_after_final_attempt_or_past_deadline():
+    llm = LLMInterface(client=_failing_client, max_retries=1, backoff_seconds=0.2)
+    start = time.monotonic()
+    assert llm.propose(_state(), goal="g") == []
+    assert time.monotonic() - start < 0.35
+    llm = LLMInterface(client=_failing_client, max_retries=5, backoff_seconds=0.2)
+    start = time.monotonic()
+    llm.propose(_state(), goal="g", deadline=time.monotonic() + 0.1)
+    assert time.monotonic() - start < 0.1
+
+
+def test_circuit_breaker_routes_to_fallback_until_probe_succeeds():
+    now = [0.0]
+    calls = []
+
+    def client(ui_state, goal, candidate_actions=None):
+        calls.append(now[0])
+        if now[0] < 100:
+            raise ConnectionError("endpoint down")
+        return [{"verb": "wait", "wait_seconds": 0.5}]
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30.0, clock=lambda: now[0])
+    llm = LLMInterface(client=client, max_retries=0, breaker=breaker)
+    llm.propose(_state(), goal="g")
+    llm.propose(_state(), goal="g")
+    assert breaker.state == CircuitBreaker.OPEN
+    fallback = llm.propose(_state(), goal="g")
+    assert len(calls) == 2
+    assert fallback[0].verb == ActionVerb.CLICK
+    now[0] = 40.0
+    llm.propose(_state(), goal="g")
+    assert breaker.state == CircuitBreaker.OPEN and len(calls) == 3
+    now[0] = 100.0
+    assert llm.propose(_state(), goal="g")[0].verb == ActionVerb.WAIT
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert llm.stats()["short_circuits"] == 1
+
+
+class StreamingClient:
+    def __init__(self, items, hold_at=None):
+        self.items = items
+        self.consumed = 0
+        self.hold_at = hold_at
+        self.release = threading.Event()
+
+    def __call__(self, ui_state, goal, candidate_actions=None):
+        return list(self.items)
+
+    def stream(self, ui_state, goal, candidate_actions=None, deadline=None):
+        for index, item in enumerate(self.items):
+            if index == self.hold_at:
+                self.release.wait(5.0)
+            self.consumed += 1
+            yield item
+
+
+def test_streaming_returns_first_admissible_well_grounded_action():
+    client = StreamingClient(
+        [
+            {"verb": "click", "target": {"name_contains": "Purchase"}},
+            {"verb": "click", "target": {"element_id": "missing"}},
+            {"verb": "click", "target": {"element_id": "btn1"}},
+            {"verb": "click", "target": {"name_contains": "click"}},
+        ],
+        hold_at=3,
+    )
+    engine = DecisionEngine(SkillLibrary(), Selector(), llm=LLMInterface(client=client), grounder=Grounder())
+    decision = engine.decide(_state(), WorkingMemory(goal="click"))
+    assert decision.intent.target.element_id == "btn1"
+    assert client.consumed == 3
+    assert engine.llm.stats()["first_action_seconds"] is not None
+    # The rest of the stream still feeds jointly ranked alternatives if the accepted action fails.
+    client.release.set()
+    assert [intent.target.name_contains for intent, _ in decision.late_alternatives()] == ["click"]
+
+
+class FlakyStreamingClient(StreamingClient):
+    def __init__(self, items, failures):
+        super().__init__(items)
+        self.failures = failures
+        self.attempts = 0
+
+    def stream(self, ui_state, goal, candidate_actions=None, deadline=None):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("stream reset")
+        yield from super().stream(ui_state, goal, candidate_actions, deadline)
+
+
+def test_streaming_retries_like_propose_and_short_circuits_count_savings():
+    client = FlakyStreamingClient([{"verb": "click", "target": {"element_id": "btn1"}}], failures=1)
+    llm = LLMInterface(client=client, max_retries=1, backoff_seconds=0.01)
+    action, _ = llm.propose_first(_state(), goal="g", accept=lambda a: True)
+    assert action.target.element_id == "btn1" and client.attempts == 2
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30.0)
+    llm = LLMInterface(client=FlakyStreamingClient([], failures=10), max_retries=2, backoff_seconds=0.01, breaker=breaker)
+    assert llm.propose_first(_state(), goal="g", accept=lambda a: True) == (None, [])
+    assert llm.client.attempts == 3 and breaker.state == CircuitBreaker.OPEN
+    llm.propose_first(_state(), goal="g", accept=lambda a: True)
+    assert llm.stats()["short_circuits"] == 1 and llm.stats()["saved_seconds"] > 0
@@ -1,13 +1,56 @@
 import json
 
 from agent.logging.json_logger import LOG_VERSION, JsonLogger
+from agent.logging.replay import follow_events, load_events, parse_steps, run_segments, select_events
+from agent.logging.writer import BackgroundJsonlWriter
 
 
 def test_json_logger_emits_version(tmp_path):
     logger = JsonLogger(tmp_path, host_platform="test")
     logger.log(0, "observe", {"sample": True})
+    logger.flush()
     path = tmp_path / f"{logger.run_id}.jsonl"
     with path.open() as f:
         payload = json.loads(f.readline())
     assert payload["version"] == LOG_VERSION
     assert payload["host_platform"] == "test"
+
+
+def test_background_writer_batches_and_rotates_segments(tmp_path):
+    writer = BackgroundJsonlWriter(tmp_path / "run", batch_size=50, flush_interval=60.0, fsync="batch", max_segment_bytes=2000)
+    for index in range(120):
+        writer.write({"step_index": index, "payload": {"text": "x" * 20}})
+    writer.close()
+    segments = run_segments(tmp_path, "run")
+    assert [path.name for path in segments[:2]] == ["run.jsonl", "run.001.jsonl"]
+    assert all(path.stat().st_size <= 2000 for path in segments)
+    assert [event["step_index"] for path in segments for event in load_events(path)] == list(range(120))
+    assert writer.stats()["batches"] == 3
+
+
+def test_replay_seeks_by_step_and_kind_across_compressed_segments(tmp_path):
+    writer = BackgroundJsonlWriter(tmp_path / "run", max_segment_bytes=600, compress=True)
+    for step in range(40):
+        for kind in ("observe", "verify"):
+            writer.write({"step_index": step, "kind": kind, "payload": {"status": "success"}})
+    writer.close()
+    segments = run_segments(tmp_path, "run")
+    assert segments[0].name == "run.jsonl.gz" and segments[-1].name.endswith(".jsonl")
+    picked = list(select_events(tmp_path, "run", steps=parse_steps("12:14"), kinds={"verify"}))
+    assert [(event["step_index"], event["kind"]) for event in picked] == [(12, "verify"), (13, "verify"), (14, "verify")]
+    assert len(list(select_events(tmp_path, "run", steps=parse_steps("39:")))) == 2
+
+    live = BackgroundJsonlWriter(tmp_path / "live", flush_interval=0.01)
+    live.write({"step_index": 0, "kind": "observe"})
+    live.flush()
+    polls = []
+
+    def sleep(_):
+        polls.append(1)
+        if len(polls) == 1:
+            live.write({"step_index": 1, "kind": "verify"})
+            live.flush()
+
+    followed = follow_events(tmp_path, "live", sleep=sleep, stop=lambda: len(polls) >= 2)
+    assert [event["step_index"] for event in followed] == [0, 1]
+    live.close()
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from agent.decision.micropolicy import MicropolicyTable
+from agent.state.models import ActionVerb, ElementState, TargetSource, UIElement, UIState, WindowInfo
+
+
+def _element(element_id: str, name: str, role: str = "button", automation_id=None, states=(ElementState.ENABLED,)) -> UIElement:
+    return UIElement(
+        element_id=element_id,
+        source=TargetSource.UIA,
+        role=role,
+        name=name,
+        value=None,
+        automation_id=automation_id,
+        class_name=None,
+        bbox=(0, 0, 10, 10),
+        states=list(states),
+        parent_element_ids=[],
+        near_text=None,
+        salience=1.0,
+    )
+
+
+def _state(elements, exe_name: str = "app.exe") -> UIState:
+    window = WindowInfo(hwnd=1, pid=1, exe_name=exe_name, title="App", bbox=(0, 0, 100, 100), platform="windows", warnings=[])
+    return UIState(window=window, timestamp=0.0, elements=elements, focused_element_id=None, salient_text=[], screen_signature="sig")
+
+
+def test_default_rules_match_ok_and_skip_disabled():
+    table = MicropolicyTable.default()
+    state = _state([_element("a", "OK", states=[ElementState.DISABLED]), _element("b", "Next")])
+    rule, intent = table.match(state)
+    assert rule.name == "advance-next"
+    assert intent.verb == ActionVerb.CLICK
+    assert intent.target.element_id == "b"
+
+
+def test_rule_table_from_file_prefers_priority_and_app(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps(
+            {
+                "rules": [
+                    {"name": "dismiss-not-now", "element_name": "Not now", "priority": 5},
+                    {"name": "accept-eula", "automation_id": "btnAccept", "app": "setup.exe", "priority": 10},
+                    {"name": "close-banner", "role": "banner", "verb": "close_dialog"},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    table = MicropolicyTable.from_file(path)
+    elements = [_element("n", "Not now"), _element("e", "I Accept", automation_id="btnAccept")]
+    rule, _ = table.match(_state(elements, exe_name="setup.exe"))
+    assert rule.name == "accept-eula"
+    rule, _ = table.match(_state(elements, exe_name="other.exe"))
+    assert rule.name == "dismiss-not-now"
+    assert table.stats() == {"hits": {"accept-eula": 1, "dismiss-not-now": 1}, "llm_calls_avoided": 2}
+
+
+def test_rule_without_selector_is_rejected():
+    with pytest.raises(ValueError):
+        MicropolicyTable.from_dicts([{"name": "bad"}])
+
+
+def test_rule_file_is_merged_over_defaults(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps(
+            {
+                "rules": [
+                    {"name": "accept-ok", "enabled": False},
+                    {"name": "advance-next", "element_name": "Continue"},
+                    {"name": "dismiss-not-now", "element_name": "Not now"},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    table = MicropolicyTable.from_file(path)
+    assert sorted(rule.name for rule in table.rules) == ["advance-next", "dismiss-not-now"]
+    assert table.match(_state([_element("a", "OK")])) is None
+    rule, intent = table.match(_state([_element("n", "Next"), _element("c", "Continue")]))
+    assert rule.name == "advance-next"
+    assert intent.target.element_id == "c"
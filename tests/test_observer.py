@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from agent.grounding.grounder import Grounder
+from agent.observer.observer import Observer
+from agent.perception.compression import UICompressor
+from agent.state.models import ActionVerb, IntentAction, IntentTarget, Observation, WindowInfo
+
+WINDOW = WindowInfo(hwnd=1, pid=2, exe_name="grid.exe", title="Orders", bbox=(0, 0, 400, 300), platform="windows")
+
+
+class FakeWrapper:
+    def __init__(self, name, role, rect, children=(), automation_id=None):
+        self.element_info = SimpleNamespace(name=name, control_type=role, automation_id=automation_id, class_name=None, handle=None, rectangle=SimpleNamespace(left=rect[0], top=rect[1], right=rect[2], bottom=rect[3]))
+        self._children = list(children)
+        self.reads = 0
+
+    def children(self):
+        self.reads += 1
+        return self._children
+
+
+def _grid(rows=5000, row_height=20, scrolled_to=1000):
+    items = [FakeWrapper(f"Order {i}", "ListItem", (0, (i - scrolled_to) * row_height, 400, (i - scrolled_to + 1) * row_height), automation_id=f"order-{i}") for i in range(rows)]
+    header = FakeWrapper("Orders", "Header", (0, -20, 400, 0))
+    return FakeWrapper("Grid", "List", (0, 0, 400, 300), [header, *items]), items
+
+
+def test_long_sibling_runs_serialize_visible_rows_and_a_summary(tmp_path):
+    observer = Observer(screenshot_dir=tmp_path, group_margin=2)
+    grid, items = _grid()
+    tree = observer._serialize_wrapper(grid, depth=0, parent_chain="root")
+    names = [child["name"] for child in tree["children"]]
+    assert names[0] == "Orders" and names[1] == "Order 998" and names[-2] == "Order 1016"
+    summary = tree["children"][-1]
+    assert summary["group"] == {"role": "ListItem", "total": 5000, "visible": [1000, 1015], "serialized": [998, 1017]}
+    assert sum(item.reads for item in items) == 19
+    state = UICompressor(element_cap=10).compress(Observation(window=WINDOW, raw_tree=tree, screenshot_path=None, ocr_results=[]))
+    assert any(element.group and element.group.total == 5000 for element in state.elements)
+
+
+
+def test_run_with_no_row_on_screen_reports_an_empty_visible_range(tmp_path):
+    observer = Observer(screenshot_dir=tmp_path, group_margin=2)
+    tree = observer._serialize_wrapper(_grid(scrolled_to=-100)[0], depth=0, parent_chain="root")
+    summary = tree["children"][-1]
+    assert summary["name"] == "5000 ListItem items, none on screen"
+    assert summary["group"] == {"role": "ListItem", "total": 5000, "visible": [0, 0], "serialized": [0, 2]}
+
+def test_grounder_expands_group_when_target_is_off_screen(tmp_path):
+    observer = Observer(screenshot_dir=tmp_path)
+    compressor = UICompressor()
+    tree = observer._serialize_wrapper(_grid()[0], depth=0, parent_chain="root")
+    state = compressor.compress(Observation(window=WINDOW, raw_tree=tree, screenshot_path=None, ocr_results=[]))
+
+    def expander(group, target, ui_state):
+        nodes = observer.expand_group(group.backend_ref, automation_id=target.automation_id, name=target.name_equals or target.name_contains)
+        return compressor.elements_from_nodes(nodes, ui_state.window, group.parent_element_ids)
+
+    grounder = Grounder(expander=expander)
+    grounded = grounder.ground(_intent("order-4321"), state)
+    assert grounded.element.name == "Order 4321" and grounded.element.backend_ref.endswith("root.4322")
+    assert grounder.expansions == 1
+    assert Grounder().ground(_intent("order-4321"), state).element is None
+
+    # A fuzzy match against a visible row must not stop the expansion.
+    grounded = grounder.ground(IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_contains="Order 4321")), state)
+    assert grounded.element.name == "Order 4321" and grounder.expansions == 2
+
+
+def _intent(automation_id):
+    return IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(automation_id=automation_id))
@@ -0,0 +1,44 @@
+from agent.agent_loop import AgentConfig, AutomationAgent
+import json
+
+from agent.logging.pipeline_replay import PipelineReplayer, load_inputs, load_recording
+from agent.perception.compression import UICompressor
+from tests.test_agent_loop_integration import DummyObserver, NoOpExecutor, NoOpMouse
+
+
+def test_recorded_run_replays_offline_without_differences(tmp_path):
+    agent = AutomationAgent(
+        observer=DummyObserver(),
+        compressor=UICompressor(),
+        uia_executor=NoOpExecutor(),
+        mouse_executor=NoOpMouse(),
+        config=AgentConfig(log_dir=tmp_path, step_budget=2, enable_ocr=False, enable_screenshots=False, enable_decision_cache=False, record=True),
+    )
+    agent.memory.goal = "Click ok"
+    agent.run()
+    steps = load_recording(tmp_path, agent.logger.run_id)
+    assert len(steps) == len(agent.trace) and steps[0].after is not None
+    assert steps[0].before.window.bbox == (0, 0, 20, 20)
+
+    report = PipelineReplayer().replay(steps)
+    assert report.differences == []
+    summary = report.summary()
+    assert summary["steps"] == len(steps) and summary["stages"]["decide"]["count"] == len(steps)
+
+    steps[0].decision["element_id"] = "stale"
+    assert PipelineReplayer().replay(steps).differences[0]["field"] == "element_id"
+
+
+def test_replay_restores_the_recorded_micropolicy_rules(tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps([{"name": "double-ok", "automation_id": "ok", "verb": "double_click", "priority": 5}]), encoding="utf-8")
+    config = AgentConfig(
+        log_dir=tmp_path, step_budget=1, enable_ocr=False, enable_screenshots=False, enable_decision_cache=False, record=True, micropolicy_path=rules
+    )
+    agent = AutomationAgent(observer=DummyObserver(), compressor=UICompressor(), uia_executor=NoOpExecutor(), mouse_executor=NoOpMouse(), config=config)
+    agent.run()
+    steps = load_recording(tmp_path, agent.logger.run_id)
+    inputs = load_inputs(tmp_path, agent.logger.run_id)
+    assert steps[0].decision["intent"]["verb"] == "double_click"
+    assert PipelineReplayer(inputs=inputs).replay(steps).differences == []
+    assert PipelineReplayer().replay(steps).differences[0]["field"] == "intent"
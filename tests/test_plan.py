@@ -0,0 +1,31 @@
+from agent.executor.plan import coalesce, to_send_keys
+from agent.state.models import ActionVerb, GroundedTarget, IntentAction, IntentTarget, TargetSource, UIElement
+
+
+def _grounded(element_id=None):
+    element = UIElement(element_id, TargetSource.UIA, "edit", element_id, None, None, None, (0, 0, 10, 10)) if element_id else None
+    return GroundedTarget(element=element, confidence=1.0, alternatives=[])
+
+
+def test_coalesce_merges_adjacent_typing_and_key_presses_on_the_same_element():
+    name = IntentTarget(automation_id="name")
+    steps = [
+        (IntentAction(verb=ActionVerb.TYPE, target=name, text="Ada "), _grounded("name")),
+        (IntentAction(verb=ActionVerb.TYPE, text="Lovelace"), _grounded()),
+        (IntentAction(verb=ActionVerb.KEYPRESS, key="tab"), _grounded()),
+        (IntentAction(verb=ActionVerb.KEYPRESS, key="ctrl+a"), _grounded()),
+        (IntentAction(verb=ActionVerb.TYPE, target=IntentTarget(automation_id="email"), text="ada@"), _grounded("email")),
+        (IntentAction(verb=ActionVerb.TYPE, target=name, text="x"), _grounded("name")),
+    ]
+    merged = coalesce(steps)
+    assert [(intent.verb, intent.text or intent.key) for intent, _ in merged] == [
+        (ActionVerb.TYPE, "Ada Lovelace"),
+        (ActionVerb.KEYPRESS, "tab ctrl+a"),
+        (ActionVerb.TYPE, "ada@"),
+        (ActionVerb.TYPE, "x"),
+    ]
+    assert merged[0][1].element.element_id == "name"
+
+
+def test_key_sequences_translate_to_send_keys_notation():
+    assert to_send_keys("tab ctrl+a shift+Enter +") == "{TAB}^a+{ENTER}{+}"
@@ -0,0 +1,44 @@
+from agent.executor.retry import ErrorClass, RetryPolicy, classify
+from agent.executor.uia_executor import UIAExecutor
+from agent.state.models import ActionVerb, ExecutionStatus, GroundedTarget, IntentAction, TargetSource, UIElement
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_permanent_errors_fail_fast_and_transient_ones_stop_at_the_budget():
+    clock = _Clock()
+    policy = RetryPolicy(budget_seconds=1.0, sleep=clock.sleep, clock=clock, rng=lambda: 0.5)
+    element = UIElement("e1", TargetSource.UIA, "text", "Label", None, None, None, None)
+    executor = UIAExecutor(app_loader=lambda _: object(), retry_policy=policy)
+    result = executor.execute(IntentAction(verb=ActionVerb.CLICK), GroundedTarget(element=element, confidence=1.0, alternatives=[]))
+    assert result.status == ExecutionStatus.FAIL and result.error.startswith("uia-error:UIA element cannot be clicked")
+    assert policy.attempts == 1 and clock.now == 0.0
+
+    def flaky():
+        raise RuntimeError("timed out waiting for UI thread")
+
+    outcome = policy.run(flaky, max_attempts=5, base_delay=0.4)
+    assert outcome.error_class == ErrorClass.TRANSIENT
+    assert outcome.attempts == 2 and clock.now == 0.4
+
+
+def test_stale_handles_re_resolve_without_sleeping():
+    calls, refreshed = [], []
+
+    def operation():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("UIA element wrapper unavailable")
+
+    policy = RetryPolicy(sleep=lambda _: (_ for _ in ()).throw(AssertionError("slept")))
+    assert policy.run(operation, on_stale=lambda: refreshed.append(1)).ok
+    assert refreshed == [1] and classify(ValueError("bad verb")) == ErrorClass.PERMANENT
@@ -1,7 +1,9 @@
 import pytest
 
+from agent.selector.deny_list import DenyListMatcher, normalize
 from agent.selector.selector import Selector
-from agent.state.models import ActionVerb, IntentAction, IntentTarget, SafetyLevel, WorkingMemory
+from agent.state.models import ActionVerb, IntentAction, IntentTarget, SafetyLevel, TargetSource, UIElement, WorkingMemory
+from tests.helpers import SCREEN_TEXTS, deny_terms
 
 
 def test_selector_blocks_denied_terms():
@@ -17,3 +19,22 @@ def test_selector_rate_limits_and_safety():
     selector.gate(safe_intent, WorkingMemory(risk_mode="high"))
     with pytest.raises(ValueError):
         selector.gate(IntentAction(verb=ActionVerb.OPEN_URL), WorkingMemory())
+
+
+def test_selector_checks_grounded_element_text_with_normalization():
+    selector = Selector(deny_text={"Delete  Account", "wire transfer"})
+    element = UIElement("e1", TargetSource.UIA, "button", "DELETE account", None, None, None, (0, 0, 5, 5))
+    by_id = IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(element_id="e1"))
+    assert selector.admissible(by_id, WorkingMemory())
+    assert not selector.admissible(by_id, WorkingMemory(), element)
+    with pytest.raises(ValueError):
+        selector.gate_element(element)
+    assert not selector.admissible(IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(near_text="Send wire   transfer")), WorkingMemory())
+
+
+def test_deny_list_matcher_agrees_with_substring_scan():
+    terms = deny_terms(500) + ["she", "he", "hers", "his", "wire"]
+    matcher = DenyListMatcher(terms)
+    for text in [*SCREEN_TEXTS, "ushers", "this", "hi s"]:
+        assert (matcher.search(text) is not None) == any(term in normalize(text) for term in terms)
+    assert matcher.search("ushers") == "she"
@@ -1,3 +1,7 @@
+import gc
+import weakref
+
+from agent.skills.journal import StatsJournal
 from agent.skills.skill_library import SkillLibrary
 from agent.state.models import ActionVerb, UIState, WindowInfo, WorkingMemory
 
@@ -31,6 +35,49 @@ def test_skill_persistence(tmp_path):
     path = tmp_path / "skills.json"
     skills = SkillLibrary(state_path=path)
     skills.record_result("scroll_down", success=True)
+    skills.flush()
     assert path.exists()
     restored = SkillLibrary(state_path=path)
     assert restored.procedures["scroll_down"].stats.successes >= 1
+
+
+def test_skill_journal_replays_tail_and_merges_processes(tmp_path):
+    path = tmp_path / "skills.json"
+    first = SkillLibrary(state_path=path, journal=StatsJournal(path, batch_size=2))
+    second = SkillLibrary(state_path=path, journal=StatsJournal(path, batch_size=2))
+    for _ in range(2):
+        first.record_result("scroll_down", success=True)
+        second.record_result("scroll_down", success=False)
+    with first.journal.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"name": "scroll_do')
+    second.record_result("scroll_down", success=False)
+    second.flush()
+    restored = SkillLibrary(state_path=path)
+    assert restored.procedures["scroll_down"].stats.runs == 5
+    assert restored.procedures["scroll_down"].stats.successes == 2
+    journal = first.journal.journal_path.read_text(encoding="utf-8")
+    restored.compact()
+    assert first.journal.journal_path.read_text(encoding="utf-8") == ""
+    assert SkillLibrary(state_path=path).procedures["scroll_down"].stats.failures == 3
+    # A crash after the snapshot replace leaves the folded journal behind; it must not count twice.
+    first.journal.rotated_path(1).write_text(journal, encoding="utf-8")
+    assert SkillLibrary(state_path=path).procedures["scroll_down"].stats.runs == 5
+
+
+def test_replayed_status_comes_from_merged_counts(tmp_path):
+    path = tmp_path / "skills.json"
+    failing, passing = SkillLibrary(state_path=path), SkillLibrary(state_path=path)
+    for _ in range(3):
+        failing.record_result("scroll_down", success=False)
+    failing.close()
+    for _ in range(3):
+        passing.record_result("scroll_down", success=True)
+    passing.close()
+    # Each process saw only its own results; the merged 3/3 record is degraded, whoever flushed last.
+    assert passing.procedures["scroll_down"].status == "trusted"
+    assert SkillLibrary(state_path=path).procedures["scroll_down"].status == "degraded"
+
+    journal = weakref.ref(passing.journal)
+    del failing, passing
+    gc.collect()
+    assert journal() is None
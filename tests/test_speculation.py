@@ -0,0 +1,41 @@
+import time
+
+from agent.decision.llm_interface import LLMInterface
+from agent.decision.speculation import SpeculativeProposer
+from agent.state.models import ActionVerb, IntentAction, IntentTarget, UIState, WindowInfo
+
+
+def _state(signature: str) -> UIState:
+    window = WindowInfo(hwnd=1, pid=1, exe_name="app.exe", title="App", bbox=(0, 0, 10, 10), platform="windows", warnings=[])
+    return UIState(window=window, timestamp=0.0, elements=[], focused_element_id=None, salient_text=[signature], screen_signature=signature)
+
+
+def _slow_client(ui_state, goal, candidate_actions=None):
+    time.sleep(0.05)
+    return [IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals=ui_state.salient_text[0]))]
+
+
+def test_prefetch_hit_uses_background_result():
+    speculator = SpeculativeProposer(LLMInterface(client=_slow_client))
+    click = IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals="Next"))
+    speculator.record_transition(_state("page1"), click, _state("page2"))
+    assert speculator.prefetch(_state("page1"), click, goal="wizard")
+    time.sleep(0.08)
+    proposals = speculator.take(_state("page2"), goal="wizard")
+    assert proposals and proposals[0].target.name_equals == "page2"
+    assert speculator.stats()["hits"] == 1
+    assert speculator.stats()["saved_seconds"] > 0
+
+
+def test_prefetch_discarded_on_signature_mismatch():
+    speculator = SpeculativeProposer(LLMInterface(client=_slow_client))
+    click = IntentAction(verb=ActionVerb.CLICK, target=IntentTarget(name_equals="Next"))
+    assert not speculator.prefetch(_state("page1"), click, goal="wizard")
+    speculator.record_transition(_state("page1"), click, _state("page2"))
+    speculator.prefetch(_state("page1"), click, goal="wizard")
+    assert speculator.take(_state("error"), goal="wizard") is None
+    assert speculator.last_outcome == "miss"
+    speculator.begin_step()
+    assert speculator.last_outcome is None
+    speculator.shutdown()
+    assert not speculator.prefetch(_state("page1"), click, goal="wizard")
@@ -0,0 +1,57 @@
+from dataclasses import replace
+
+from agent.decision.state_encoder import StateEncoder
+from agent.state.models import ElementState, TargetSource, UIElement, UIState, WindowInfo
+
+
+def _element(i: int, name: str = None) -> UIElement:
+    return UIElement(
+        element_id=f"el{i}",
+        source=TargetSource.UIA,
+        role="button",
+        name=name or f"Button {i}",
+        value=None,
+        automation_id=None,
+        class_name=None,
+        bbox=(0, 0, 10, 10),
+        states=[ElementState.ENABLED],
+        parent_element_ids=[],
+        near_text=None,
+        salience=float(100 - i),
+    )
+
+
+def _state(elements) -> UIState:
+    window = WindowInfo(hwnd=1, pid=1, exe_name="app.exe", title="App", bbox=(0, 0, 10, 10), platform="windows", warnings=[])
+    return UIState(window=window, timestamp=0.0, elements=elements, focused_element_id=None, salient_text=[], screen_signature="sig")
+
+
+def test_encoder_respects_budget_in_salience_order():
+    encoder = StateEncoder(max_bytes=300)
+    payload = encoder.encode(_state([_element(i) for i in range(50)]), goal="g")
+    rows = payload["state"]["elements"]
+    assert 0 < len(rows) < 50
+    assert [encoder.resolve_ref(r["ref"]) for r in rows] == [f"el{i}" for i in range(len(rows))]
+
+
+def test_encoder_sends_delta_and_resolves_refs():
+    encoder = StateEncoder()
+    elements = [_element(i) for i in range(3)]
+    encoder.encode(_state(elements), goal="g")
+    changed = [elements[0], replace(elements[1], name="Renamed"), _element(7)]
+    state = encoder.encode(_state(changed), goal="g")["state"]
+    assert state["mode"] == "delta"
+    assert [row["name"] for row in state["changed"]] == ["Renamed"]
+    assert [encoder.resolve_ref(row["ref"]) for row in state["added"]] == ["el7"]
+    assert [encoder.resolve_ref(ref) for ref in state["removed"]] == ["el2"]
+    actions = encoder.resolve_actions([{"verb": "click", "target": {"ref": state["added"][0]["ref"]}}])
+    assert actions[0]["target"] == {"element_id": "el7"}
+
+
+def test_encoder_resets_session_once_refs_exceed_the_cap():
+    encoder = StateEncoder(max_refs=4)
+    first = encoder.encode(_state([_element(i) for i in range(3)]), goal="g")["state"]
+    encoder.encode(_state([_element(i) for i in range(3, 6)]), goal="g")
+    state = encoder.encode(_state([_element(9)]), goal="g")["state"]
+    assert state["mode"] == "full" and state["session"] != first["session"]
+    assert [encoder.resolve_ref(row["ref"]) for row in state["elements"]] == ["el9"]
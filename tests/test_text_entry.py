@@ -0,0 +1,76 @@
+from agent.executor.text_entry import TextEntry
+
+
+class _Edit:
+    def __init__(self, value_pattern=True, clipboard=None, paste_lag=0):
+        self.value = ""
+        self.keys = []
+        self.clipboard = clipboard
+        # Reads of the value before a pending paste lands, like an application pasting asynchronously.
+        self.paste_lag = paste_lag
+        self._pending = None
+        if value_pattern:
+            self.set_value = self._set_value
+
+    def _set_value(self, text):
+        self.value = text
+
+    def type_keys(self, keys, **_):
+        self.keys.append(keys)
+        if keys == "^v":
+            self._pending = self.paste_lag
+        else:
+            self.value += keys
+
+    def get_value(self):
+        if self._pending is not None:
+            if self._pending == 0:
+                # Whatever is on the clipboard when the paste lands is what gets inserted.
+                self.value += self.clipboard.content
+                self._pending = None
+            else:
+                self._pending -= 1
+        return self.value
+
+
+class _Clipboard:
+    def __init__(self, content):
+        self.content = content
+
+    def copy(self, text):
+        self.content = text
+
+    def paste(self):
+        return self.content
+
+
+def test_long_text_uses_value_pattern_and_short_text_is_typed():
+    entry = TextEntry(fast_min_chars=16)
+    edit = _Edit()
+    result = entry.enter_uia(edit, "x" * 5000)
+    assert result.method == TextEntry.SET_VALUE and result.verified and edit.keys == []
+    # set_value would replace existing content, so a prefilled field is typed into instead.
+    prefilled = _Edit()
+    prefilled.value = "Dear team, "
+    result = TextEntry(clipboard=False, fast_min_chars=16).enter_uia(prefilled, "x" * 50)
+    assert result.method == TextEntry.CHUNKED and prefilled.value == "Dear team, " + "x" * 50
+
+    short = _Edit()
+    assert entry.enter_uia(short, "a+b").method == TextEntry.PER_KEY
+    assert short.keys == ["a{+}b"]
+    assert set(entry.stats()) == {TextEntry.SET_VALUE, TextEntry.PER_KEY}
+
+
+def test_paste_restores_the_clipboard_and_falls_back_to_chunks_without_one():
+    clipboard = _Clipboard("previous")
+    edit = _Edit(value_pattern=False, clipboard=clipboard, paste_lag=3)
+    sleeps = []
+    entry = TextEntry(clipboard=clipboard, fast_min_chars=16, sleep=sleeps.append)
+    result = entry.enter_uia(edit, "y" * 100)
+    # The clipboard is restored only after the lagging paste landed with the agent's text.
+    assert result.method == TextEntry.PASTE and result.verified and edit.keys == ["^v"]
+    assert edit.value == "y" * 100 and clipboard.content == "previous" and len(sleeps) == 3
+
+    edit = _Edit(value_pattern=False)
+    result = TextEntry(clipboard=False, fast_min_chars=16, chunk_size=40).enter_uia(edit, "z" * 100)
+    assert result.method == TextEntry.CHUNKED and len(edit.keys) == 3 and result.verified
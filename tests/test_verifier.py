@@ -1,5 +1,10 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+from agent.skills.skill_library import SkillLibrary
+from agent.verifier.expectations import ExpectationKind, UIAProbe, expectations_for, with_baseline
 from agent.verifier.verifier import VerificationContext, Verifier
-from agent.state.models import ElementState, Observation, TargetSource, UIElement, UIState, VerificationStatus, WindowInfo
+from agent.state.models import ActionVerb, ElementState, GroundedTarget, IntentAction, Observation, TargetSource, UIElement, UIState, VerificationStatus, WindowInfo
 
 
 def _window():
@@ -46,3 +51,74 @@ def test_verifier_detects_element_drop():
     result = verifier.verify(context)
     assert result.status == VerificationStatus.FAIL
     assert result.failure_reason == "large element drop"
+
+
+class FakeResolver:
+    def __init__(self, wrappers):
+        self.wrappers = wrappers
+        self.gone_refs = set()
+        self.lookups = []
+
+    def resolve(self, backend_ref, window=None, timeout=None):
+        self.lookups.append((backend_ref, timeout))
+        return self.wrappers.get(backend_ref)
+
+    def gone(self, backend_ref, window=None):
+        return backend_ref in self.gone_refs
+
+
+def test_expected_effects_are_probed_without_reobserving():
+
+    clock = [0.0]
+    verifier = Verifier(probe_timeout=0.2, poll_interval=0.05, sleep=lambda s: clock.__setitem__(0, clock[0] + s), clock=lambda: clock[0])
+    state = _state("a", 2)
+    ok_button, field = state.elements
+    ok_button, field = replace(ok_button, backend_ref="ok"), replace(field, backend_ref="field")
+    wrappers = {"ok": object(), "field": SimpleNamespace(get_value=lambda: "hello")}
+    probe = UIAProbe(FakeResolver(wrappers), available=True)
+
+    dismiss = SkillLibrary().procedures["confirm_ok"].steps[0]
+    intent = replace(dismiss.intent, expect=dismiss.checkpoint.expected_change)
+    expectations = expectations_for(intent, GroundedTarget(element=ok_button, confidence=1.0, alternatives=[]))
+    assert [e.kind for e in expectations] == [ExpectationKind.TARGET_GONE]
+    assert verifier.verify_expected(expectations, probe, state).status == VerificationStatus.FAIL
+    wrappers.pop("ok")
+    # A failed lookup alone is not proof the element went away.
+    assert verifier.verify_expected(expectations, probe, state) is None
+    assert probe.resolver.lookups[-1] == ("ok", probe.lookup_timeout)
+    probe.resolver.gone_refs.add("ok")
+    lookups = len(probe.resolver.lookups)
+    assert verifier.verify_expected(expectations, probe, state).status == VerificationStatus.SUCCESS
+    # A provably gone element is answered without another (slow) search.
+    assert len(probe.resolver.lookups) == lookups
+
+    typed = expectations_for(IntentAction(verb=ActionVerb.TYPE, text="hello"), GroundedTarget(element=field, confidence=1.0, alternatives=[]))
+    assert verifier.verify_expected(typed, probe, state) is None
+    # The field already held the text before the action, so unchanged contents are not success.
+    assert verifier.verify_expected(with_baseline(typed, probe, state.window), probe, state).status == VerificationStatus.FAIL
+    baseline = with_baseline(typed, probe, state.window)
+    wrappers["field"] = SimpleNamespace(get_value=lambda: "hellohello")
+    assert verifier.verify_expected(baseline, probe, state).status == VerificationStatus.SUCCESS
+    assert verifier.verify_expected(baseline, UIAProbe(FakeResolver(wrappers), available=False), state) is None
+    assert verifier.stats()["probe"] == {"success": 2, "fail": 2, "inconclusive": 3}
+
+
+def test_verifier_detects_oscillation_and_longer_cycles():
+    observation = Observation(window=_window(), raw_tree=None, screenshot_path=None, ocr_results=[])
+    toggle = IntentAction(verb=ActionVerb.CLICK, key=None)
+    verifier = Verifier()
+    results = [verifier.verify(VerificationContext(None, _state(sig, 2), observation, intent=toggle)) for sig in "ABAB"]
+    assert [r.status for r in results[:3]] == [VerificationStatus.SUCCESS] * 3
+    assert results[3].status == VerificationStatus.STUCK and results[3].guidance_delta == "blacklist-intent"
+
+    verifier = Verifier(max_cycle=3)
+    steps = [IntentAction(verb=ActionVerb.CLICK, text=str(i % 3)) for i in range(6)]
+    results = [verifier.verify(VerificationContext(None, _state(sig, 2), observation, intent=step)) for sig, step in zip("MNOMNO", steps)]
+    assert [r.status for r in results].index(VerificationStatus.STUCK) == 5
+    assert results[5].guidance_delta == "break-cycle"
+    # Probe-verified steps feed their next observation through ``track``.
+    verifier = Verifier()
+    assert [verifier.track(_state(sig, 2), toggle) for sig in "ABA"] == [None] * 3
+    assert verifier.track(_state("B", 2), toggle).guidance_delta == "blacklist-intent"
+    verifier = Verifier(max_cycle=3)
+    assert all(verifier.verify(VerificationContext(None, _state(sig, 2), observation)).status == VerificationStatus.SUCCESS for sig in "WXYZWXYZ")